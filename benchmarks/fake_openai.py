@@ -0,0 +1,188 @@
+"""
+Local stand-in for the OpenAI chat-completions API
+
+Answers POST /v1/chat/completions with a canned rewrite of the user message
+after a configurable delay, so the pipeline can be benchmarked headless and
+without network access or an API key. Requests with "stream": true are
+answered as server-sent events, one word per chunk, token_delay apart.
+model_delays overrides the delay per requested model, so a slow primary
+and a fast fallback model can be simulated.
+
+Usage:
+    poetry run python benchmarks/fake_openai.py --port 8089 --delay 0.4
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=sk-fake va start
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def rewrite(text):
+    """Cheap imitation of the assistant's cleanup"""
+    text = " ".join(text.split())
+    if not text:
+        return "OK."
+    text = text[0].upper() + text[1:]
+    return text if text[-1] in ".!?" else text + "."
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    server_version = "FakeOpenAI/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_stream(self, request, content, token_delay, finish_reason):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        base = {
+            "id": f"chatcmpl-fake{self.server.requests}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-3.5-turbo"),
+        }
+        words = content.split(" ")
+        deltas = [{"role": "assistant", "content": ""}]
+        deltas += [{"content": word if i == 0 else " " + word} for i, word in enumerate(words)]
+        for i, delta in enumerate(deltas):
+            if i > 1:
+                time.sleep(token_delay)
+            chunk = dict(base, choices=[{"index": 0, "delta": delta, "finish_reason": None}])
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        chunk = dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode())
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [
+                {"id": "gpt-3.5-turbo", "object": "model", "created": 0, "owned_by": "fake"}
+            ]})
+        else:
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+            return
+
+        config = self.server.fake_config
+        with self.server.stats_lock:
+            self.server.requests += 1
+
+        delay = config["model_delays"].get(request.get("model"), config["delay"])
+        if random.random() < config["tail_rate"]:
+            delay += config["tail_delay"]
+        time.sleep(max(0.0, random.gauss(delay, config["jitter"])))
+
+        if random.random() < config["error_rate"]:
+            self._send_json(500, {"error": {"message": "injected failure", "type": "server_error"}})
+            return
+
+        user_text = next((m["content"] for m in reversed(request.get("messages", []))
+                          if m.get("role") == "user"), "")
+        content = rewrite(user_text)
+        # One word per token is close enough to exercise max_tokens truncation
+        finish_reason = "stop"
+        max_tokens = request.get("max_tokens")
+        if max_tokens and len(content.split(" ")) > max_tokens:
+            content = " ".join(content.split(" ")[:max_tokens])
+            finish_reason = "length"
+        if request.get("stream"):
+            self._send_stream(request, content, config["token_delay"], finish_reason)
+            return
+        self._send_json(200, {
+            "id": f"chatcmpl-fake{self.server.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": 0},
+        })
+
+
+class FakeOpenAIServer:
+    """Chat-completions server on localhost, running on a background thread"""
+
+    def __init__(self, port=0, delay=0.4, jitter=0.05, error_rate=0.0, token_delay=0.02):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), FakeOpenAIHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake_config = {"delay": delay, "jitter": jitter, "error_rate": error_rate,
+                                  "token_delay": token_delay, "model_delays": {},
+                                  "tail_rate": 0.0, "tail_delay": 0.0}
+        self.httpd.requests = 0
+        self.httpd.stats_lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def config(self):
+        """Mutable request settings, read on every request.
+
+        delay/jitter: response delay, model_delays: per-model delay override,
+        tail_rate/tail_delay: fraction of requests slowed down by tail_delay,
+        error_rate: fraction answered with 500, token_delay: streaming pace.
+        """
+        return self.httpd.fake_config
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake OpenAI chat-completions server")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--delay", type=float, default=0.4, help="mean response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="delay standard deviation")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="delay between streamed words")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.port, args.delay, args.jitter, args.error_rate, args.token_delay)
+    print(f"Fake OpenAI API on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Logging overhead benchmark
+
+Replays the log records of one dictation (transcription, routing, LLM
+request, typing) through the old synchronous setup (text formatter,
+RotatingFileHandler and console handler on the caller's thread) and
+through the queued JSON setup in echo.utils.logger. Reports the time the
+calling thread spends per utterance; console output goes to /dev/null in
+both cases so only the logging path is measured. Utterances are spaced by
+--gap like real dictations, which gives the writer thread time to drain.
+
+Usage:
+    poetry run python benchmarks/logging_overhead.py --utterances 500 --gap 0.01
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from logging.handlers import RotatingFileHandler
+
+import numpy as np
+
+from echo.utils.logger import build_handlers, start_queue_logging, log_context
+
+TRANSCRIPT = "so I was thinking we could move the meeting to Thursday afternoon if that works for everyone " * 3
+
+# (level, message, args) of a typical dictation
+RECORDS = [
+    (logging.INFO, "Starting transcription. Audio shape: %s", ((96000, 1),)),
+    (logging.INFO, "Calling Whisper model...", ()),
+    (logging.INFO, "Whisper transcription completed, segments: %d, path: %s, escalated: %d, over budget: %d",
+     (4, "greedy", 0, 0)),
+    (logging.INFO, "Final transcribed text: %s", (TRANSCRIPT,)),
+    (logging.INFO, "Decode: %s", ({"audio_seconds": 6.0, "decode_seconds": 0.42, "segments": 4},)),
+    (logging.INFO, "Transcribed: %s", (TRANSCRIPT,)),
+    (logging.INFO, "Route: %s for %s (complexity %d, threshold %d, %s)", ("llm", "direct_message", 48, 12,
+                                                                          "over threshold")),
+    (logging.INFO, "Route %s: %s, max_tokens %d for %d input tokens", ("direct_message", "gpt-3.5-turbo", 110, 60)),
+    (logging.INFO, "Processing text with OpenAI: %s", (TRANSCRIPT,)),
+    (logging.INFO, "Sending request to OpenAI...", ()),
+    (logging.INFO, "✍️ OpenAI response (%s): %s", ("gpt-3.5-turbo", TRANSCRIPT)),
+    (logging.INFO, "⏱️ Processing time: %.2fs", (0.81,)),
+    (logging.DEBUG, "Committed %d segments, %.2fs pending", (3, 1.2)),
+    (logging.DEBUG, "Key pressed: %s", ("Key.f9",)),
+    (logging.INFO, "Text copied to clipboard as backup: %s", (TRANSCRIPT,)),
+    (logging.INFO, "Text typed successfully", ()),
+] * 2
+
+
+def sync_logger(log_dir, console):
+    """The setup every stage wrote through before records were queued"""
+    logger = logging.getLogger("bench.sync")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter('%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
+                                  datefmt='%Y-%m-%d %H:%M:%S')
+    file_handler = RotatingFileHandler(log_dir / "sync.log", maxBytes=1024 * 1024, backupCount=3)
+    console_handler = logging.StreamHandler(console)
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger, None
+
+
+def queued_logger(log_dir, console):
+    logger = logging.getLogger("bench.queued")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handlers = build_handlers(log_dir)
+    handlers[1].setStream(console)
+    return logger, start_queue_logging(logger, handlers)
+
+
+def run(logger, utterances, gap):
+    """Seconds the calling thread spent logging, per utterance"""
+    per_utterance = []
+    for i in range(utterances):
+        with log_context(f"utt{i:06d}"):
+            start = time.perf_counter()
+            for level, message, args in RECORDS:
+                logger.log(level, message, *args)
+            per_utterance.append(time.perf_counter() - start)
+        time.sleep(gap)
+    return np.array(per_utterance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-utterance logging overhead on the calling thread")
+    parser.add_argument("--utterances", type=int, default=500)
+    parser.add_argument("--gap", type=float, default=0.01, help="seconds between utterances")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as console:
+        print(f"{len(RECORDS)} records per utterance, {args.utterances} utterances")
+        print(f"{'setup':<8} {'p50 µs':>9} {'p95 µs':>9} {'p99 µs':>9} {'drain s':>8}")
+        for name, build in (("sync", sync_logger), ("queued", queued_logger)):
+            logger, listener = build(Path(tmp), console)
+            times = run(logger, args.utterances, args.gap)
+            drain_start = time.perf_counter()
+            if listener:
+                listener.stop()  # Waits for the writer thread to empty the queue
+            drain = time.perf_counter() - drain_start
+            p50, p95, p99 = np.percentile(times, [50, 95, 99]) * 1e6
+            print(f"{name:<8} {p50:>9.0f} {p95:>9.0f} {p99:>9.0f} {drain:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
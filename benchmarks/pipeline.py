@@ -0,0 +1,328 @@
+"""
+End-to-end latency benchmark
+
+Feeds fixture WAV files through AudioRecorder -> Transcriber -> OpenAIService
+-> InputHandler the way a dictation does, with a local fake chat-completions
+server and a keyboard that drops every keystroke, so it runs headless on
+Linux. Every ToneMode x CommunicationType combination is run for every clip.
+
+Reports p50/p95/p99 per stage, for F9-release-to-first-character and for
+F9-release-to-typed-text, and writes all runs plus the summary as JSON so
+results can be diffed between versions.
+
+Fixtures are *.wav files in --fixtures; a sidecar <name>.txt holds the
+reference transcript, used when Whisper returns nothing (e.g. synthetic
+clips). Without fixtures, synthetic 3 s, 10 s and 30 s clips are generated.
+
+Usage:
+    poetry run python benchmarks/pipeline.py --repeats 5 --output bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+import platform
+import tempfile
+import itertools
+import subprocess
+import contextlib
+from pathlib import Path
+
+import numpy as np
+
+from fake_openai import FakeOpenAIServer
+
+from echo.audio.files import load_audio
+from echo.audio.recorder import AudioRecorder
+from echo.services.cleanup import LocalRewriter, RewritePolicy
+from echo.services.openai_service import OpenAIService
+from echo.services.streaming import StreamingTranscriber
+from echo.services.transcription import Transcriber
+from echo.utils.config import config, ToneMode, CommunicationType
+from echo.utils.input_handler import InputHandler
+from echo.utils.keystrokes import KeystrokeInjector
+
+STAGES = ["drain", "transcribe", "llm", "inject", "first_char", "end_to_end"]
+SYNTHETIC_SECONDS = [3, 10, 30]
+SYNTHETIC_TEXT = ("hey just wanted to let you know that I'm running about ten minutes late "
+                  "so go ahead and start the meeting without me and I'll catch up")
+
+
+class NullKeyboard:
+    """Keyboard sink that accepts and drops every keystroke"""
+
+    def type(self, text):
+        pass
+
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+    @contextlib.contextmanager
+    def pressed(self, *keys):
+        yield
+
+
+class MemorySnapshot:
+    """ClipboardSnapshot stand-in backed by the bench handler's clipboard string"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.saved = handler.clipboard
+
+    def put_text(self, text):
+        self.handler.clipboard = text
+
+    def restore(self):
+        self.handler.clipboard = self.saved
+        return True
+
+
+class BenchInjector(KeystrokeInjector):
+    """KeystrokeInjector that presses Enter and Tab as plain characters"""
+
+    def _press(self, char):
+        # The base class looks up pynput's Key.enter/tab, which needs a display backend
+        self.keyboard.press(char)
+        self.keyboard.release(char)
+
+
+class BenchInputHandler(InputHandler):
+    """InputHandler with no accessibility prompt, no system clipboard and no pynput"""
+
+    def __init__(self):
+        super().__init__(keyboard=NullKeyboard())
+        self.injector = BenchInjector(self.keyboard)
+        self.clipboard = ""
+
+    def check_accessibility_permissions(self):
+        return True
+
+    def copy_to_clipboard(self, text):
+        self.clipboard = text
+
+    def snapshot_clipboard(self):
+        return MemorySnapshot(self)
+
+    def send_paste_shortcut(self):
+        # The base class presses pynput's Key.cmd/ctrl, which needs a display backend
+        with self.keyboard.pressed("ctrl"):
+            self.keyboard.press("v")
+            self.keyboard.release("v")
+
+
+def synthesize_fixtures(directory):
+    """Speech-like syllable bursts separated by pauses, with a reference transcript"""
+    rng = np.random.default_rng(0)
+    rate = config.audio.SAMPLE_RATE
+    paths = []
+    for seconds in SYNTHETIC_SECONDS:
+        t = np.arange(int(rate * seconds)) / rate
+        carrier = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate([140, 280, 420, 560]))
+        syllables = (np.sin(2 * np.pi * 4 * t) > -0.2).astype(np.float32)
+        pauses = (np.sin(2 * np.pi * 0.3 * t) > -0.6).astype(np.float32)
+        audio = 0.2 * carrier * syllables * pauses + rng.normal(0, 0.002, len(t))
+
+        path = Path(directory) / f"synthetic_{seconds:02d}s.wav"
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            wav.writeframes((np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes())
+        words = SYNTHETIC_TEXT.split()
+        path.with_suffix(".txt").write_text(" ".join(itertools.islice(itertools.cycle(words), seconds * 2)))
+        paths.append(path)
+    return paths
+
+
+def percentiles(values):
+    values = np.asarray(values, dtype=float)
+    return {
+        "n": int(len(values)),
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p95": round(float(np.percentile(values, 95)), 4),
+        "p99": round(float(np.percentile(values, 99)), 4),
+        "mean": round(float(np.mean(values)), 4),
+    }
+
+
+def summarize(runs, key):
+    groups = {}
+    for run in runs:
+        groups.setdefault(key(run), []).append(run)
+    return {
+        name: {stage: percentiles([r["stages"][stage] for r in group if stage in r["stages"]])
+               for stage in STAGES if any(stage in r["stages"] for r in group)}
+        for name, group in sorted(groups.items())
+    }
+
+
+class PipelineBench:
+    def __init__(self, realtime=False):
+        self.realtime = realtime
+        self.recorder = AudioRecorder()
+        self.transcriber = Transcriber()
+        self.transcriber.load()
+        self.openai = OpenAIService()
+        self.local_rewriter = LocalRewriter()
+        self.input_handler = BenchInputHandler()
+
+    def run_once(self, audio, reference, tone, comm_type):
+        """One dictation, returns stage durations in seconds"""
+        stages = {}
+        captured = {}
+        session = None
+        if config.whisper.STREAMING:
+            session = StreamingTranscriber(self.transcriber, vad_filter=not config.audio.VAD_ENABLED)
+            session.start()
+
+        # Capture: the same callback and consumer path as a live recording
+        block = int(self.recorder.sample_rate * 0.05)
+        self.recorder.reset(lambda data, regions: captured.update(audio=data, regions=regions),
+                            session.feed if session else None)
+        started = time.perf_counter()
+        for i in range(0, len(audio), block):
+            self.recorder.audio_callback(audio[i:i + block, None], block, None, None, None)
+            self.recorder.consume()
+            if self.realtime:
+                time.sleep(max(0.0, started + (i + block) / self.recorder.sample_rate - time.perf_counter()))
+
+        # F9 released
+        released = time.perf_counter()
+        self.recorder.finish()
+        stages["drain"] = time.perf_counter() - released
+
+        start = time.perf_counter()
+        if session:
+            transcription = session.finish()
+        else:
+            transcription = self.transcriber.transcribe(captured["audio"], captured.get("regions"))
+        stages["transcribe"] = time.perf_counter() - start
+        text = transcription.text or reference
+
+        start = time.perf_counter()
+        route = self.local_rewriter.policy.route(text, comm_type).route
+        if route == RewritePolicy.LOCAL:
+            response_text = self.local_rewriter.rewrite(text, transcription.segments if transcription.text else None)
+            stages["llm"] = time.perf_counter() - start
+            start = time.perf_counter()
+            stages["first_char"] = start - released
+            self.input_handler.type_text(response_text)
+            stages["inject"] = time.perf_counter() - start
+        elif config.openai.STREAMING:
+            # Rewrite and typing overlap, so they are reported as one stage
+            chunks = self.openai.stream_text(text, tone=tone, comm_type=comm_type)
+            response_text, first_char_at, _ = self.input_handler.type_stream(chunks, config.openai.STREAM_BOUNDARY)
+            stages["inject"] = time.perf_counter() - start
+            if first_char_at:
+                stages["first_char"] = first_char_at - released
+        else:
+            response_text, _ = self.openai.process_text(text, tone=tone, comm_type=comm_type)
+            stages["llm"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if response_text:
+                stages["first_char"] = start - released
+                self.input_handler.type_text(response_text)
+            stages["inject"] = time.perf_counter() - start
+        stages["end_to_end"] = time.perf_counter() - released
+
+        return stages, {"whisper_text": bool(transcription.text), "decode_path": transcription.stats.path,
+                        "typed": bool(response_text), "route": route}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end dictation latency benchmark")
+    parser.add_argument("--fixtures", default=str(Path(__file__).parent / "fixtures"),
+                        help="directory of *.wav fixtures with optional .txt transcripts")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--llm-delay", type=float, default=0.4, help="fake server mean response delay")
+    parser.add_argument("--realtime", action="store_true", help="feed audio at real-time speed")
+    parser.add_argument("--injection", choices=["paste", "keystrokes"], default=config.input.INJECTION_MODE,
+                        help="how the response is put into the focused app")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    fixtures = sorted(Path(args.fixtures).glob("*.wav")) if Path(args.fixtures).is_dir() else []
+    tmpdir = None
+    if not fixtures:
+        tmpdir = tempfile.TemporaryDirectory()
+        fixtures = synthesize_fixtures(tmpdir.name)
+        print(f"No fixtures in {args.fixtures}, using synthetic clips", file=sys.stderr)
+
+    server = FakeOpenAIServer(delay=args.llm_delay).start()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    config.openai.BASE_URL = server.base_url
+    config.input.INJECTION_MODE = args.injection
+    # Nothing reads the bench clipboard, waiting for an app to paste would only inflate the inject stage
+    config.input.PASTE_SETTLE_SECONDS = 0.0
+
+    combos = list(itertools.product(ToneMode, CommunicationType))
+    runs = []
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        bench = PipelineBench(realtime=args.realtime)
+        for path in fixtures:
+            audio = load_audio(path)
+            reference_path = path.with_suffix(".txt")
+            reference = reference_path.read_text().strip() if reference_path.exists() else ""
+            for tone, comm_type in combos:
+                for repeat in range(args.repeats):
+                    stages, info = bench.run_once(audio, reference, tone, comm_type)
+                    runs.append({
+                        "clip": path.name,
+                        "clip_seconds": round(len(audio) / config.audio.SAMPLE_RATE, 2),
+                        "tone": tone.value,
+                        "comm_type": comm_type.value,
+                        "repeat": repeat,
+                        "stages": {k: round(v, 4) for k, v in stages.items()},
+                        **info,
+                    })
+    server.stop()
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model_size": config.whisper.MODEL_SIZE,
+            "streaming": config.whisper.STREAMING,
+            "vad": config.audio.VAD_ENABLED,
+            "realtime": args.realtime,
+            "llm_delay": args.llm_delay,
+            "repeats": args.repeats,
+        },
+        "summary": {
+            "overall": summarize(runs, lambda r: "all")["all"],
+            "by_clip": summarize(runs, lambda r: r["clip"]),
+            "by_combo": summarize(runs, lambda r: f"{r['tone']}/{r['comm_type']}"),
+        },
+        "runs": runs,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    print(f"{'clip':<24} {'stage':<12} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for clip, stages in results["summary"]["by_clip"].items():
+        for stage, p in stages.items():
+            print(f"{clip:<24} {stage:<12} {p['p50']:>8.3f} {p['p95']:>8.3f} {p['p99']:>8.3f}")
+    print(f"\nWrote {len(runs)} runs to {args.output}")
+
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Tail-latency benchmark for LLM requests
+
+Runs OpenAIService against the local fake server under injected failure
+modes (slow tail, errors, slow primary model, total outage) and reports
+latency percentiles plus how each request was answered: primary model,
+hedged duplicate, fallback model or the raw transcript. Both the whole-
+response and the streamed (time to first token) paths are exercised.
+
+Usage:
+    poetry run python benchmarks/tail_latency.py --requests 40 --deadline 2
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+from collections import Counter
+
+import numpy as np
+
+from fake_openai import FakeOpenAIServer
+
+from echo.services.openai_service import OpenAIService
+from echo.utils.config import config, ToneMode, CommunicationType
+
+TEXT = "hey just wanted to say I'm running about ten minutes late"
+
+
+def scenarios(delay):
+    """name -> fake server settings"""
+    return {
+        "healthy": {},
+        "slow_tail": {"tail_rate": 0.1, "tail_delay": delay * 10},
+        "errors": {"error_rate": 0.3},
+        "primary_down": {"model_delays": {config.openai.MODEL: 60.0}},
+        "outage": {"delay": 60.0},
+    }
+
+
+class RecordingTrace:
+    """Keeps the llm_request span attributes of one request"""
+
+    def __init__(self):
+        self.request = {}
+
+    def record(self, name, duration, start=None, **attrs):
+        if name == 'llm_request':
+            self.request = attrs
+
+
+def answered_by(attrs):
+    if attrs.get('fallback') == 'transcript':
+        return "transcript"
+    if attrs.get('fallback'):
+        return "fallback"
+    return "hedge" if attrs.get('hedged') else "primary"
+
+
+def run_requests(service, count, streamed):
+    latencies, outcomes = [], Counter()
+    for _ in range(count):
+        trace = RecordingTrace()
+        start = time.perf_counter()
+        if streamed:
+            chunks = service.stream_text(TEXT, ToneMode.FRIENDLY, CommunicationType.DM, trace=trace)
+            # Time to the first chunk, which is what the deadline covers
+            first = next(chunks, None)
+            latencies.append(time.perf_counter() - start)
+            for _ in chunks:
+                pass
+            typed = first is not None
+        else:
+            response, _ = service.process_text(TEXT, ToneMode.FRIENDLY, CommunicationType.DM, trace=trace)
+            latencies.append(time.perf_counter() - start)
+            typed = bool(response)
+        outcomes[answered_by(trace.request) if typed else "nothing"] += 1
+    return latencies, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM deadline, hedging and fallback benchmark")
+    parser.add_argument("--requests", type=int, default=40, help="requests per scenario and mode")
+    parser.add_argument("--delay", type=float, default=0.2, help="normal fake server delay")
+    parser.add_argument("--deadline", type=float, default=2.0, help="deadline for every message kind")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    config.cache.ENABLED = False  # Every request has to go to the server
+    config.openai.DEADLINES = {comm_type: args.deadline for comm_type in CommunicationType}
+    config.openai.HEDGE_DEFAULT_DELAY_SECONDS = args.delay * 3
+
+    server = FakeOpenAIServer(delay=args.delay, jitter=args.delay / 10, token_delay=0.01).start()
+    config.openai.BASE_URL = server.base_url
+    defaults = dict(server.config)
+
+    print(f"{'scenario':<14} {'mode':<7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  answered by")
+    with contextlib.redirect_stdout(sys.stderr):
+        service = OpenAIService()
+    for name, settings in scenarios(args.delay).items():
+        for streamed in (False, True):
+            server.config.clear()
+            server.config.update(defaults, **settings)
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                latencies, outcomes = run_requests(service, args.requests, streamed)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            answered = ", ".join(f"{k} {v}" for k, v in outcomes.most_common())
+            print(f"{name:<14} {'stream' if streamed else 'whole':<7} {p50:>7.3f} {p95:>7.3f} {p99:>7.3f} "
+                  f"{max(latencies):>7.3f}  {answered}")
+
+    print(f"\n{'route':<24} {'requests':>8} {'p50':>7} {'p95':>7}  truncated")
+    for name, route in service.router.summary().items():
+        print(f"{name:<24} {route['requests']:>8} {route['p50']:>7.3f} {route['p95']:>7.3f}  "
+              f"{route['truncation_rate']:.0%}")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Wakeups benchmark
+
+Counts how often the recorder thread and the assistant's idle loop wake
+up, and how long a stop takes to be noticed, for the old polling loops
+and the event-driven ones in echo. A feeder thread stands in for
+PortAudio and calls AudioRecorder.audio_callback in real time with one
+block per BLOCK_SIZE_SECONDS.
+
+Wakeups are the voluntary context switches of the measured thread, read
+from /proc on Linux. Elsewhere psutil only reports the whole process, so
+the feeder's own wakeups are included in the recording rows.
+
+Usage:
+    poetry run python benchmarks/wakeups.py --seconds 5 --poll-ms 10
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import contextlib
+
+import numpy as np
+
+from echo.audio.recorder import AudioRecorder
+from echo.utils.config import config
+
+
+def wakeups(thread_id):
+    """Voluntary context switches of a thread, or of the process without /proc"""
+    if sys.platform.startswith("linux"):
+        with open(f"/proc/self/task/{thread_id}/status") as status:
+            for line in status:
+                if line.startswith("voluntary_ctxt_switches"):
+                    return int(line.split()[1])
+    import psutil
+    return psutil.Process().num_ctx_switches().voluntary
+
+
+def measure(target, seconds, stop):
+    """Run target on a thread for seconds, returns (wakeups/sec, seconds from stop to exit)"""
+    ready = threading.Event()
+    ids = {}
+
+    def run():
+        ids['thread'] = threading.get_native_id()
+        ready.set()
+        target()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+    time.sleep(0.2)  # Let it settle into its loop
+
+    before = wakeups(ids['thread'])
+    time.sleep(seconds)
+    rate = (wakeups(ids['thread']) - before) / seconds
+
+    stop_at = time.perf_counter()
+    stop()
+    thread.join()
+    return rate, time.perf_counter() - stop_at
+
+
+def feeder(recorder, stopped):
+    """Deliver silence-plus-noise blocks the way the PortAudio callback would"""
+    rng = np.random.default_rng(0)
+    block = recorder.block_frames
+    period = block / recorder.sample_rate
+    next_at = time.perf_counter()
+    while not stopped.is_set():
+        recorder.audio_callback(rng.normal(0, 0.01, (block, 1)).astype(np.float32), block, None, None, None)
+        next_at += period
+        stopped.wait(max(0.0, next_at - time.perf_counter()))
+
+
+def polling_recorder(recorder, poll_seconds):
+    """The consumer loop before the state machine: consume, sleep, check a flag"""
+    flags = {'stop': False}
+
+    def loop():
+        while not flags['stop']:
+            recorder.buffer.reserve(recorder.headroom_frames)
+            recorder.consume()
+            time.sleep(poll_seconds)
+
+    def stop():
+        flags['stop'] = True
+        recorder.request_stop()
+
+    return loop, stop
+
+
+def event_recorder(recorder):
+    return recorder.capture, recorder.request_stop
+
+
+def record(recorder, seconds, build):
+    """Wakeups/sec of the recorder thread while blocks arrive"""
+    recorder.reset(lambda audio, regions: None)
+    stopped = threading.Event()
+    feed = threading.Thread(target=feeder, args=(recorder, stopped), daemon=True)
+    feed.start()
+    loop, stop = build(recorder)
+    with open(os.devnull, "w") as meter, contextlib.redirect_stdout(meter):  # Level bars
+        try:
+            return measure(loop, seconds, stop)
+        finally:
+            stopped.set()
+            feed.join()
+            recorder.finish()
+
+
+def idle(seconds, poll):
+    """Wakeups/sec of the assistant's main loop with nothing happening"""
+    if poll:
+        flags = {'running': True}
+
+        def loop():
+            while flags['running']:
+                time.sleep(0.1)
+
+        return measure(loop, seconds, lambda: flags.update(running=False))
+
+    stopped = threading.Event()
+    return measure(stopped.wait, seconds, stopped.set)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle and recording wakeups, polling vs event-driven")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measurement window per scenario")
+    parser.add_argument("--poll-ms", type=float, default=10.0, help="sleep of the polling recorder loop")
+    args = parser.parse_args()
+
+    config.audio.VAD_ENABLED = False  # Measure the loop, not the detector
+    recorder = AudioRecorder()
+    print(f"{1 / config.audio.BLOCK_SIZE_SECONDS:.0f} blocks/sec, {args.seconds:.0f}s per scenario\n")
+    print(f"{'scenario':<28} {'wakeups/s':>10} {'stop ms':>8}")
+
+    rows = [
+        ("idle, polling 100 ms", lambda: idle(args.seconds, poll=True)),
+        ("idle, event", lambda: idle(args.seconds, poll=False)),
+        (f"recording, polling {args.poll_ms:.0f} ms",
+         lambda: record(recorder, args.seconds, lambda r: polling_recorder(r, args.poll_ms / 1000))),
+        ("recording, event", lambda: record(recorder, args.seconds, event_recorder)),
+    ]
+    for name, run in rows:
+        rate, stop_seconds = run()
+        print(f"{name:<28} {rate:>10.1f} {stop_seconds * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
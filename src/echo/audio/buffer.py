@@ -0,0 +1,82 @@
+import numpy as np
+
+class CaptureBuffer:
+    """Preallocated float32 capture buffer the audio callback writes into in place.
+
+    Capacity grows by GROWTH when a recording outgrows it, so a long dictation
+    costs a handful of reallocations instead of one copy per block plus a
+    final concatenate. The recorder thread calls reserve() so the copy and the
+    first-touch page faults of the new array happen off the audio thread; the
+    callback only adopts the new array and copies the few frames written
+    since. Views returned by view() stay valid after growth because the
+    samples they cover are never written again.
+
+    The buffer doubles as a single-producer/single-consumer queue: the audio
+    callback is the only writer and publishes frames by advancing size, the
+    recorder thread reads everything below size without taking a lock.
+    """
+
+    GROWTH = 1.5  # Doubling would hold 3x the audio while a long recording grows
+
+    def __init__(self, sample_rate, channels=1, capacity_seconds=15.0):
+        self.channels = channels
+        self.data = self._allocate(max(int(sample_rate * capacity_seconds), 1))
+        self.size = 0
+        self._next = None  # (array, frames already copied) prepared by reserve()
+        self._retired = None  # Array replaced by the callback, freed by reserve() off the audio thread
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(self.data)
+
+    def write(self, block):
+        """Copy a block of frames into the buffer, converting to float32 in place"""
+        if self._next is not None:
+            self._adopt()
+        end = self.size + len(block)
+        if end > len(self.data):
+            self._grow(end)  # Nobody reserved ahead, grow inline
+        self.data[self.size:end] = block
+        self.size = end
+
+    def reserve(self, headroom):
+        """Grow ahead of the writer when fewer than headroom frames are free.
+
+        Must be called from a single non-realtime thread.
+        """
+        self._retired = None
+        if self._next is not None or len(self.data) - self.size >= headroom:
+            return
+        copied = self.size
+        data = self._allocate(max(int(len(self.data) * self.GROWTH), copied + headroom))
+        data[:copied] = self.data[:copied]
+        self._next = (data, copied)
+
+    def view(self, start=0, end=None):
+        """Zero-copy view of the captured frames"""
+        # Read size before data: whichever array we then see holds every published frame
+        size = self.size
+        data = self.data
+        return data[start:size if end is None else min(end, size)]
+
+    def _allocate(self, frames):
+        """Zeroed array with every page already faulted in, so the callback's writes don't fault"""
+        data = np.empty((frames, self.channels), dtype=np.float32)
+        data.fill(0.0)
+        return data
+
+    def _adopt(self):
+        data, copied = self._next
+        data[copied:self.size] = self.data[copied:self.size]
+        self._retired = self.data  # Freeing a large array here would unmap it on the audio thread
+        self.data = data
+        self._next = None
+
+    def _grow(self, minimum):
+        capacity = max(minimum, int(len(self.data) * self.GROWTH))
+        data = np.zeros((capacity, self.channels), dtype=np.float32)
+        data[:self.size] = self.data[:self.size]
+        self.data = data
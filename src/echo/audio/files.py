@@ -0,0 +1,64 @@
+import wave
+import numpy as np
+from pathlib import Path
+from echo.utils.config import config
+
+AUDIO_EXTENSIONS = {'.wav', '.pcm', '.raw'}
+
+
+def iter_audio_files(paths):
+    """Expand files and directories into audio file paths, in a stable order"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            for child in sorted(path.rglob('*')):
+                if child.is_file() and child.suffix.lower() in AUDIO_EXTENSIONS:
+                    yield child
+        else:
+            yield path
+
+
+def resample(audio, source_rate, target_rate):
+    """Linear resampling, good enough for speech going into Whisper"""
+    if source_rate == target_rate or not len(audio):
+        return audio
+    duration = len(audio) / source_rate
+    target = np.linspace(0, duration, int(duration * target_rate), endpoint=False)
+    source = np.arange(len(audio)) / source_rate
+    return np.interp(target, source, audio).astype(np.float32)
+
+
+def load_audio(path, sample_rate=None):
+    """Read a WAV file or raw 16-bit PCM into mono float32 at sample_rate.
+
+    Raw .pcm/.raw files are assumed to be mono 16-bit little endian recorded
+    at the target rate.
+    """
+    path = Path(path)
+    sample_rate = sample_rate or config.audio.SAMPLE_RATE
+
+    if path.suffix.lower() in ('.pcm', '.raw'):
+        return np.fromfile(path, dtype='<i2').astype(np.float32) / 32768.0
+
+    with wave.open(str(path), 'rb') as wav:
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        audio = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128.0
+    elif width == 2:
+        audio = np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+    elif width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+        ints = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8) | (raw[:, 2].astype(np.int32) << 16))
+        audio = np.where(ints >= 1 << 23, ints - (1 << 24), ints).astype(np.float32) / float(1 << 23)
+    elif width == 4:
+        audio = np.frombuffer(frames, dtype='<i4').astype(np.float32) / float(1 << 31)
+    else:
+        raise ValueError(f"Unsupported sample width {width} in {path}")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+
+    return resample(audio, rate, sample_rate)
@@ -1,102 +1,304 @@
-import sounddevice as sd
 import numpy as np
+import time
+import logging
 import threading
+from echo.audio.buffer import CaptureBuffer
+from echo.audio.vad import StreamingVAD
 from echo.utils.config import config
 from echo.utils.logger import get_logger
 
 class AudioRecorder:
+    """Captures audio on an event-driven state machine.
+
+    idle -> arming (reset() on the caller's thread; stream opening, start cue
+    still audible) -> recording (first block kept) -> draining (stop
+    requested, last blocks and the callback handled) -> idle. The recorder
+    thread sleeps until the audio callback delivers a block or a stop is
+    requested, so it never polls. The audio callback never takes the state
+    lock: it reads the accepting flag and sets the wakeup event, and the
+    recorder thread makes the transitions.
+    """
+    IDLE = "idle"
+    ARMING = "arming"
+    RECORDING = "recording"
+    DRAINING = "draining"
+
     def __init__(self):
         self.logger = get_logger(__name__)
         self.sample_rate = config.audio.SAMPLE_RATE
         self.channels = config.audio.CHANNELS
-        self.recording = False
-        self.should_stop = False
+        self.state = self.IDLE
+        self.state_changed = threading.Condition()
+        self.wakeup = threading.Event()  # Set by the audio callback and by request_stop
+        self.accepting = False  # Blocks are wanted; set by reset(), cleared by request_stop(), read lock-free
         self.stream = None
         self.stream_lock = threading.Lock()
-        self.audio_buffer = []
+        self.buffer = CaptureBuffer(self.sample_rate, self.channels, config.audio.CAPTURE_BUFFER_SECONDS)
         self.callback_fn = None  # Add this line to store the callback
+        self.window_fn = None  # Receives fixed-size windows while recording
+        self.window_frames = int(self.sample_rate * config.audio.STREAM_WINDOW_SECONDS)
+        self.window_start = 0
+        self.headroom_frames = int(self.sample_rate * 2)  # Grow the buffer before it fills, reserve() runs every block
+
+        # The recorder thread wakes once per block; metering runs there too, throttled to its own rate
+        self.block_frames = int(self.sample_rate * config.audio.BLOCK_SIZE_SECONDS)
+        self.meter_interval = 1.0 / config.audio.METER_REFRESH_HZ
+        self.meter_due = 0.0  # perf_counter time of the next meter redraw
+        self.on_level = None  # Optional GUI hook, called with a 0..1 level or None when idle
+        self.level = 0.0
+        self.read_pos = 0
+
+        # Speech regions are found as audio arrives, Whisper only decodes those
+        self.vad = None
+        self.vad_seconds = 0.0
+
+        # Written by the audio callback, read by the recorder thread
+        self.overflows = 0
+        self.underflows = 0
+        self.dropped_blocks = 0
+        self.reported_drops = 0
+
+        # Blocks arriving before this perf_counter time hold the start cue
+        self.skip_until = None
+        self.skipped_blocks = 0
+
+    @property
+    def recording(self):
+        """Arming or recording, the stream's blocks are still wanted"""
+        return self.state in (self.ARMING, self.RECORDING)
+
+    def _set_state(self, state):
+        with self.state_changed:
+            if self.state != state:
+                self.state = state
+                self.state_changed.notify_all()
+
+    def _transition(self, expected, state):
+        """Move from expected to state only, so a concurrent stop isn't overwritten"""
+        with self.state_changed:
+            if self.state == expected:
+                self._set_state(state)
+
+    def wait_for_state(self, state, timeout=None):
+        """Block until the recorder reaches state, False on timeout"""
+        with self.state_changed:
+            return self.state_changed.wait_for(lambda: self.state == state, timeout)
+
+    def request_stop(self):
+        """Move to draining and wake the recorder thread right away, from any state"""
+        self.accepting = False
+        with self.state_changed:
+            if self.recording:
+                self._set_state(self.DRAINING)
+        self.wakeup.set()
 
-    def audio_callback(self, indata, frames, time, status, callback):
-        """Process audio data from the microphone"""
+    def audio_callback(self, indata, frames, time_info, status, callback):
+        """Hand the block to the capture buffer, nothing else runs on the audio thread"""
         if status:
-            self.logger.warning(f"Audio callback status: {status}")
-        
-        if self.recording and not self.should_stop:
-            try:
-                # Convert to float32 if needed
-                audio_data = indata.copy()
-                if audio_data.dtype != np.float32:
-                    audio_data = audio_data.astype(np.float32)
-                
-                # Show audio level bars
-                level = np.mean(np.abs(audio_data))
-                if level > 0.001:  # Lower threshold for more sensitivity
-                    bars = int(level * 100)
-                    print(f"\rAudio Level: {'█' * bars}{' ' * (50-min(bars, 50))}", end='', flush=True)
-                    
-                    # Add to buffer
-                    self.audio_buffer.append(audio_data)
-                
-            except Exception as e:
-                self.logger.error(f"Error in audio callback: {e}")
-
-    def start(self, callback):
-        """Start recording audio"""
-        self.recording = True
-        self.should_stop = False
-        self.audio_buffer = []
+            if status.input_overflow:
+                self.overflows += 1
+            if status.input_underflow:
+                self.underflows += 1
+
+        if not self.accepting:
+            return
+
+        if self.skip_until is not None:
+            if time.perf_counter() < self.skip_until:
+                self.skipped_blocks += 1
+                return
+            self.skip_until = None
+
+        try:
+            self.buffer.write(indata)
+        except Exception:
+            self.dropped_blocks += 1
+        self.wakeup.set()  # Event's own lock is only held to flip its flag, the recorder makes the transition
+
+    def stats(self):
+        """Overflow/underflow counters for the current or last recording"""
+        return {
+            'overflows': self.overflows,
+            'underflows': self.underflows,
+            'dropped_blocks': self.dropped_blocks,
+            'cue_blocks_skipped': self.skipped_blocks,
+            'captured_seconds': len(self.buffer) / self.sample_rate,
+            'speech_regions': len(self.vad.regions) if self.vad else None,
+            'vad_seconds': self.vad_seconds,
+        }
+
+    @property
+    def speech_regions(self):
+        """Speech regions of the current recording, None when VAD is disabled"""
+        return list(self.vad.regions) if self.vad else None
+
+    def consume(self):
+        """Meter and analyse the frames published since the last call"""
+        end = len(self.buffer)
+        if end > self.read_pos:
+            block = self.buffer.view(self.read_pos, end)
+            self.read_pos = end
+
+            # Show audio level bars
+            now = time.perf_counter()
+            if now >= self.meter_due:
+                self.meter_due = now + self.meter_interval
+                self.level = float(np.mean(np.abs(block)))
+                bars = int(self.level * 100)
+                print(f"\rAudio Level: {'█' * min(bars, 50)}{' ' * (50-min(bars, 50))}", end='', flush=True)
+                if self.on_level:
+                    self.on_level(self.level)
+
+            if self.vad:
+                start = time.perf_counter()
+                mono = block[:, 0] if self.channels == 1 else np.mean(block, axis=1)
+                closed = self.vad.process(mono)
+                self.vad_seconds += time.perf_counter() - start
+                self.hand_off_speech(closed)
+
+        if not self.vad and self.window_fn and len(self.buffer) - self.window_start >= self.window_frames:
+            self.flush_window()
+
+        drops = self.overflows + self.underflows + self.dropped_blocks
+        if drops != self.reported_drops:
+            self.reported_drops = drops
+            self.logger.warning(f"Audio blocks dropped: {self.stats()}")
+
+    def hand_off_speech(self, closed_regions):
+        """Give the streaming worker speech audio only, as regions close or grow past a window"""
+        if not self.window_fn:
+            return
+
+        for region_start, region_end in closed_regions:
+            start = max(region_start, self.window_start)
+            if region_end > start:
+                self.window_fn(self.buffer.view(start, region_end))
+            self.window_start = max(region_end, self.window_start)
+
+        open_start = self.vad.open_region_start
+        if open_start is not None:
+            start = max(open_start, self.window_start)
+            if self.vad.position - start >= self.window_frames:
+                self.window_fn(self.buffer.view(start, self.vad.position))
+                self.window_start = self.vad.position
+
+    def flush_window(self):
+        """Hand a view of the frames captured since the last window to window_fn"""
+        end = len(self.buffer)
+        if self.window_fn and end > self.window_start:
+            self.window_fn(self.buffer.view(self.window_start, end))
+        self.window_start = end
+
+    def reset(self, callback, window_callback=None, skip_until=None):
+        """Arm a new recording without opening the input stream, call on the thread that starts it"""
+        self.wakeup.clear()
+        # Fresh buffer per recording, views handed out earlier stay untouched
+        self.buffer = CaptureBuffer(self.sample_rate, self.channels, config.audio.CAPTURE_BUFFER_SECONDS)
         self.callback_fn = callback  # Store the callback
-        
+        self.window_fn = window_callback
+        self.window_start = 0
+        self.read_pos = 0
+        self.meter_due = 0.0
+        self.overflows = self.underflows = self.dropped_blocks = self.reported_drops = 0
+        self.skip_until = skip_until
+        self.skipped_blocks = 0
+        self.vad = StreamingVAD(self.sample_rate) if config.audio.VAD_ENABLED else None
+        self.vad_seconds = 0.0
+        self._set_state(self.ARMING)
+        self.accepting = True
+
+    def start(self, callback, window_callback=None, skip_until=None):
+        """Arm and record on this thread, dropping blocks that arrive before skip_until"""
+        self.reset(callback, window_callback, skip_until)
+        self.record()
+
+    def record(self):
+        """Open the input stream and capture until stopped, the recorder must be armed by reset()"""
         try:
+            if self.state != self.ARMING:
+                return  # Stopped before the stream was opened
+
+            import sounddevice as sd  # Needs PortAudio, only load it when recording
+
             with self.stream_lock:
                 self.stream = sd.InputStream(
                     channels=self.channels,
                     samplerate=self.sample_rate,
-                    callback=lambda *args: self.audio_callback(*args, callback),
-                    blocksize=int(self.sample_rate * 0.05)  # Smaller blocks for smoother updates
+                    dtype='float32',
+                    callback=lambda *args: self.audio_callback(*args, self.callback_fn),
+                    blocksize=self.block_frames
                 )
                 self.stream.start()
-            
+
             self.logger.info("Audio recording started")
             print("\nRecording... (Press F9 to stop)")
-            
-            # Keep recording until stopped
-            while self.recording and not self.should_stop:
-                sd.sleep(10)  # Shorter sleep for more responsive updates
-                
+            self.capture()
+
         except Exception as e:
             self.logger.error(f"Error in recording: {e}")
         finally:
             self.stop()
 
+    def capture(self):
+        """Consume blocks as the callback delivers them, until a stop is requested"""
+        while self.recording:
+            if self.state == self.ARMING and len(self.buffer):
+                self._transition(self.ARMING, self.RECORDING)
+            self.buffer.reserve(self.headroom_frames)  # Keep reallocation off the audio thread
+            self.consume()
+            if not self.wakeup.wait(config.audio.STALL_SECONDS):
+                stream = self.stream
+                if stream is not None and not stream.active:
+                    self.logger.error("Audio input stream stopped delivering blocks")
+                    break
+            self.wakeup.clear()  # Blocks written before this are consumed on the next pass
+
     def stop(self):
         """Stop recording audio"""
-        self.recording = False
-        self.should_stop = True
-        
+        self.request_stop()
+
         with self.stream_lock:
             if self.stream is not None:
                 try:
                     self.stream.stop()
                     self.stream.close()
                     self.stream = None
-                    self.logger.info("Audio recording stopped")
-                    
-                    # Process the complete audio buffer
-                    if self.audio_buffer and self.callback_fn:
-                        print("\nProcessing recorded audio...")
-                        complete_audio = np.concatenate(self.audio_buffer)
-                        
-                        # Debug audio data
-                        print(f"Audio shape: {complete_audio.shape}")
-                        print(f"Audio max value: {np.max(np.abs(complete_audio))}")
-                        print(f"Audio min value: {np.min(complete_audio)}")
-                        print(f"Audio mean value: {np.mean(np.abs(complete_audio))}")
-                        
-                        if np.max(np.abs(complete_audio)) > 0:  # Check if we have valid audio
-                            self.callback_fn(complete_audio)
-                        else:
-                            print("No valid audio data detected")
-                    
+                    self.logger.info(f"Audio recording stopped: {self.stats()}")
+                    self.finish()
+
                 except Exception as e:
-                    self.logger.error(f"Error closing stream: {e}")
\ No newline at end of file
+                    self.logger.error(f"Error closing stream: {e}")
+
+        self._set_state(self.IDLE)
+
+    def finish(self):
+        """Drain captured audio and hand the recording to the callback"""
+        self.accepting = False
+        self._set_state(self.DRAINING)
+
+        # Drain the last frames and hand the final partial window to the streaming worker
+        self.consume()
+        if self.vad:
+            self.hand_off_speech(self.vad.finish())
+        else:
+            self.flush_window()
+        if self.on_level:
+            self.on_level(None)
+
+        # Process the complete audio buffer
+        if len(self.buffer) and self.callback_fn:
+            print("\nProcessing recorded audio...")
+            complete_audio = self.buffer.view()  # Zero-copy
+            peak = float(np.max(np.abs(complete_audio)))
+
+            # Full-buffer statistics only when someone reads them
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Audio shape: %s, max: %.4f, min: %.4f, mean: %.4f", complete_audio.shape,
+                                  peak, float(np.min(complete_audio)), float(np.mean(np.abs(complete_audio))))
+
+            if peak > 0:  # Check if we have valid audio
+                self.callback_fn(complete_audio, self.speech_regions)
+            else:
+                print("No valid audio data detected")
+
+        self._set_state(self.IDLE)
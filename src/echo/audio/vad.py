@@ -0,0 +1,84 @@
+import numpy as np
+from echo.utils.config import config
+
+class StreamingVAD:
+    """Energy-based voice activity detector fed block by block while recording.
+
+    Each frame's RMS level is compared against an adaptive noise floor. A speech region
+    stays open until the hangover has passed without speech, and closed
+    regions are padded on both sides so soft onsets and trailing consonants
+    survive. Regions are (start, end) sample offsets into the recording.
+    """
+
+    def __init__(self, sample_rate):
+        self.frame = int(sample_rate * config.audio.VAD_FRAME_MS / 1000)
+        self.hangover_frames = max(int(config.audio.VAD_HANGOVER_MS / config.audio.VAD_FRAME_MS), 1)
+        self.pad = int(sample_rate * config.audio.VAD_PAD_MS / 1000)
+        self.threshold_ratio = config.audio.VAD_THRESHOLD_RATIO
+        self.min_level = config.audio.VAD_MIN_LEVEL
+
+        self.noise_floor = self.min_level / self.threshold_ratio
+        self.position = 0  # Samples consumed so far
+        self.remainder = np.zeros(0, dtype=np.float32)
+        self.regions = []
+        self.speech_start = None
+        self.speech_end = 0
+        self.silent_frames = 0
+
+    @property
+    def open_region_start(self):
+        """Padded start of the region currently in progress, or None"""
+        if self.speech_start is None:
+            return None
+        return self._padded_start(self.speech_start)
+
+    def process(self, samples):
+        """Consume mono samples, returns the regions closed by them"""
+        closed_before = len(self.regions)
+        samples = np.concatenate([self.remainder, samples]) if len(self.remainder) else samples
+        count = len(samples) // self.frame
+        self.remainder = np.array(samples[count * self.frame:], dtype=np.float32)
+        if not count:
+            return []
+
+        frames = np.asarray(samples[:count * self.frame]).reshape(count, self.frame)
+        levels = np.sqrt(np.mean(np.square(frames), axis=1))
+
+        for i, level in enumerate(levels):
+            start = self.position + i * self.frame
+            is_speech = level > max(self.min_level, self.noise_floor * self.threshold_ratio)
+
+            # Follow the background down quickly and up slowly, so pauses
+            # between words pull the floor back before speech can raise it
+            rate = 0.1 if level < self.noise_floor else 0.002
+            self.noise_floor += rate * (level - self.noise_floor)
+
+            if is_speech:
+                if self.speech_start is None:
+                    self.speech_start = start
+                self.speech_end = start + self.frame
+                self.silent_frames = 0
+            elif self.speech_start is not None:
+                self.silent_frames += 1
+                if self.silent_frames > self.hangover_frames:
+                    self._close(start + self.frame)
+
+        self.position += count * self.frame
+        return self.regions[closed_before:]
+
+    def finish(self):
+        """Close the region in progress at the end of the recording"""
+        closed_before = len(self.regions)
+        if self.speech_start is not None:
+            self._close(self.position + len(self.remainder))
+        return self.regions[closed_before:]
+
+    def _padded_start(self, start):
+        floor = self.regions[-1][1] if self.regions else 0
+        return max(start - self.pad, floor)
+
+    def _close(self, limit):
+        start = self._padded_start(self.speech_start)
+        self.regions.append((start, min(self.speech_end + self.pad, limit)))
+        self.speech_start = None
+        self.silent_frames = 0
@@ -1,20 +1,67 @@
 import sys
-from echo.voice_assistant import VoiceAssistant
+import argparse
 
-def start():
-    assistant = VoiceAssistant()
+def start(argv):
+    """Run the assistant in the terminal, without the menu bar icon"""
+    parser = argparse.ArgumentParser(prog="va start", description=start.__doc__)
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print per-phase and per-import startup timings")
+    args = parser.parse_args(argv)
+
+    from echo.utils.startup import profiler
+    if args.profile_startup:
+        profiler.enable()
+
+    with profiler.phase("assistant"):
+        from echo.voice_assistant import VoiceAssistant
+        assistant = VoiceAssistant()
+    with profiler.phase("keyboard listener"):
+        assistant.start_keyboard_listener()
+    profiler.mark("assistant ready")
+    profiler.report_when_ready(assistant.transcription.ready, "model ready")
     assistant.run()
 
+def transcribe(argv):
+    """Batch-transcribe WAV/PCM files and directories to JSONL, decoded exactly like a dictation"""
+    parser = argparse.ArgumentParser(prog="va transcribe", description=transcribe.__doc__)
+    parser.add_argument("paths", nargs="+", help="audio files or directories to scan")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="files decoded concurrently")
+    args = parser.parse_args(argv)
+
+    from echo.services.batch import BatchTranscriber
+    batch = BatchTranscriber(jobs=args.jobs)
+
+    if args.output == "-":
+        batch.run(args.paths, sys.stdout)
+    else:
+        with open(args.output, "a", encoding="utf-8") as output:
+            batch.run(args.paths, output)
+
+def traces(argv):
+    """Print per-stage latency percentiles and histograms from recorded traces"""
+    parser = argparse.ArgumentParser(prog="va traces", description=traces.__doc__)
+    parser.add_argument("--last", type=int, default=None, help="only the most recent N dictations")
+    args = parser.parse_args(argv)
+
+    from echo.utils.tracing import load_traces, print_summary
+    recorded = load_traces()
+    print_summary(recorded[-args.last:] if args.last else recorded)
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: start|stop|status")
+        print("Usage: start [--profile-startup]|transcribe <paths...>|traces [--last N]")
         return
-        
+
     command = sys.argv[1]
     if command == "start":
-        start()
+        start(sys.argv[2:])
+    elif command == "transcribe":
+        transcribe(sys.argv[2:])
+    elif command == "traces":
+        traces(sys.argv[2:])
     else:
         print(f"Unknown command: {command}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,8 +1,18 @@
 import os
 import sys
+import threading
 from pathlib import Path
 import rumps
 
+
+def on_main_thread(fn, *args):
+    """Run fn on the AppKit main thread, the status item and menu must not be touched from others"""
+    if threading.current_thread() is threading.main_thread():
+        fn(*args)
+    else:
+        from PyObjCTools.AppHelper import callAfter  # Ships with pyobjc, which rumps is built on
+        callAfter(fn, *args)
+
 class EchoGUI(rumps.App):
     def __init__(self, voice_assistant=None):
         # Get the app resources path
@@ -16,6 +26,8 @@ class EchoGUI(rumps.App):
                         quit_button=None)  # This prevents the automatic Quit item
         
         self.voice_assistant = voice_assistant
+        self.level = None  # Latest meter level from the recorder thread
+        self.level_posted = False  # A redraw is already queued on the main thread
         
         # Add keyboard shortcut menu items with callbacks
         self.menu = [
@@ -24,13 +36,58 @@ class EchoGUI(rumps.App):
             rumps.MenuItem("Cycle Mode (F7)", callback=self.handle_f7),
             rumps.MenuItem("Status (F8)", callback=self.handle_f8),
             None,  # separator
+            rumps.MenuItem("Model: loading…"),
+            None,  # separator
             rumps.MenuItem("About", callback=self.handle_about),  # Add callback
             None,  # separator
             rumps.MenuItem("Quit", callback=self.handle_quit)
         ]
 
+    def after_launch(self, callback):
+        """Call callback once, as soon as the run loop is up and the icon is showing"""
+        def fire(timer):
+            timer.stop()
+            callback()
+
+        self.launch_timer = rumps.Timer(fire, 0.01)
+        self.launch_timer.start()
+
     def set_voice_assistant(self, assistant):
         self.voice_assistant = assistant
+        assistant.recorder.on_level = self.update_level
+        assistant.transcription.add_state_listener(self.update_model_state)
+
+    def update_model_state(self, state):
+        """Queue the model state label update on the main thread, called from the loader thread"""
+        on_main_thread(self.show_model_state, state)
+
+    def show_model_state(self, state):
+        """Reflect Whisper loading progress in the menu"""
+        labels = {
+            "loading": "Model: loading…",
+            "ready": "Model: ready",
+            "failed": "Model: failed to load",
+        }
+        for item in self.menu.values():
+            if isinstance(item, rumps.MenuItem) and item.title.startswith("Model:"):
+                item.title = labels.get(state, f"Model: {state}")
+
+    def update_level(self, level):
+        """Queue the input meter redraw on the main thread, called from the recorder thread"""
+        self.level = level
+        if not self.level_posted:
+            self.level_posted = True  # Levels arriving before the redraw runs are coalesced
+            on_main_thread(self.show_level)
+
+    def show_level(self):
+        """Show a one-character input meter next to the icon while recording"""
+        self.level_posted = False
+        level = self.level
+        if level is None:
+            self.title = None
+        else:
+            bars = "▁▂▃▄▅▆▇█"
+            self.title = bars[min(int(level * 40), len(bars) - 1)]
 
     def handle_f9(self, sender):
         if self.voice_assistant:
@@ -1,19 +1,15 @@
+from echo.utils.startup import profiler  # First, so the profile starts as early as possible
+
 import os
 import sys
 import time
 import signal
 import subprocess
 import threading  # Add this import
+import multiprocessing
 from pathlib import Path
 
 from echo.utils.logger import setup_logging
-from echo.utils.input_handler import InputHandler
-from echo.utils.permissions import PermissionsManager
-
-from echo.utils.notifications import NotificationManager
-from echo.utils.config import load_config
-from echo.setup import check_api_key
-from echo.voice_assistant import VoiceAssistant
 
 
 def check_single_instance():
@@ -48,47 +44,92 @@ def check_single_instance():
         logger.error(f"Failed to check/create PID file: {e}")
         return False
             
+def load_assistant(app, logger):
+    """Build the assistant behind the icon, then hand it to the main thread to wire up"""
+    try:
+        with profiler.phase("assistant"):
+            from echo.voice_assistant import VoiceAssistant
+            assistant = VoiceAssistant()
+
+        from echo.gui import on_main_thread
+        on_main_thread(connect_assistant, app, assistant, logger)
+
+    except Exception as e:
+        logger.error(f"Error starting voice assistant: {e}", exc_info=True)
+
+def connect_assistant(app, assistant, logger):
+    """Attach the assistant to the GUI on the main thread, then run it in the background"""
+    try:
+        with profiler.phase("connect"):
+            app.set_voice_assistant(assistant)
+            if not assistant.start_keyboard_listener():
+                logger.error("Failed to initialize keyboard listener")
+
+        profiler.mark("assistant ready")
+        from echo.utils.config import config
+        profiler.report_when_ready(assistant.transcription.ready, "model ready",
+                                   target=config.startup.ICON_TARGET_SECONDS)
+
+        threading.Thread(target=assistant.run, daemon=True).start()
+
+    except Exception as e:
+        logger.error(f"Error connecting voice assistant: {e}", exc_info=True)
+
 def main():
-    """Main entry point"""
-    logger = setup_logging()
+    """Main entry point.
+
+    Only what the menu bar icon needs runs before the run loop starts; the
+    assistant (Whisper, OpenAI, keyboard) is imported and built on a
+    background thread once the icon is showing. --profile-startup prints
+    where the launch time went.
+    """
+    if "--profile-startup" in sys.argv:
+        profiler.enable()
+
+    # Needed for the transcription worker process in the bundled app
+    multiprocessing.freeze_support()
+
+    with profiler.phase("logging"):
+        logger = setup_logging()
     logger.info(f"\n--- Starting Echo (PID: {os.getpid()}) ---")
     
-    if not check_single_instance():
-        logger.info("Another instance is already running")
-        sys.exit(0)
+    with profiler.phase("single instance"):
+        if not check_single_instance():
+            logger.info("Another instance is already running")
+            sys.exit(0)
     
     # Check all permissions before starting
-    permissions = PermissionsManager()
-    
-    # Only check permissions once at startup
-    if not permissions.check_all_permissions():
+    with profiler.phase("permissions"):
+        from echo.utils.permissions import PermissionsManager
+        permissions = PermissionsManager()
+
+        # Only check permissions once at startup
+        permissions_ok = permissions.check_all_permissions()
+
+    if not permissions_ok:
         logger.error("Missing required permissions")
+        permissions.notifications.flush(timeout=2.0)  # Show the permissions hint before exiting
         sys.exit(0)  # Exit cleanly
     
     try:
         # Initialize GUI
-        from echo.gui import EchoGUI
-        app = EchoGUI()
-        
-        # Initialize voice assistant
-        assistant = VoiceAssistant()
-        
-        # Connect GUI and assistant
-        app.set_voice_assistant(assistant)
-        
-        # Start keyboard listener
-        if not assistant.start_keyboard_listener():
-            logger.error("Failed to initialize keyboard listener")
-            
-        # Start assistant thread
-        assistant_thread = threading.Thread(target=assistant.run, daemon=True)
-        assistant_thread.start()
+        with profiler.phase("menu bar"):
+            from echo.gui import EchoGUI
+            app = EchoGUI()
         
         # Check for API key
-        if not check_api_key():
-            logger.error("No API key provided - exiting")
-            sys.exit(1)
-        
+        with profiler.phase("api key"):
+            from echo.setup import check_api_key
+            if not check_api_key():
+                logger.error("No API key provided - exiting")
+                sys.exit(1)
+
+        def launched():
+            profiler.mark("menu bar icon")
+            threading.Thread(target=load_assistant, args=(app, logger), daemon=True).start()
+
+        app.after_launch(launched)
+
         # Run GUI main loop
         app.run()
                     
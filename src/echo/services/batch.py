@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from echo.audio.files import iter_audio_files, load_audio
+from echo.services.transcription import Transcriber, TranscriptionStats
+from echo.utils.config import config
+from echo.utils.logger import get_logger
+
+class BatchTranscriber:
+    """Transcribes recorded files exactly like the interactive path.
+
+    Each file goes through Transcriber.prepare_audio (peak normalization) and
+    Transcriber.decode_segments (Whisper VAD, greedy pass, beam search for
+    hard segments within the latency budget), so a file gives the same text
+    as the same audio dictated. Files are read from disk one at a time per
+    job and several jobs decode concurrently on a shared model (one
+    CTranslate2 worker each). Results are written as JSONL as soon as each
+    file finishes.
+    """
+
+    def __init__(self, jobs=None):
+        self.logger = get_logger(__name__)
+        cpus = os.cpu_count() or 1
+        self.jobs = max(1, jobs or min(cpus, 4))
+
+        # The interactive transcriber with its model swapped for one that splits the cores between jobs
+        self.transcriber = Transcriber()
+        self.transcriber.model = self.transcriber.create_model(
+            cpu_threads=max(1, cpus // self.jobs),
+            num_workers=self.jobs
+        )
+        self.transcriber._set_state(Transcriber.READY)
+
+    def transcribe_file(self, path):
+        """Transcribe a single file, returns a JSON-serializable record"""
+        start = time.perf_counter()
+        try:
+            audio = load_audio(path)
+            duration = len(audio) / config.audio.SAMPLE_RATE
+            stats = TranscriptionStats()
+            prepared = self.transcriber.prepare_audio(audio)
+            segments = self.transcriber.decode_segments(prepared, stats) if prepared is not None else []
+            segments = [
+                {'start': round(s.start, 2), 'end': round(s.end, 2), 'text': s.text.strip()}
+                for s in segments
+            ]
+            return {
+                'path': str(path),
+                'text': " ".join(s['text'] for s in segments if s['text']),
+                'duration': round(duration, 2),
+                'processing_seconds': round(time.perf_counter() - start, 3),
+                'decode_path': stats.path,
+                'segments': segments,
+            }
+        except Exception as e:
+            self.logger.error(f"Error transcribing {path}: {e}")
+            return {
+                'path': str(path),
+                'error': str(e),
+                'processing_seconds': round(time.perf_counter() - start, 3),
+            }
+
+    def run(self, paths, output):
+        """Transcribe every file under paths, writing one JSON line per file to output"""
+        started = time.perf_counter()
+        totals = {'files': 0, 'errors': 0, 'audio_seconds': 0.0}
+        pending = set()
+
+        def collect(futures):
+            for future in futures:
+                record = future.result()
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+                totals['files'] += 1
+                totals['errors'] += 'error' in record
+                totals['audio_seconds'] += record.get('duration', 0)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for path in iter_audio_files(paths):
+                # Keep a bounded number of files in memory
+                if len(pending) >= self.jobs * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(pool.submit(self.transcribe_file, path))
+
+            collect(wait(pending).done)
+
+        files, errors, audio_seconds = totals['files'], totals['errors'], totals['audio_seconds']
+        elapsed = time.perf_counter() - started
+        report = {
+            'files': files,
+            'errors': errors,
+            'audio_seconds': round(audio_seconds, 2),
+            'elapsed_seconds': round(elapsed, 2),
+            'files_per_second': round(files / elapsed, 3) if elapsed else 0.0,
+            'real_time_factor': round(elapsed / audio_seconds, 4) if audio_seconds else None,
+        }
+        print(f"\n✅ {files} files ({errors} errors), {audio_seconds:.1f}s of audio in {elapsed:.1f}s: "
+              f"{report['files_per_second']} files/s, RTF {report['real_time_factor']}", file=sys.stderr)
+        return report
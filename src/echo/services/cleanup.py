@@ -0,0 +1,111 @@
+import re
+import time
+from dataclasses import dataclass
+
+from echo.utils.config import config
+from echo.utils.logger import get_logger
+
+SENTENCE_END = ".!?"
+
+
+class TextCleaner:
+    """Rule-based cleanup of a raw transcript: fillers, stutters, casing and punctuation"""
+
+    def __init__(self):
+        fillers = sorted(config.cleanup.FILLER_WORDS, key=len, reverse=True)
+        # A filler and its own trailing comma, the punctuation before it stays
+        self.filler_pattern = re.compile(
+            r"(?<![\w'])(?:" + "|".join(re.escape(f) for f in fillers) + r")(?![\w'])(?:\s*,)?",
+            re.IGNORECASE
+        )
+        # "I I think", "the, the plan"; repeated content words are left alone
+        stutters = sorted(config.cleanup.STUTTER_WORDS, key=len, reverse=True)
+        self.repeat_pattern = re.compile(
+            r"(?<![\w'])(" + "|".join(re.escape(w) for w in stutters) + r")(?:[,\s]+\1)+(?![\w'])",
+            re.IGNORECASE
+        )
+        self.space_before_punct = re.compile(r"\s+([,.!?;:])")
+        self.repeated_punct = re.compile(r"([,;:])(?:\s*[,;:])+")
+        self.comma_before_end = re.compile(r"[,;:]+([.!?])")
+
+    def clean_sentence(self, text):
+        text = self.filler_pattern.sub(" ", text)
+        text = self.repeat_pattern.sub(r"\1", text)
+        text = re.sub(r"\bi\b", "I", text)
+        text = " ".join(text.split())
+        text = self.space_before_punct.sub(r"\1", text)
+        text = self.repeated_punct.sub(r"\1", text)
+        text = self.comma_before_end.sub(r"\1", text).strip(" ,;:")
+        if not text:
+            return ""
+        if text[-1] not in SENTENCE_END:
+            text += "."
+        return text
+
+    def clean(self, text, segments=None):
+        """Cleaned text; Whisper segment boundaries are treated as sentence ends"""
+        pieces = [segment.text for segment in segments] if segments else [text]
+        sentences = [self.clean_sentence(piece) for piece in pieces]
+        text = " ".join(s for s in sentences if s)
+        # Sentence casing after every terminal punctuation mark
+        return re.sub(r"(^|[.!?]\s+)([a-z])", lambda m: m.group(1) + m.group(2).upper(), text)
+
+
+@dataclass
+class RouteDecision:
+    route: str  # "local" or "llm"
+    complexity: int
+    threshold: int
+    reason: str
+
+
+class RewritePolicy:
+    """Decides whether a transcript needs the LLM or only local cleanup"""
+
+    LOCAL = "local"
+    LLM = "llm"
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.counts = {self.LOCAL: 0, self.LLM: 0}
+
+    @staticmethod
+    def complexity(text):
+        """Words, plus a penalty per clause so rambling run-ons go to the LLM"""
+        words = len(text.split())
+        clauses = len(re.findall(r"[,;]|\b(?:and|but|so|because)\b", text, re.IGNORECASE))
+        return words + 2 * clauses
+
+    def route(self, text, comm_type):
+        threshold = config.cleanup.LOCAL_MAX_COMPLEXITY.get(comm_type, 0)
+        complexity = self.complexity(text)
+        if not config.cleanup.ENABLED:
+            decision = RouteDecision(self.LLM, complexity, threshold, "local cleanup disabled")
+        elif complexity <= threshold:
+            decision = RouteDecision(self.LOCAL, complexity, threshold, "under threshold")
+        else:
+            decision = RouteDecision(self.LLM, complexity, threshold, "over threshold")
+
+        self.counts[decision.route] += 1
+        self.logger.info("Route: %s for %s (complexity %d, threshold %d, %s)",
+                         decision.route, comm_type.value, complexity, threshold, decision.reason,
+                         extra={'fields': {'route': decision.route, 'complexity': complexity}})
+        return decision
+
+
+class LocalRewriter:
+    """Fast path for trivial dictations that skips the network"""
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.cleaner = TextCleaner()
+        self.policy = RewritePolicy()
+
+    def rewrite(self, text, segments=None, trace=None):
+        start = time.perf_counter()
+        cleaned = self.cleaner.clean(text, segments)
+        elapsed = time.perf_counter() - start
+        if trace:
+            trace.record('local_cleanup', elapsed, start)
+        self.logger.info("Local cleanup in %.0fµs", elapsed * 1e6)
+        return cleaned
@@ -0,0 +1,128 @@
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from echo.utils.config import config
+from echo.utils.logger import get_logger, log_context, current_utterance
+
+
+class LatencyTracker:
+    """Rolling window of request latencies for one request kind"""
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q):
+        """q-th percentile, None until enough samples were seen"""
+        with self.lock:
+            if len(self.samples) < config.openai.HEDGE_MIN_SAMPLES:
+                return None
+            return float(np.percentile(self.samples, q))
+
+
+@dataclass
+class Attempt:
+    """A request that won the race"""
+    value: object
+    model: str
+    seconds: float
+    hedged: bool = False  # The winner was the hedged duplicate
+    fallback: bool = False  # The winner used the fallback model
+
+
+class DeadlineRunner:
+    """Races LLM attempts against a deadline.
+
+    The routed model gets the first share of the budget. If it has not
+    answered after the p95 of recent latencies, an identical hedged request
+    is sent and whichever finishes first wins. When both fail or the primary
+    share runs out, the fallback model gets the rest of the budget. run()
+    returns None if nothing succeeded before the deadline, so the caller
+    can fall back to the raw transcript. Late results are handed to discard
+    so streams can be closed.
+    """
+
+    def __init__(self, tracker, max_workers=8):
+        self.logger = get_logger(__name__)
+        self.tracker = tracker
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-request")
+
+    def hedge_delay(self):
+        delay = self.tracker.percentile(config.openai.HEDGE_PERCENTILE)
+        return config.openai.HEDGE_DEFAULT_DELAY_SECONDS if delay is None else delay
+
+    def _timed(self, attempt, model, deadline, primary, utterance_id):
+        start = time.perf_counter()
+        with log_context(utterance_id):
+            value = attempt(model, max(0.1, deadline - start))
+        seconds = time.perf_counter() - start
+        if primary:
+            self.tracker.record(seconds)
+        return value, seconds
+
+    def _abandon(self, futures, discard):
+        """Let losing requests finish in the background and release their results"""
+        def release(future):
+            if discard and not future.cancelled() and future.exception() is None:
+                try:
+                    discard(future.result()[0])
+                except Exception as e:
+                    self.logger.debug(f"Error discarding late result: {e}")
+
+        for future in futures:
+            if not future.cancel():
+                future.add_done_callback(release)
+
+    def run(self, attempt, budget, model, discard=None):
+        """attempt(model, timeout) -> value, raising on failure"""
+        start = time.perf_counter()
+        deadline = start + budget
+        primary_until = start + budget * config.openai.PRIMARY_BUDGET_SHARE
+        hedge_at = start + self.hedge_delay() if config.openai.HEDGE_ENABLED else float('inf')
+        fallback_model = config.openai.FALLBACK_MODEL
+        utterance_id = current_utterance()
+
+        pending = {self.executor.submit(self._timed, attempt, model, primary_until, True, utterance_id): "primary"}
+        hedged = fallback_started = False
+
+        while True:
+            now = time.perf_counter()
+            phase_end = deadline if fallback_started else primary_until
+            next_event = phase_end if hedged or fallback_started else min(phase_end, hedge_at)
+            done, _ = wait(pending, timeout=max(0.0, next_event - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                kind = pending.pop(future)
+                if future.exception() is not None:
+                    self.logger.warning(f"LLM {kind} request failed: {future.exception()}")
+                    continue
+                value, seconds = future.result()
+                self._abandon(pending, discard)
+                return Attempt(value, fallback_model if kind == "fallback" else model, seconds,
+                               hedged=kind == "hedge", fallback=kind == "fallback")
+
+            now = time.perf_counter()
+            if not hedged and not fallback_started and pending and now >= hedge_at and now < primary_until:
+                self.logger.info(f"No answer after {now - start:.2f}s, sending hedged request")
+                pending[self.executor.submit(self._timed, attempt, model, primary_until, True, utterance_id)] = "hedge"
+                hedged = True
+            elif not fallback_started and (not pending or now >= primary_until):
+                fallback_started = True
+                if fallback_model and now < deadline:
+                    self.logger.info(f"Primary model missed its share of the {budget:.1f}s budget, "
+                                     f"trying {fallback_model}")
+                    pending[self.executor.submit(
+                        self._timed, attempt, fallback_model, deadline, False, utterance_id)] = "fallback"
+            elif fallback_started and (not pending or now >= deadline):
+                self._abandon(pending, discard)
+                self.logger.warning(f"No LLM response within the {budget:.1f}s deadline")
+                return None
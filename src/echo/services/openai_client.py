@@ -0,0 +1,97 @@
+import os
+import time
+import threading
+from pathlib import Path
+from dotenv import dotenv_values
+
+from echo.utils.config import config
+from echo.utils.logger import get_logger
+
+
+class ClientManager:
+    """Long-lived OpenAI client with a keep-alive connection pool.
+
+    The client is built once and reused for every request, so dictations
+    share warm connections instead of paying for a new TCP and TLS handshake
+    each time. It is rebuilt only when ~/.echo/.env changes on disk.
+    """
+
+    def __init__(self, env_path=None):
+        self.logger = get_logger(__name__)
+        self.env_path = env_path or Path.home() / '.echo' / '.env'
+        self.lock = threading.Lock()
+        self.client = None
+        self.http_client = None
+        self.env_stamp = None  # (mtime, size) of the .env file the client was built from
+        self.last_preconnect = 0.0
+
+    def _stamp(self):
+        try:
+            stat = self.env_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _api_key(self):
+        """API key from the .env file, falling back to the environment"""
+        values = dotenv_values(self.env_path) if self.env_path.exists() else {}
+        return values.get('OPENAI_API_KEY') or os.getenv('OPENAI_API_KEY')
+
+    def get(self):
+        """Current client, rebuilt if the key file changed since it was created"""
+        stamp = self._stamp()
+        with self.lock:
+            if self.client is not None and stamp == self.env_stamp:
+                return self.client
+
+            api_key = self._api_key()
+            if not api_key:
+                self.logger.error("Invalid OpenAI API key. Please set OPENAI_API_KEY in .env file")
+                raise ValueError("Invalid OpenAI API key")
+
+            self.logger.info("Initializing OpenAI client..." if self.client is None
+                             else "Key file changed, rebuilding OpenAI client...")
+            old_client = self.client
+
+            import httpx
+            import openai  # Deferred to the first request, it is the slowest import at startup
+
+            self.http_client = openai.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=config.openai.MAX_CONNECTIONS,
+                    max_keepalive_connections=config.openai.MAX_CONNECTIONS,
+                    keepalive_expiry=config.openai.KEEPALIVE_SECONDS
+                )
+            )
+            self.client = openai.OpenAI(
+                api_key=api_key,
+                base_url=config.openai.BASE_URL or None,
+                timeout=config.openai.REQUEST_TIMEOUT_SECONDS,
+                http_client=self.http_client
+            )
+            self.env_stamp = stamp
+            self.last_preconnect = 0.0
+
+            if old_client is not None:
+                old_client.close()
+            return self.client
+
+    def preconnect(self):
+        """Open a pooled connection in the background so the next request finds it warm"""
+        now = time.monotonic()
+        # A connection opened recently is still in the pool
+        if now - self.last_preconnect < config.openai.KEEPALIVE_SECONDS / 2:
+            return
+        self.last_preconnect = now
+        threading.Thread(target=self._preconnect, daemon=True).start()
+
+    def _preconnect(self):
+        try:
+            client = self.get()
+            start = time.perf_counter()
+            # Any response will do, we only want the connection and TLS session in the pool
+            self.http_client.head(str(client.base_url), timeout=5.0)
+            self.logger.debug(f"OpenAI connection warmed in {time.perf_counter() - start:.3f}s")
+        except Exception as e:
+            self.last_preconnect = 0.0
+            self.logger.warning(f"OpenAI pre-connect failed: {e}")
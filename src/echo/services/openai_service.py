@@ -1,82 +1,244 @@
-import os
-import openai
+import time
 import datetime
-from pathlib import Path
-from dotenv import load_dotenv
+import dataclasses
 
+from echo.services.deadlines import DeadlineRunner, LatencyTracker
+from echo.services.openai_client import ClientManager
+from echo.services.prompts import PromptRegistry
+from echo.services.response_cache import ResponseCache
+from echo.services.router import ModelRouter
 from echo.utils.config import config
-from echo.utils.logger import get_logger
-from echo.utils.config import ToneMode, CommunicationType, BASE_CONTEXT
+from echo.utils.logger import get_logger, redact
+from echo.utils.config import ToneMode, CommunicationType
 
 
 class OpenAIService:
     def __init__(self):
         self.logger = get_logger(__name__)
         self.client = None
+        self.clients = ClientManager()
+        self.cache = ResponseCache()
+        self.prompts = PromptRegistry()
+        self.router = ModelRouter()
+        # Whole responses and first streamed tokens have different latency profiles
+        self.requests = DeadlineRunner(LatencyTracker())
+        self.stream_requests = DeadlineRunner(LatencyTracker())
         
     def initialize(self):
-        """Initialize OpenAI client with API key"""
-        # Load from the correct .env file location
-        env_path = Path.home() / '.echo' / '.env'
-        load_dotenv(env_path)
-        api_key = os.getenv('OPENAI_API_KEY')
-        
-        # Validate API key
-        if not api_key:
-            self.logger.error("Invalid OpenAI API key. Please set OPENAI_API_KEY in .env file")
-            raise ValueError("Invalid OpenAI API key")
-            
-        self.logger.info("Initializing OpenAI client...")
-        self.client = openai.OpenAI(api_key=api_key)
+        """Use the shared OpenAI client, rebuilt only when ~/.echo/.env changes"""
+        self.client = self.clients.get()
+
+    def preconnect(self):
+        """Warm a pooled connection in the background, e.g. when recording starts"""
+        self.clients.preconnect()
 
-    def process_text(self, text, tone=ToneMode.FRIENDLY, comm_type=CommunicationType.DM):
+    def process_text(self, text, tone=ToneMode.FRIENDLY, comm_type=CommunicationType.DM, trace=None):
         try:
-            self.logger.info(f"Processing text with OpenAI: {text}")
+            self.logger.info("Processing text with OpenAI: %s", redact(text))
             start_time = datetime.datetime.now()
-            
-            # Get message context with appropriate language and tone
-            message_context = config.openai.get_message_context(tone, comm_type)
+            route = self.router.route(text, comm_type)
+
+            cached = self.cached_response(text, tone, comm_type, route, trace)
+            if cached:
+                return cached, (datetime.datetime.now() - start_time).total_seconds()
+
+            messages = self.build_messages(text, tone, comm_type, trace)
             
             self.logger.info("Sending request to OpenAI...")
             print(f"\nSending request to OpenAI with API key: {config.openai.API_KEY[:8]}...")  # Show first 8 chars
             
             self.initialize()
+            client = self.client
 
-            response = self.client.chat.completions.create(
-                model=config.openai.MODEL,
-                temperature=config.openai.TEMPERATURE,
-                max_tokens=config.openai.MAX_TOKENS,
-                messages=[
-                    {"role": "system", "content": BASE_CONTEXT + message_context},
-                    {"role": "user", "content": text}
-                ]
-            )
-            
-            response_text = response.choices[0].message.content.strip()
+            def attempt(model, timeout):
+                try:
+                    # The streaming-response wrapper returns once headers arrive, which gives us TTFB
+                    request_start = time.perf_counter()
+                    with client.with_options(timeout=timeout, max_retries=0).chat.completions.with_streaming_response.create(
+                        model=model,
+                        temperature=config.openai.TEMPERATURE,
+                        max_tokens=route.max_tokens,
+                        messages=messages
+                    ) as raw_response:
+                        ttfb = time.perf_counter() - request_start
+                        response = raw_response.parse()
+                    response_text = (response.choices[0].message.content or "").strip()
+                    if not response_text:
+                        raise ValueError(f"Empty response from {model}")
+                    return response_text, ttfb, response.choices[0].finish_reason
+                except Exception as e:
+                    self.report_error(e)
+                    raise
+
+            request_start = time.perf_counter()
+            budget = self.deadline(comm_type)
+            result = self.requests.run(attempt, budget, route.model)
+            if result is None:
+                return self.transcript_fallback(text, budget, trace, request_start), \
+                    (datetime.datetime.now() - start_time).total_seconds()
+
+            response_text, ttfb, finish_reason = result.value
+            self.record_route(route, result, response_text, finish_reason)
+            if trace:
+                trace.record('llm_request', time.perf_counter() - request_start, request_start,
+                             ttfb=round(ttfb, 4), model=result.model, hedged=result.hedged, fallback=result.fallback,
+                             route=route.name, max_tokens=route.max_tokens, finish_reason=finish_reason)
             processing_time = (datetime.datetime.now() - start_time).total_seconds()
             
-            self.logger.info(f"✍️ OpenAI response: {response_text}")
-            self.logger.info(f"⏱️ Processing time: {processing_time:.2f}s")
+            self.logger.info("✍️ OpenAI response (%s): %s", result.model, redact(response_text),
+                             extra={'fields': {'model': result.model, 'route': route.name,
+                                               'seconds': round(processing_time, 3)}})
+            self.logger.info("⏱️ Processing time: %.2fs", processing_time)
+            if not result.fallback and finish_reason != "length":
+                self.cache.put(text, tone, comm_type, route.model, self.prompts.version, response_text)
             
             return response_text, processing_time
             
-        except openai.APIError as e:
+        except Exception as e:
+            self.report_error(e)
+            return None, 0
+
+    def record_route(self, route, result, response_text, finish_reason, first_token=None):
+        """Per-route latency and truncation stats, fallback answers are kept apart"""
+        if result.fallback:
+            route = dataclasses.replace(route, name=f"{route.name}/fallback", model=result.model)
+        self.router.record(route, result.seconds, response_text, finish_reason, first_token)
+
+    def deadline(self, comm_type):
+        """Seconds until something has to be typed for this kind of message"""
+        return config.openai.DEADLINES.get(comm_type, max(config.openai.DEADLINES.values()))
+
+    def transcript_fallback(self, text, budget, trace=None, request_start=None):
+        """Last link of the fallback chain: the raw transcript, or None when disabled"""
+        if trace and request_start is not None:
+            trace.record('llm_request', time.perf_counter() - request_start, request_start,
+                         model=None, fallback='transcript')
+        if not config.openai.FALLBACK_TO_TRANSCRIPT:
+            return None
+        self.logger.warning("No rewrite within %.1fs, using the raw transcript", budget)
+        print(f"\n⚠️ No response within {budget:.1f}s, typing the transcript as spoken")
+        return text.strip()
+
+    def cached_response(self, text, tone, comm_type, route, trace=None):
+        """Rewrite of an identical earlier dictation, None on a miss"""
+        lookup_start = time.perf_counter()
+        cached = self.cache.get(text, tone, comm_type, route.model, self.prompts.version)
+        if trace:
+            trace.record('cache_lookup', time.perf_counter() - lookup_start, lookup_start, hit=cached is not None)
+        if cached:
+            self.logger.info("✍️ Cached response: %s", redact(cached))
+        return cached
+
+    def build_messages(self, text, tone, comm_type, trace=None):
+        """Chat messages for a rewrite request"""
+        # Prompts are rendered once per language and template change
+        prompt_start = time.perf_counter()
+        prompt = self.prompts.get(tone, comm_type)
+        messages = [
+            {"role": "system", "content": prompt.system},
+            {"role": "user", "content": text}
+        ]
+        if trace:
+            trace.record('prompt_build', time.perf_counter() - prompt_start, prompt_start,
+                         prompt_tokens=prompt.tokens)
+        return messages
+
+    def stream_text(self, text, tone=ToneMode.FRIENDLY, comm_type=CommunicationType.DM, trace=None):
+        """Yield the rewrite in chunks as the completion streams in.
+
+        The deadline applies to the first token: hedging and the fallback
+        chain race for it, and once text flows the stream runs to the end.
+        Errors are logged and end the stream, so a consumer gets whatever
+        arrived before the failure.
+        """
+        try:
+            self.logger.info("Streaming text with OpenAI: %s", redact(text))
+            route = self.router.route(text, comm_type)
+            cached = self.cached_response(text, tone, comm_type, route, trace)
+            if cached:
+                yield cached
+                return
+
+            messages = self.build_messages(text, tone, comm_type, trace)
+            self.initialize()
+            client = self.client
+
+            def attempt(model, timeout):
+                try:
+                    stream = client.with_options(timeout=timeout, max_retries=0).chat.completions.create(
+                        model=model,
+                        temperature=config.openai.TEMPERATURE,
+                        max_tokens=route.max_tokens,
+                        messages=messages,
+                        stream=True
+                    )
+                    for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            return stream, chunk.choices[0].delta.content
+                    raise ValueError(f"Empty response from {model}")
+                except Exception as e:
+                    self.report_error(e)
+                    raise
+
+            request_start = time.perf_counter()
+            budget = self.deadline(comm_type)
+            result = self.stream_requests.run(attempt, budget, route.model, discard=lambda value: value[0].close())
+            if result is None:
+                fallback_text = self.transcript_fallback(text, budget, trace, request_start)
+                if fallback_text:
+                    yield fallback_text
+                return
+
+            stream, delta = result.value
+            first_token = time.perf_counter() - request_start
+            parts = [delta]
+            finish_reason = None
+            yield delta
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+            processing_time = time.perf_counter() - request_start
+            response_text = "".join(parts).strip()
+            self.logger.info("⏱️ Streamed %d chars from %s in %.2fs, first token after %.2fs",
+                             len(response_text), result.model, processing_time, first_token,
+                             extra={'fields': {'model': result.model, 'route': route.name,
+                                               'seconds': round(processing_time, 3),
+                                               'ttfb': round(first_token, 3)}})
+            # The whole stream counts for route latency, not just the first token
+            self.record_route(route, dataclasses.replace(result, seconds=processing_time), response_text, finish_reason,
+                              first_token)
+            if not result.fallback and finish_reason != "length":
+                self.cache.put(text, tone, comm_type, route.model, self.prompts.version, response_text)
+            if trace:
+                trace.record('llm_request', processing_time, request_start, ttfb=round(first_token, 4),
+                             model=result.model, streamed=True, hedged=result.hedged, fallback=result.fallback,
+                             route=route.name, max_tokens=route.max_tokens, finish_reason=finish_reason)
+
+        except Exception as e:
+            self.report_error(e)
+
+    def report_error(self, e):
+        """Log and print a failed request"""
+        import openai  # Already loaded by the client by the time a request fails
+
+        if isinstance(e, openai.APIError):
             self.logger.error(f"OpenAI API Error: {e}")
             print(f"\nOpenAI API Error: {e}")
-            return None, 0
-        except openai.APIConnectionError as e:
+        elif isinstance(e, openai.APIConnectionError):
             self.logger.error(f"Connection Error: {e}")
             print(f"\nConnection Error: Check your internet connection")
-            return None, 0
-        except openai.APIStatusError as e:
+        elif isinstance(e, openai.APIStatusError):
             self.logger.error(f"Status Error: {e}")
             print(f"\nAPI Status Error: {e.status_code} - {e.message}")
-            return None, 0
-        except openai.APITimeoutError as e:
+        elif isinstance(e, openai.APITimeoutError):
             self.logger.error(f"Timeout Error: {e}")
             print("\nTimeout Error: Request took too long")
-            return None, 0
-        except Exception as e:
+        else:
             self.logger.error(f"Unexpected error in OpenAI service: {e}", exc_info=True)
-            print(f"\nUnexpected Error: {e}")
-            return None, 0
\ No newline at end of file
+            print(f"\nUnexpected Error: {e}")
\ No newline at end of file
@@ -0,0 +1,137 @@
+import time
+import queue
+import itertools
+import threading
+import contextlib
+from dataclasses import dataclass, field
+
+from echo.utils.logger import get_logger, log_context, current_utterance
+
+_STOP = object()
+
+
+@dataclass
+class Job:
+    """One dictation moving through the pipeline"""
+    seq: int
+    data: dict = field(default_factory=dict)  # Stage inputs and outputs
+    error: Exception = None
+    done: bool = False  # Set by a stage when nothing is left to do
+    queued_at: float = field(default_factory=time.perf_counter)
+    waits: dict = field(default_factory=dict)  # Seconds spent queued before each stage
+
+
+class JobPipeline:
+    """Runs jobs through named stages, one worker thread per stage.
+
+    Stages are connected by bounded queues, so a slow stage applies
+    backpressure instead of piling up recordings. Every stage has a single
+    worker taking jobs in FIFO order, so outputs come out in submission
+    order while different jobs occupy different stages at the same time.
+    A stage marks a job done (or raises) to skip the remaining stages;
+    on_done is called exactly once per job either way. context(job), if
+    given, returns a context manager every stage call runs inside.
+    """
+
+    def __init__(self, stages, on_done=None, queue_size=4, context=None):
+        self.logger = get_logger(__name__)
+        self.stages = stages  # [(name, fn(job)), ...]
+        self.on_done = on_done
+        self.context = context or (lambda job: contextlib.nullcontext())
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.counter = itertools.count(1)
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.workers = []
+
+        for index, (name, fn) in enumerate(stages):
+            worker = threading.Thread(target=self._run, args=(index, name, fn), name=f"pipeline-{name}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def submit(self, **data):
+        """Queue a job for the first stage, blocks only when that queue is full"""
+        job = Job(next(self.counter), data)
+        with self.lock:
+            self.in_flight += 1
+        self.queues[0].put(job)
+        return job
+
+    def _run(self, index, name, fn):
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.queues) else None
+        while True:
+            job = inbox.get()
+            if job is _STOP:
+                if outbox:
+                    outbox.put(_STOP)
+                return
+
+            job.waits[name] = time.perf_counter() - job.queued_at
+            if not job.done and job.error is None:
+                try:
+                    with self.context(job):
+                        fn(job)
+                except Exception as e:
+                    self.logger.error("Error in %s stage for job %d: %s", name, job.seq, e, exc_info=True)
+                    print(f"\nError: {e}")
+                    job.error = e
+
+            if outbox and not job.done and job.error is None:
+                job.queued_at = time.perf_counter()
+                outbox.put(job)
+            else:
+                self._finish(job)
+
+    def _finish(self, job):
+        try:
+            if self.on_done:
+                with self.context(job):
+                    self.on_done(job)
+        except Exception as e:
+            self.logger.error("Error finishing job %d: %s", job.seq, e)
+        with self.lock:
+            self.in_flight -= 1
+            self.idle.notify_all()
+
+    def pending(self):
+        """Jobs submitted but not finished"""
+        with self.lock:
+            return self.in_flight
+
+    def join(self, timeout=None):
+        """Wait until every submitted job has finished"""
+        with self.lock:
+            return self.idle.wait_for(lambda: self.in_flight == 0, timeout)
+
+    def shutdown(self, timeout=None):
+        """Finish queued jobs, then stop the workers"""
+        self.queues[0].put(_STOP)
+        for worker in self.workers:
+            worker.join(timeout)
+
+
+class Prefetcher:
+    """Iterates a source on a background thread so it keeps running while the consumer is busy"""
+
+    def __init__(self, iterable):
+        self.queue = queue.Queue()
+        self.utterance_id = current_utterance()
+        self.thread = threading.Thread(target=self._fill, args=(iterable,), daemon=True)
+        self.thread.start()
+
+    def _fill(self, iterable):
+        try:
+            with log_context(self.utterance_id):
+                for item in iterable:
+                    self.queue.put(item)
+        finally:
+            self.queue.put(_STOP)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            yield item
@@ -0,0 +1,121 @@
+import json
+import time
+import functools
+import hashlib
+import threading
+from dataclasses import dataclass
+
+from echo.utils.config import config, ToneMode, CommunicationType, BASE_CONTEXT
+from echo.utils.logger import get_logger
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(model):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text):
+    """Token count with tiktoken when installed, otherwise the ~4 chars/token estimate"""
+    encoding = _encoding(config.openai.MODEL)
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
+
+
+@dataclass(frozen=True)
+class Prompt:
+    system: str
+    tokens: int
+
+
+class PromptRegistry:
+    """System prompts for every tone x mode, rendered once and reused.
+
+    The shared base context comes first and is byte-identical across all
+    combinations so provider-side prompt caching can reuse the prefix; the
+    tone and format text follow. Templates can be overridden in
+    OpenAIConfig.PROMPTS_FILE, which is re-read whenever it changes.
+    """
+
+    def __init__(self, path=None):
+        self.logger = get_logger(__name__)
+        self.path = path or config.openai.PROMPTS_FILE
+        self.lock = threading.Lock()
+        self.language = None
+        self.prompts = {}
+        self.version = None
+        self.file_stamp = None
+        self.reload()
+
+    def _stamp(self):
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def load_templates(self):
+        """Base, tone and format templates, with overrides from the prompts file"""
+        base = BASE_CONTEXT
+        tones = dict(config.openai.TONE_PROMPTS)
+        formats = dict(config.openai.COMM_FORMATS)
+
+        if self.path.exists():
+            try:
+                overrides = json.loads(self.path.read_text(encoding='utf-8'))
+                base = overrides.get('base', base)
+                tones.update({ToneMode(k): v for k, v in overrides.get('tones', {}).items()})
+                formats.update({CommunicationType(k): v for k, v in overrides.get('formats', {}).items()})
+                self.logger.info(f"Loaded prompt overrides from {self.path}")
+            except (OSError, ValueError, AttributeError) as e:
+                self.logger.error(f"Ignoring invalid prompts file {self.path}: {e}")
+        return base, tones, formats
+
+    def reload(self):
+        """Render every combination from the current templates"""
+        start = time.perf_counter()
+        if self.language is None:
+            # Spawns a subprocess on macOS, so only once per run
+            self.language = config.openai.get_system_language()
+        lang_code, region = self.language
+
+        stamp = self._stamp()
+        base, tones, formats = self.load_templates()
+        base = base.replace('{lang_code}', lang_code).replace('{region}', region)
+
+        prompts = {}
+        for tone in ToneMode:
+            for comm_type in CommunicationType:
+                system = base + config.openai.get_message_context(tone, comm_type, tones, formats)
+                prompts[tone, comm_type] = Prompt(system, count_tokens(system))
+
+        digest = hashlib.sha256()
+        for key in sorted(prompts, key=lambda k: (k[0].value, k[1].value)):
+            digest.update(prompts[key].system.encode())
+
+        with self.lock:
+            self.prompts = prompts
+            self.version = digest.hexdigest()[:12]
+            self.file_stamp = stamp
+
+        tokens = sorted(p.tokens for p in prompts.values())
+        self.logger.info(f"Rendered {len(prompts)} prompts in {time.perf_counter() - start:.3f}s "
+                         f"({tokens[0]}-{tokens[-1]} tokens, shared prefix {count_tokens(base)}, "
+                         f"version {self.version})")
+
+    def get(self, tone, comm_type):
+        """Rendered prompt, re-rendering first if the prompts file changed"""
+        if self._stamp() != self.file_stamp:
+            self.reload()
+        return self.prompts[tone, comm_type]
+
+    def token_counts(self):
+        return {f"{tone.value}/{comm_type.value}": prompt.tokens
+                for (tone, comm_type), prompt in self.prompts.items()}
@@ -0,0 +1,129 @@
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from echo.utils.config import config
+from echo.utils.logger import get_logger
+
+
+class ResponseCache:
+    """Two-tier cache of LLM rewrites: an in-memory LRU in front of SQLite under ~/.echo.
+
+    Keys combine the normalized transcript with tone, mode, model and prompt
+    version, so changing any of them never serves a stale rewrite. Only a
+    hash of the key is stored on disk. Entries expire after a TTL and both
+    tiers are bounded in size, evicting the least recently used entries.
+    """
+
+    def __init__(self, path=None):
+        self.logger = get_logger(__name__)
+        self.enabled = config.cache.ENABLED
+        self.path = path or config.cache.CACHE_FILE
+        self.memory = OrderedDict()  # key -> (created, response)
+        self.lock = threading.Lock()
+        self.db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.enabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.db = sqlite3.connect(str(self.path), check_same_thread=False)
+                self.db.execute("""CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY, response TEXT NOT NULL,
+                    created REAL NOT NULL, accessed REAL NOT NULL)""")
+                self.db.execute("DELETE FROM responses WHERE created < ?",
+                                (time.time() - config.cache.TTL_SECONDS,))
+                self.db.commit()
+            except sqlite3.Error as e:
+                self.logger.error(f"Response cache on disk unavailable, using memory only: {e}")
+                self.db = None
+
+    @staticmethod
+    def normalize(text):
+        """Case, punctuation and spacing differences Whisper produces for the same words"""
+        text = re.sub(r"[^\w\s']", " ", text.lower())
+        return " ".join(text.split())
+
+    def key(self, text, tone, comm_type, model, prompt_version):
+        parts = [self.normalize(text), tone.value, comm_type.value, model, prompt_version]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def cacheable(self, text):
+        return self.enabled and 0 < len(self.normalize(text)) <= config.cache.MAX_TRANSCRIPT_CHARS
+
+    def get(self, text, tone, comm_type, model, prompt_version):
+        """Cached rewrite or None"""
+        if not self.cacheable(text):
+            return None
+
+        key = self.key(text, tone, comm_type, model, prompt_version)
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry and now - entry[0] < config.cache.TTL_SECONDS:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            self.memory.pop(key, None)
+
+            row = None
+            if self.db is not None:
+                try:
+                    row = self.db.execute("SELECT response, created FROM responses WHERE key = ? AND created >= ?",
+                                          (key, now - config.cache.TTL_SECONDS)).fetchone()
+                    if row:
+                        self.db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        self.db.commit()
+                except sqlite3.Error as e:
+                    self.logger.error(f"Response cache read failed: {e}")
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._remember(key, row[1], row[0])
+            return row[0]
+
+    def put(self, text, tone, comm_type, model, prompt_version, response):
+        if not response or not self.cacheable(text):
+            return
+
+        key = self.key(text, tone, comm_type, model, prompt_version)
+        now = time.time()
+        with self.lock:
+            self._remember(key, now, response)
+            if self.db is None:
+                return
+            try:
+                self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, response, now, now))
+                # Keep the newest DISK_ENTRIES by last use
+                self.db.execute("""DELETE FROM responses WHERE key NOT IN (
+                    SELECT key FROM responses ORDER BY accessed DESC LIMIT ?)""", (config.cache.DISK_ENTRIES,))
+                self.db.commit()
+            except sqlite3.Error as e:
+                self.logger.error(f"Response cache write failed: {e}")
+
+    def _remember(self, key, created, response):
+        self.memory[key] = (created, response)
+        self.memory.move_to_end(key)
+        while len(self.memory) > config.cache.MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+
+    def stats(self):
+        """Hit/miss counters since startup"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            'hits': hits,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
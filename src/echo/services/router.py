@@ -0,0 +1,148 @@
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from echo.services.prompts import count_tokens
+from echo.utils.config import config
+from echo.utils.logger import get_logger
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str  # comm_type value, with a suffix when the fast model was picked
+    model: str
+    max_tokens: int
+    input_tokens: int
+
+
+class RouteStats:
+    """Recent latencies and truncations of one route"""
+
+    def __init__(self, window=100):
+        self.latencies = deque(maxlen=window)
+        self.samples = deque(maxlen=window)  # (monotonic time, first token seconds or None, seconds, output tokens)
+        self.requests = 0
+        self.truncated = 0
+
+    def record(self, seconds, output_tokens, truncated, first_token=None):
+        self.requests += 1
+        self.truncated += truncated
+        self.latencies.append(seconds)
+        self.samples.append((time.monotonic(), first_token, seconds, output_tokens))
+
+    def expected_seconds(self, max_tokens, max_age, minimum=5):
+        """Typical request time from recent samples, None until there are enough of them.
+
+        Streamed requests are split into time to first token plus generation
+        time per token and rescaled to the route's usual output length;
+        whole-response requests only have their total time.
+        """
+        now = time.monotonic()
+        recent = [sample for sample in self.samples if now - sample[0] <= max_age]
+        if len(recent) < minimum:
+            return None
+
+        lengths = [tokens for _, _, _, tokens in recent if tokens]
+        usual_tokens = min(float(np.median(lengths)) if lengths else 0.0, max_tokens)
+        estimates = []
+        for _, first_token, seconds, tokens in recent:
+            if first_token is not None and tokens:
+                estimates.append(first_token + (seconds - first_token) / tokens * usual_tokens)
+            else:
+                estimates.append(seconds)
+        return float(np.median(estimates))
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'p50': float(np.percentile(self.latencies, 50)) if self.latencies else None,
+            'p95': float(np.percentile(self.latencies, 95)) if self.latencies else None,
+            'truncation_rate': self.truncated / self.requests if self.requests else 0.0,
+        }
+
+
+class ModelRouter:
+    """Picks the model and max_tokens for a rewrite from OpenAIConfig.ROUTES.
+
+    max_tokens scales with the transcript's token count (output_ratio) within
+    the rule's bounds, and grows for a route whose responses keep getting cut
+    off. When the routed model's recent requests, at their usual length,
+    would miss the rule's latency target, the rule's fast model is used
+    instead. Only the routed model's own samples decide, they age out after
+    ROUTE_STATS_MAX_AGE_SECONDS, and every ROUTE_PROBE_EVERY-th request that
+    would go fast probes the routed model again, so a slow spell doesn't
+    pin the route to the fast model.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.boost = {}  # route name -> max_tokens multiplier learned from truncations
+        self.fast_streak = {}  # route name -> requests sent to the fast model since the last probe
+
+    def rule(self, comm_type):
+        return config.openai.ROUTES.get(comm_type, {})
+
+    def expected_seconds(self, name, max_tokens):
+        """Typical time of the routed model for this route, None without recent samples"""
+        stats = self.stats.get(name)
+        if not stats:
+            return None
+        return stats.expected_seconds(max_tokens, config.openai.ROUTE_STATS_MAX_AGE_SECONDS)
+
+    def route(self, text, comm_type):
+        rule = self.rule(comm_type)
+        input_tokens = count_tokens(text)
+        name = comm_type.value
+
+        with self.lock:
+            boost = self.boost.get(name, 1.0)
+            wanted = int(input_tokens * rule.get('output_ratio', 1.5) * boost) + rule.get('overhead_tokens', 0)
+            max_tokens = max(rule.get('min_tokens', 16), min(wanted, rule.get('max_tokens', config.openai.MAX_TOKENS)))
+
+            model = rule.get('model', config.openai.MODEL)
+            expected = self.expected_seconds(name, max_tokens)
+            target = rule.get('latency_target')
+            if rule.get('fast_model') and target and expected and expected > target:
+                streak = self.fast_streak.get(name, 0) + 1
+                if streak >= config.openai.ROUTE_PROBE_EVERY:
+                    self.fast_streak[name] = 0
+                    self.logger.info("Route %s: probing %s again (~%.1fs expected)", name, model, expected)
+                else:
+                    self.fast_streak[name] = streak
+                    self.logger.info("Route %s: ~%.1fs expected, over the %.1fs target, using %s",
+                                     name, expected, target, rule['fast_model'])
+                    model = rule['fast_model']
+                    name = f"{name}/fast"
+            else:
+                self.fast_streak[name] = 0
+
+        route = Route(name, model, max_tokens, input_tokens)
+        self.logger.info("Route %s: %s, max_tokens %d for %d input tokens",
+                         route.name, route.model, route.max_tokens, input_tokens)
+        return route
+
+    def record(self, route, seconds, output_text, finish_reason, first_token=None):
+        """Record a finished request; finish_reason 'length' means max_tokens cut it off.
+
+        first_token is the time to the first streamed token, None for whole responses.
+        """
+        truncated = finish_reason == "length"
+        base = route.name.split("/")[0]
+        with self.lock:
+            self.stats.setdefault(route.name, RouteStats()).record(
+                seconds, count_tokens(output_text) if output_text else 0, truncated, first_token)
+            # Allow longer answers after a truncation, drift back while they fit
+            if truncated:
+                self.boost[base] = min(4.0, self.boost.get(base, 1.0) * 1.5)
+                self.logger.warning(f"Route {route.name} truncated at {route.max_tokens} tokens")
+            else:
+                self.boost[base] = max(1.0, self.boost.get(base, 1.0) * 0.98)
+
+    def summary(self):
+        with self.lock:
+            return {name: stats.summary() for name, stats in sorted(self.stats.items())}
@@ -0,0 +1,113 @@
+import queue
+import time
+import threading
+import numpy as np
+from echo.services.transcription import Transcription, TranscriptionStats
+from echo.utils.config import config
+from echo.utils.logger import get_logger
+
+class StreamingTranscriber:
+    """Decodes audio windows on a background thread while recording continues.
+
+    Windows are appended to a pending buffer which is decoded as a whole.
+    Segments that end well before the end of the pending audio are committed
+    and their audio dropped; the tail is kept so a word cut by a window
+    boundary is decoded again together with the next window. In speech
+    without pauses the last segment stays open, so once STREAM_COMMIT_LAG
+    seconds are pending every segment before it is committed as well. That
+    keeps the audio decoded per window bounded instead of growing with the
+    utterance.
+    """
+
+    def __init__(self, transcriber, vad_filter=True):
+        self.logger = get_logger(__name__)
+        self.transcriber = transcriber
+        self.vad_filter = vad_filter  # False when the recorder only hands over speech
+        self.sample_rate = config.audio.SAMPLE_RATE
+        self.holdback = int(config.whisper.STREAM_HOLDBACK_SECONDS * self.sample_rate)
+        self.commit_lag = int(config.whisper.STREAM_COMMIT_LAG_SECONDS * self.sample_rate)
+        self.max_pending = int(config.whisper.STREAM_MAX_PENDING_SECONDS * self.sample_rate)
+
+        self.windows = queue.Queue()
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.committed = []
+        self.stats = TranscriptionStats()
+        self.worker = None
+
+    def start(self):
+        """Start the background decode worker"""
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def feed(self, window):
+        """Queue a captured window for decoding (called from the recorder)"""
+        self.windows.put(window)
+
+    def finish(self):
+        """Decode the remaining tail and return the assembled Transcription"""
+        self.windows.put(None)
+        if self.worker:
+            self.worker.join()
+        text = " ".join(segment.text.strip() for segment in self.committed if segment.text.strip())
+        return Transcription(text, self.committed, self.stats)
+
+    def cancel(self):
+        """Stop the worker without waiting for the tail to be decoded"""
+        self.committed = []
+        self.windows.put(None)
+
+    def _run(self):
+        while True:
+            window = self.windows.get()
+            if window is None:
+                break
+            self.pending = np.concatenate([self.pending, self.transcriber.to_mono(window)])
+            self._commit(final=False)
+        self._commit(final=True)
+
+    def _commit(self, final):
+        """Decode pending audio and commit the segments that are settled"""
+        try:
+            if not final and len(self.pending) <= self.holdback:
+                return
+
+            start = time.perf_counter()
+            audio = self.transcriber.prepare_audio(self.pending)
+            self.stats.preprocess_seconds += time.perf_counter() - start
+            segments = self.transcriber.decode_segments(audio, self.stats, self.vad_filter) if audio is not None else []
+
+            if final:
+                self.committed.extend(segments)
+                self.pending = np.zeros(0, dtype=np.float32)
+                return
+
+            if len(self.pending) >= self.max_pending:
+                # Commit everything, only the audio after the last segment is decoded again
+                self.committed.extend(segments)
+                cut = int(segments[-1].end * self.sample_rate) if segments else len(self.pending)
+                self.pending = self.pending[cut:]
+                return
+
+            limit = len(self.pending) - self.holdback
+            if segments and len(self.pending) >= self.commit_lag:
+                # A segment followed by another one is settled even if the last is still open
+                limit = max(limit, int(segments[-1].start * self.sample_rate))
+            cut = 0
+            for segment in segments:
+                end = int(segment.end * self.sample_rate)
+                if end > limit:
+                    break
+                self.committed.append(segment)
+                cut = end
+
+            if not segments:
+                # Nothing but silence so far, keep only the tail
+                cut = limit
+
+            if cut:
+                self.pending = self.pending[cut:]
+                self.logger.debug("Committed %d segments, %.2fs pending",
+                                  len(self.committed), len(self.pending) / self.sample_rate)
+
+        except Exception as e:
+            self.logger.error(f"Error in streaming transcription: {e}", exc_info=True)
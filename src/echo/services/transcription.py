@@ -1,85 +1,291 @@
+import time
+import threading
+import dataclasses
 import numpy as np
-from faster_whisper import WhisperModel
+from dataclasses import dataclass, field
 from echo.utils.config import config
-from echo.utils.logger import get_logger
+from echo.utils.logger import get_logger, redact
+
+@dataclass
+class TranscriptionStats:
+    """Per-utterance decode statistics"""
+    audio_seconds: float = 0.0
+    preprocess_seconds: float = 0.0  # Speech collection, downmix and normalization
+    greedy_seconds: float = 0.0
+    beam_seconds: float = 0.0
+    segments: int = 0
+    escalated: int = 0  # Segments re-decoded with beam search
+    over_budget: int = 0  # Hard segments left greedy because of the latency budget
+
+    @property
+    def path(self):
+        if not self.greedy_seconds:
+            return "beam" if self.beam_seconds else "none"
+        return "greedy+beam" if self.escalated else "greedy"
+
+    @property
+    def decode_seconds(self):
+        return self.greedy_seconds + self.beam_seconds
+
+    def summary(self):
+        return (f"{self.path} in {self.decode_seconds:.2f}s for {self.audio_seconds:.1f}s of audio "
+                f"({self.escalated}/{self.segments} segments escalated, {self.over_budget} over budget)")
+
+@dataclass
+class Transcription:
+    text: str
+    segments: list = field(default_factory=list)
+    stats: TranscriptionStats = field(default_factory=TranscriptionStats)
 
 class Transcriber:
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
     def __init__(self):
         self.logger = get_logger(__name__)
         self.logger.info("Initializing Transcriber...")
-        
-        # Load model with explicit model size
+
+        self.model = None
+        self.state = self.LOADING
+        self.ready = threading.Event()
+        self.state_listeners = []
+        self.load_thread = None
+
+        # Set parameters
+        self.beam_size = config.whisper.BEAM_SIZE
+        self.best_of = config.whisper.BEAM_SIZE
+        self.temperature = 0.0
+        self.compression_ratio_threshold = 2.4
+        self.condition_on_previous_text = True
+
+    def add_state_listener(self, listener):
+        """Call listener(state) now and on every model state change"""
+        self.state_listeners.append(listener)
+        listener(self.state)
+
+    def _set_state(self, state):
+        self.state = state
+        if state == self.LOADING:
+            self.ready.clear()
+        else:
+            self.ready.set()
+        for listener in list(self.state_listeners):
+            try:
+                listener(state)
+            except Exception as e:
+                self.logger.error(f"Error in model state listener: {e}")
+
+    def load_async(self):
+        """Load and warm up the model on a background thread"""
+        if self.load_thread is None:
+            self.load_thread = threading.Thread(target=self.load, daemon=True)
+            self.load_thread.start()
+
+    @staticmethod
+    def create_model(**kwargs):
+        """Build a WhisperModel from WhisperConfig, kwargs override or extend it"""
+        from faster_whisper import WhisperModel  # Pulls in CTranslate2, only on the loader thread
+
+        options = dict(
+            model_size_or_path=config.whisper.MODEL_SIZE,
+            device=config.whisper.DEVICE,
+            compute_type=config.whisper.COMPUTE_TYPE
+        )
+        options.update(kwargs)
+        return WhisperModel(**options)
+
+    def load(self):
+        """Load the configured Whisper model and run a warm-up decode"""
         try:
-            self.model = WhisperModel(
-                model_size_or_path="base",  # Use "base" model
-                device="cpu",
-                compute_type="int8"
-            )
-            self.logger.info("Whisper model loaded successfully")
-            
-            # Set parameters
-            self.beam_size = 5
-            self.best_of = 5
-            self.temperature = 0.0
-            self.compression_ratio_threshold = 2.4
-            self.condition_on_previous_text = True
-            
+            start = time.perf_counter()
+            self.model = self.create_model()
+            self.logger.info(f"Whisper model '{config.whisper.MODEL_SIZE}' loaded "
+                             f"in {time.perf_counter() - start:.2f}s")
+
+            self.warm_up()
+            self.logger.info(f"Whisper model ready in {time.perf_counter() - start:.2f}s")
+            self._set_state(self.READY)
+
         except Exception as e:
             self.logger.error(f"Error loading Whisper model: {e}")
-            raise
+            self._set_state(self.FAILED)
 
-    def transcribe_audio(self, audio):
+    def warm_up(self):
+        """Decode a short synthetic clip so CTranslate2 and the VAD model initialize now"""
         try:
-            self.logger.info(f"Starting transcription. Audio shape: {audio.shape}")
-            
-            # Convert stereo to mono if needed
-            if len(audio.shape) > 1 and audio.shape[1] > 1:
-                audio = np.mean(audio, axis=1)
-            
-            # Ensure audio is 1D array
-            audio = audio.flatten()
-            
-            # Normalize audio
-            if np.max(np.abs(audio)) > 0:
-                audio = audio / np.max(np.abs(audio))
-                self.logger.info("Audio normalized successfully")
-            else:
-                self.logger.warning("Audio is empty or silent")
-                return ""
-
-            # Transcribe with improved parameters
-            self.logger.info("Calling Whisper model...")
-            segments, info = self.model.transcribe(
-                audio,
-                language="en",
-                beam_size=self.beam_size,
-                best_of=self.best_of,
-                temperature=self.temperature,
-                compression_ratio_threshold=self.compression_ratio_threshold,
-                condition_on_previous_text=self.condition_on_previous_text,
-                vad_filter=True,
-                vad_parameters=dict(
-                    min_silence_duration_ms=300,
-                    speech_pad_ms=300,
-                    threshold=0.3
-                )
+            seconds = config.whisper.WARMUP_SECONDS
+            noise = np.random.default_rng(0).normal(0, 0.01, int(config.audio.SAMPLE_RATE * seconds))
+            noise = noise.astype(np.float32)
+            for vad_filter in (False, True):
+                segments, _ = self.model.transcribe(noise, language="en", beam_size=1, vad_filter=vad_filter)
+                list(segments)
+        except Exception as e:
+            self.logger.warning(f"Whisper warm-up failed: {e}")
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the model is loaded, raises if loading failed"""
+        if not self.ready.is_set():
+            self.load_async()
+        if not self.ready.wait(timeout):
+            raise TimeoutError("Whisper model is still loading")
+        if self.state != self.READY:
+            raise RuntimeError("Whisper model failed to load")
+
+    @staticmethod
+    def to_mono(audio):
+        """Convert recorder output to a 1D float32 array"""
+        # Convert stereo to mono if needed
+        if len(audio.shape) > 1 and audio.shape[1] > 1:
+            audio = np.mean(audio, axis=1)
+
+        # Ensure audio is 1D array
+        return np.asarray(audio, dtype=np.float32).flatten()
+
+    @classmethod
+    def collect_speech(cls, audio, speech_regions):
+        """Keep only the detected speech regions of a recording"""
+        audio = cls.to_mono(audio)
+        chunks = [audio[start:end] for start, end in speech_regions]
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+    def prepare_audio(self, audio):
+        """Convert to mono and normalize, returns None for silent audio"""
+        audio = self.to_mono(audio)
+
+        # Normalize audio
+        peak = np.max(np.abs(audio)) if audio.size else 0
+        if peak > 0:
+            self.logger.info("Audio normalized successfully")
+            return audio / peak
+
+        self.logger.warning("Audio is empty or silent")
+        return None
+
+    def decode_options(self, beam_size=None, best_of=None, vad_filter=True):
+        """Keyword arguments for WhisperModel.transcribe, shared with batch transcription"""
+        return dict(
+            language="en",
+            beam_size=beam_size or self.beam_size,
+            best_of=best_of or self.best_of,
+            temperature=self.temperature,
+            compression_ratio_threshold=self.compression_ratio_threshold,
+            condition_on_previous_text=self.condition_on_previous_text,
+            vad_filter=vad_filter,
+            vad_parameters=dict(
+                min_silence_duration_ms=300,
+                speech_pad_ms=300,
+                threshold=0.3
             )
-            self.logger.info("Whisper transcription completed")
-            
-            # Get text from segments
-            segments_list = list(segments)
-            self.logger.info(f"Number of segments: {len(segments_list)}")
-            
+        )
+
+    def _decode(self, audio, beam_size, best_of, vad_filter=True):
+        """Single Whisper pass with the given search width"""
+        segments, info = self.model.transcribe(audio, **self.decode_options(beam_size, best_of, vad_filter))
+        return list(segments)
+
+    def is_hard(self, segment):
+        """Segments the greedy pass was unsure about"""
+        return (segment.avg_logprob < config.whisper.LOGPROB_THRESHOLD
+                or segment.compression_ratio > config.whisper.COMPRESSION_RATIO_THRESHOLD)
+
+    def decode_segments(self, audio, stats=None, vad_filter=True):
+        """Run Whisper over prepared audio and return the list of segments.
+
+        With adaptive decoding a greedy pass runs first and only segments that
+        look unreliable are decoded again with beam search, as long as the
+        estimated cost fits in the latency budget. Pass vad_filter=False when
+        the audio already holds speech only.
+        """
+        self.wait_until_ready()
+        stats = stats if stats is not None else TranscriptionStats()
+        stats.audio_seconds += len(audio) / config.audio.SAMPLE_RATE
+
+        # Transcribe with improved parameters
+        self.logger.info("Calling Whisper model...")
+        start = time.perf_counter()
+
+        if not config.whisper.ADAPTIVE_DECODING:
+            segments_list = self._decode(audio, self.beam_size, self.best_of, vad_filter)
+            stats.beam_seconds += time.perf_counter() - start
+            stats.segments += len(segments_list)
+            self.logger.info("Whisper transcription completed, segments: %d", len(segments_list))
+            return segments_list
+
+        segments_list = self._decode(audio, beam_size=1, best_of=1, vad_filter=vad_filter)
+        greedy_seconds = time.perf_counter() - start
+        stats.greedy_seconds += greedy_seconds
+        stats.segments += len(segments_list)
+
+        # Beam search costs roughly BEAM_COST_FACTOR times a greedy pass over the same audio
+        seconds_per_sample = greedy_seconds / max(len(audio), 1)
+        sample_rate = config.audio.SAMPLE_RATE
+        pad = int(0.2 * sample_rate)
+
+        for i, segment in enumerate(segments_list):
+            if not self.is_hard(segment):
+                continue
+
+            begin = max(int(segment.start * sample_rate) - pad, 0)
+            end = min(int(segment.end * sample_rate) + pad, len(audio))
+            estimate = seconds_per_sample * (end - begin) * config.whisper.BEAM_COST_FACTOR
+            if time.perf_counter() - start + estimate > config.whisper.LATENCY_BUDGET_SECONDS:
+                stats.over_budget += 1
+                continue
+
+            beam_start = time.perf_counter()
+            careful = self._decode(audio[begin:end], self.beam_size, self.best_of, vad_filter=False)
+            stats.beam_seconds += time.perf_counter() - beam_start
+            stats.escalated += 1
+
+            if careful:
+                segments_list[i] = dataclasses.replace(
+                    segment,
+                    text=" ".join(s.text.strip() for s in careful),
+                    avg_logprob=min(s.avg_logprob for s in careful),
+                )
+
+        self.logger.info("Whisper transcription completed, segments: %d, path: %s, escalated: %d, over budget: %d",
+                         len(segments_list), stats.path, stats.escalated, stats.over_budget)
+        return segments_list
+
+    def transcribe(self, audio, speech_regions=None):
+        """Transcribe a recording, returns a Transcription with per-utterance stats.
+
+        speech_regions are (start, end) sample offsets from the recorder's VAD;
+        when given only those are decoded and Whisper's own VAD is skipped.
+        """
+        stats = TranscriptionStats()
+        try:
+            self.logger.info("Starting transcription. Audio shape: %s", audio.shape)
+            start = time.perf_counter()
+
+            if speech_regions is not None:
+                if not speech_regions:
+                    self.logger.info("No speech detected in recording")
+                    return Transcription("", [], stats)
+                audio = self.collect_speech(audio, speech_regions)
+
+            audio = self.prepare_audio(audio)
+            stats.preprocess_seconds += time.perf_counter() - start
+            if audio is None:
+                return Transcription("", [], stats)
+
+            segments_list = self.decode_segments(audio, stats, vad_filter=speech_regions is None)
+
             if not segments_list:
                 self.logger.warning("No segments returned from Whisper")
-                return ""
-                
+                return Transcription("", [], stats)
+
             text = " ".join([segment.text for segment in segments_list])
-            self.logger.info(f"Final transcribed text: {text}")
-            print(f"\nTranscribed text: {text}")
-            return text.strip()
-            
+            self.logger.info("Final transcribed text: %s", redact(text))
+            print(f"\nTranscribed text: {redact(text)}")
+            return Transcription(text.strip(), segments_list, stats)
+
         except Exception as e:
             self.logger.error(f"Error in transcription: {e}", exc_info=True)
             print(f"\nTranscription error: {e}")
-            return ""
\ No newline at end of file
+            return Transcription("", [], stats)
+
+    def transcribe_audio(self, audio, speech_regions=None):
+        return self.transcribe(audio, speech_regions).text
@@ -0,0 +1,189 @@
+import threading
+import multiprocessing
+import numpy as np
+from dataclasses import dataclass, asdict
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+
+from echo.services.transcription import Transcriber, TranscriptionStats
+from echo.utils.config import config
+from echo.utils.logger import get_logger, setup_worker_logging, forward_worker_logs
+
+@dataclass
+class DecodedSegment:
+    """The parts of a Whisper segment the UI process needs"""
+    start: float
+    end: float
+    text: str
+    avg_logprob: float
+    compression_ratio: float
+
+
+def _worker_main(conn, log_queue):
+    """Worker process: keep a warm model and decode audio from shared memory"""
+    setup_worker_logging(log_queue)  # The parent writes the log file, the worker only forwards records
+    logger = get_logger(__name__)
+    transcriber = Transcriber()
+    transcriber.load()
+    conn.send(("state", transcriber.state))
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if request is None:
+            break
+
+        request_id, shm_name, length, vad_filter = request
+        shm = None
+        try:
+            # Spawned workers share the parent's resource tracker, which owns the segment
+            shm = shared_memory.SharedMemory(name=shm_name)
+            audio = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+
+            stats = TranscriptionStats()
+            segments = transcriber.decode_segments(audio, stats, vad_filter)
+            result = [
+                DecodedSegment(s.start, s.end, s.text, s.avg_logprob, s.compression_ratio)
+                for s in segments
+            ]
+            del audio
+            conn.send(("result", request_id, result, asdict(stats)))
+
+        except Exception as e:
+            logger.error(f"Error in transcription worker: {e}", exc_info=True)
+            conn.send(("error", request_id, str(e), None))
+        finally:
+            if shm is not None:
+                shm.close()
+
+
+class RemoteTranscriber(Transcriber):
+    """Transcriber that decodes in a supervised worker process.
+
+    Keeps Whisper off the process that runs the keyboard listener and the menu
+    bar. Audio goes to the worker through a shared memory block, only segment
+    text and stats come back over the pipe. The worker is restarted when it
+    dies, and the model state goes back to loading until it is warm again.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.context = multiprocessing.get_context("spawn")
+        self.log_queue = self.context.Queue()
+        self.log_listener = None
+        self.process = None
+        self.conn = None
+        self.shm = None
+        self.request_id = 0
+        self.request_lock = threading.Lock()
+        self.shutting_down = False
+        self.restarts = 0
+        self.generation = 0  # Bumped every time a worker comes up
+        self.started = threading.Condition()
+
+    def load(self):
+        """Start the worker process and wait for its model to be ready"""
+        try:
+            if self.log_listener is None:
+                self.log_listener = forward_worker_logs(self.log_queue)
+            parent_conn, child_conn = self.context.Pipe()
+            self.process = self.context.Process(target=_worker_main, args=(child_conn, self.log_queue),
+                                                daemon=True)
+            self.process.start()
+            child_conn.close()
+            self.conn = parent_conn
+            self.logger.info(f"Started transcription worker (PID {self.process.pid})")
+
+            _, state = self.conn.recv()
+            with self.started:
+                self.generation += 1
+                self.started.notify_all()
+            self._set_state(state)
+
+            threading.Thread(target=self._supervise, args=(self.process,), daemon=True).start()
+
+        except Exception as e:
+            self.logger.error(f"Error starting transcription worker: {e}")
+            self._set_state(self.FAILED)
+
+    def _supervise(self, process):
+        """Restart the worker if it exits while we still need it"""
+        wait([process.sentinel])
+        process.join()
+        if self.shutting_down or process is not self.process:
+            return
+
+        self.restarts += 1
+        self.logger.error(f"Transcription worker exited with code {process.exitcode}, "
+                          f"restarting (restart #{self.restarts})")
+        self._set_state(self.LOADING)
+        self.load()
+
+    def _write_shared(self, audio):
+        """Copy audio into the shared block, growing it when needed"""
+        if self.shm is None or self.shm.size < audio.nbytes:
+            if self.shm is not None:
+                self.shm.close()
+                self.shm.unlink()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1 << 20))
+        np.ndarray(audio.shape, dtype=np.float32, buffer=self.shm.buf)[:] = audio
+
+    def decode_segments(self, audio, stats=None, vad_filter=True):
+        """Decode prepared audio in the worker process"""
+        stats = stats if stats is not None else TranscriptionStats()
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+
+        for attempt in range(2):
+            self.wait_until_ready()
+            generation = self.generation
+            with self.request_lock:
+                try:
+                    self.request_id += 1
+                    self._write_shared(audio)
+                    self.conn.send((self.request_id, self.shm.name, len(audio), vad_filter))
+
+                    if not self.conn.poll(config.whisper.WORKER_TIMEOUT_SECONDS):
+                        self.logger.error("Transcription worker timed out, killing it")
+                        self.process.kill()
+                        raise TimeoutError("Transcription worker timed out")
+
+                    kind, request_id, payload, remote_stats = self.conn.recv()
+                    if kind == "error":
+                        raise RuntimeError(f"Transcription worker error: {payload}")
+
+                    for key, value in remote_stats.items():
+                        setattr(stats, key, getattr(stats, key) + value)
+                    return payload
+
+                except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+                    self.logger.error(f"Lost transcription worker: {e}")
+                    if attempt:
+                        raise
+
+            # The supervisor restarts the worker, wait for it and retry once
+            with self.started:
+                self.started.wait_for(lambda: self.generation != generation,
+                                      timeout=config.whisper.WORKER_TIMEOUT_SECONDS)
+
+    def shutdown(self):
+        """Stop the worker process and release shared memory"""
+        self.shutting_down = True
+        try:
+            if self.conn:
+                self.conn.send(None)
+            if self.process:
+                self.process.join(timeout=2)
+                if self.process.is_alive():
+                    self.process.kill()
+        except Exception as e:
+            self.logger.error(f"Error stopping transcription worker: {e}")
+        finally:
+            if self.shm is not None:
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = None
+            if self.log_listener is not None:
+                self.log_listener.stop()  # Writes what the worker logged before it exited
+                self.log_listener = None
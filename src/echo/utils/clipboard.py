@@ -0,0 +1,92 @@
+import platform
+
+import pyperclip
+
+from echo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _pasteboard():
+    """The macOS general pasteboard, None where AppKit is unavailable"""
+    if platform.system() != 'Darwin':
+        return None
+    try:
+        from AppKit import NSPasteboard
+    except ImportError:
+        return None
+    return NSPasteboard.generalPasteboard()
+
+
+def frontmost_app():
+    """(name, bundle id) of the focused application, (None, None) if unknown"""
+    if platform.system() != 'Darwin':
+        return None, None
+    try:
+        from AppKit import NSWorkspace
+        app = NSWorkspace.sharedWorkspace().frontmostApplication()
+        return str(app.localizedName()), str(app.bundleIdentifier())
+    except Exception as e:
+        logger.debug(f"Could not get the frontmost app: {e}")
+        return None, None
+
+
+class ClipboardSnapshot:
+    """Everything on the clipboard at one moment, so it can be put back later.
+
+    On macOS every pasteboard item is saved with all of its types (images,
+    RTF, file references, ...); elsewhere only the plain text is kept.
+    """
+
+    def __init__(self):
+        self.pasteboard = _pasteboard()
+        self.items = None
+        self.text = None
+        self.change_count = None
+
+    @classmethod
+    def take(cls):
+        snapshot = cls()
+        if snapshot.pasteboard is not None:
+            snapshot.items = [
+                [(str(kind), item.dataForType_(kind)) for kind in item.types()]
+                for item in snapshot.pasteboard.pasteboardItems() or []
+            ]
+        else:
+            try:
+                snapshot.text = pyperclip.paste()
+            except pyperclip.PyperclipException as e:
+                logger.debug(f"Could not read the clipboard: {e}")
+        return snapshot
+
+    def put_text(self, text):
+        """Replace the clipboard with text and remember the pasteboard change it caused"""
+        pyperclip.copy(text)
+        if self.pasteboard is not None:
+            self.change_count = self.pasteboard.changeCount()
+
+    def changed_since_put(self):
+        """Something other than put_text wrote to the clipboard"""
+        return self.pasteboard is not None and self.change_count is not None \
+            and self.pasteboard.changeCount() != self.change_count
+
+    def restore(self):
+        """Put the saved contents back, unless the clipboard was changed in the meantime"""
+        if self.changed_since_put():
+            logger.info("Clipboard changed while pasting, not restoring it")
+            return False
+        if self.pasteboard is not None:
+            from AppKit import NSPasteboardItem
+            self.pasteboard.clearContents()
+            if self.items:
+                restored = []
+                for types in self.items:
+                    item = NSPasteboardItem.alloc().init()
+                    for kind, data in types:
+                        if data is not None:
+                            item.setData_forType_(data, kind)
+                    restored.append(item)
+                self.pasteboard.writeObjects_(restored)
+        elif self.text is not None:
+            pyperclip.copy(self.text)
+        return True
@@ -1,4 +1,5 @@
 import os
+import logging
 import subprocess
 from enum import Enum
 from pathlib import Path
@@ -44,34 +45,168 @@ class LogConfig:
     # Create logs directory in user's home directory
     LOG_DIR: Path = Path.home() / ".echo" / "logs"
     LOG_FILE: Path = LOG_DIR / "echo.log"
-    LEVEL: str = "INFO"
+    LEVEL: str = os.getenv('ECHO_LOG_LEVEL', 'INFO')
+    LOG_TRANSCRIPTS: bool = os.getenv('ECHO_LOG_TRANSCRIPTS', '') == '1'  # Show transcripts and responses in logs and console
 
     def __post_init__(self):
+        logging.getLogger('echo').setLevel(self.LEVEL)
         # Ensure log directory exists
         self.LOG_DIR.mkdir(parents=True, exist_ok=True)
         # Touch the log file if it doesn't exist
         if not self.LOG_FILE.exists():
             self.LOG_FILE.touch()
             
+@dataclass
+class TraceConfig:
+    ENABLED: bool = True
+    TRACE_DIR: Path = Path.home() / ".echo" / "traces"
+    TRACE_FILE: Path = TRACE_DIR / "traces.jsonl"
+    MAX_BYTES: int = 5 * 1024 * 1024
+    BACKUP_COUNT: int = 5
+
+@dataclass
+class CacheConfig:
+    ENABLED: bool = True
+    CACHE_DIR: Path = Path.home() / ".echo" / "cache"
+    CACHE_FILE: Path = CACHE_DIR / "responses.sqlite3"
+    MEMORY_ENTRIES: int = 256
+    DISK_ENTRIES: int = 5000
+    TTL_SECONDS: float = 30 * 24 * 3600
+    MAX_TRANSCRIPT_CHARS: int = 200  # Only short dictations repeat often enough to be worth caching
+
+@dataclass
+class CleanupConfig:
+    ENABLED: bool = True  # Clean trivial dictations locally instead of calling the LLM
+    FILLER_WORDS: Tuple[str, ...] = ("um", "umm", "uh", "uhh", "uh huh", "er", "erm", "hmm", "mhm")
+    # Only these are collapsed when said twice in a row; "had had", "very very" or "bye bye" are meant
+    STUTTER_WORDS: Tuple[str, ...] = ("i", "i'm", "we", "you", "he", "she", "it", "they", "my",
+                                      "the", "a", "an", "to", "of", "in", "on", "and", "but")
+    # Highest complexity (words + 2 per clause) cleaned locally, 0 always uses the LLM
+    LOCAL_MAX_COMPLEXITY: Dict[CommunicationType, int] = field(default_factory=lambda: {
+        CommunicationType.NOTES: 40,
+        CommunicationType.DM: 12,
+        CommunicationType.SOCIAL: 0,
+        CommunicationType.EMAIL: 0,
+    })
+
+@dataclass
+class PipelineConfig:
+    QUEUE_SIZE: int = 4  # Dictations waiting between two stages before F9 blocks
+
+@dataclass
+class NotificationConfig:
+    COALESCE_SECONDS: float = 0.05  # Quiet time before a group is shown, so back-to-back calls collapse
+    MIN_INTERVAL_SECONDS: float = 0.5  # Minimum gap between two notifications of the same group
+    MAX_PENDING: int = 8  # Oldest waiting notification is dropped beyond this
+    DELIVERY_TIMEOUT_SECONDS: float = 1.0  # terminal-notifier is killed after this
+
+@dataclass
+class StartupConfig:
+    ICON_TARGET_SECONDS: float = 1.0  # Launch to menu bar icon budget checked by --profile-startup
+    WARM_UP: bool = True  # Build the OpenAI, typing and sound services in the background once the icon shows
+
+@dataclass
+class InputConfig:
+    INJECTION_MODE: str = "paste"  # "paste" through the clipboard or "keystrokes" one character at a time
+    PASTE_DENY_LIST: Tuple[str, ...] = (  # Apps (name or bundle id) where pasting is unreliable, typed instead
+        "com.microsoft.rdc.macos",
+        "com.vmware.fusion",
+        "com.parallels.desktop.console",
+        "com.apple.ScreenSharing",
+        "1Password",
+    )
+    PASTE_SETTLE_SECONDS: float = 0.15  # Time the target app gets to read the clipboard before it is restored
+    KEYSTROKE_START_CPS: float = 100.0  # Initial typing rate for a new target, characters per second
+    KEYSTROKE_MIN_CPS: float = 30.0  # Slowest the rate controller backs off to
+    KEYSTROKE_MAX_CPS: float = 400.0  # Fastest rate for targets without a profile
+    KEYSTROKE_RUN_CHARS: int = 16  # Characters sent per keyboard call
+    KEYSTROKE_SLOW_FACTOR: float = 3.0  # Back off when a run posts this much slower than the fastest one
+    KEYSTROKE_PROFILES: Dict[str, float] = field(default_factory=lambda: {  # Max chars/sec per app bundle id
+        "com.microsoft.rdc.macos": 60.0,
+        "com.vmware.fusion": 120.0,
+        "com.parallels.desktop.console": 120.0,
+        "com.apple.ScreenSharing": 60.0,
+    })
+
 @dataclass
 class AudioConfig:
     SAMPLE_RATE: int = 16000  # Whisper expects 16kHz
     CHANNELS: int = 1
-    BLOCK_SIZE_SECONDS: float = 0.1  # Shorter blocks for smoother visualization
+    BLOCK_SIZE_SECONDS: float = 0.05  # Input block length: capture latency, VAD step and recorder wakeups
     CHUNK_SIZE: int = 1024  # Default chunk size for audio processing
+    CUE_GUARD_SECONDS: float = 0.06  # Capture dropped past the end of the start cue, covers one input block plus output latency
+    CAPTURE_BUFFER_SECONDS: float = 15.0  # Preallocated capture buffer, sized for a typical dictation, grows 1.5x when full
+    STREAM_WINDOW_SECONDS: float = 2.0  # Audio handed to the streaming worker at a time
+    METER_REFRESH_HZ: float = 20.0  # Level meter redraws per second, independent of the input block size
+    STALL_SECONDS: float = 1.0  # No input block for this long while recording means the stream died
+    VAD_ENABLED: bool = True  # Detect speech while recording, Whisper only decodes speech
+    VAD_FRAME_MS: int = 20
+    VAD_HANGOVER_MS: int = 400  # Silence needed before a speech region closes
+    VAD_PAD_MS: int = 200  # Audio kept before and after each speech region
+    VAD_THRESHOLD_RATIO: float = 3.0  # Speech when the frame level exceeds noise floor x ratio
+    VAD_MIN_LEVEL: float = 0.003  # Absolute RMS below which a frame is never speech
     
 @dataclass
 class WhisperConfig:
-    MODEL_SIZE: str = "tiny"
+    MODEL_SIZE: str = "base"
     DEVICE: str = "cpu"
     COMPUTE_TYPE: str = "int8"
+    WARMUP_SECONDS: float = 1.0  # Synthetic clip decoded once after loading
+    BEAM_SIZE: int = 5
+    ADAPTIVE_DECODING: bool = True  # Greedy first, beam search only for unreliable segments
+    LOGPROB_THRESHOLD: float = -0.8  # Escalate segments with a lower avg_logprob
+    COMPRESSION_RATIO_THRESHOLD: float = 2.4  # Escalate segments that look repetitive
+    BEAM_COST_FACTOR: float = 3.0  # Beam pass cost relative to greedy, for budgeting
+    LATENCY_BUDGET_SECONDS: float = 2.0  # Per-utterance decode budget
+    OUT_OF_PROCESS: bool = False  # Decode in a supervised worker process
+    WORKER_TIMEOUT_SECONDS: float = 120.0  # Kill and restart a worker stuck on one request
+    STREAMING: bool = True  # Decode while recording instead of after F9
+    STREAM_HOLDBACK_SECONDS: float = 1.0  # Trailing audio left uncommitted between windows
+    STREAM_COMMIT_LAG_SECONDS: float = 4.0  # Pending audio after which all but the last open segment is committed
+    STREAM_MAX_PENDING_SECONDS: float = 10.0  # Force a commit, bounds the audio decoded per window
 
 @dataclass
 class OpenAIConfig:
     API_KEY: str = os.getenv('OPENAI_API_KEY', '')  # Get API key from environment
+    BASE_URL: str = os.getenv('OPENAI_BASE_URL', '')  # Empty for api.openai.com
     MODEL: str = "gpt-3.5-turbo"
     TEMPERATURE: float = 0.7
     MAX_TOKENS: int = 150
+    STREAMING: bool = True  # Type the response while it streams in
+    STREAM_BOUNDARY: str = "word"  # Flush streamed text at each "word" or "sentence"
+    MAX_CONNECTIONS: int = 4  # Pooled HTTP connections kept to the API
+    KEEPALIVE_SECONDS: float = 60.0  # Idle time before a pooled connection is dropped
+    REQUEST_TIMEOUT_SECONDS: float = 30.0
+    # Model and response length per message kind: max_tokens is the transcript's tokens x output_ratio
+    # + overhead_tokens within [min_tokens, max_tokens]; fast_model is used when the routed model's
+    # recent requests at their usual length would miss latency_target (seconds)
+    ROUTES: Dict[CommunicationType, Dict] = field(default_factory=lambda: {
+        CommunicationType.DM: {"model": "gpt-3.5-turbo", "fast_model": "gpt-4o-mini", "output_ratio": 1.5,
+                               "overhead_tokens": 16, "min_tokens": 32, "max_tokens": 150, "latency_target": 2.0},
+        CommunicationType.SOCIAL: {"model": "gpt-3.5-turbo", "fast_model": "gpt-4o-mini", "output_ratio": 1.8,
+                                   "overhead_tokens": 24, "min_tokens": 48, "max_tokens": 200, "latency_target": 3.0},
+        CommunicationType.NOTES: {"model": "gpt-3.5-turbo", "fast_model": "gpt-4o-mini", "output_ratio": 1.3,
+                                  "overhead_tokens": 32, "min_tokens": 64, "max_tokens": 500, "latency_target": 5.0},
+        CommunicationType.EMAIL: {"model": "gpt-3.5-turbo", "fast_model": "gpt-4o-mini", "output_ratio": 1.6,
+                                  "overhead_tokens": 60, "min_tokens": 96, "max_tokens": 700, "latency_target": 8.0},
+    })
+    ROUTE_PROBE_EVERY: int = 10  # Every Nth request a route would send to its fast model tries the routed model
+    ROUTE_STATS_MAX_AGE_SECONDS: float = 600.0  # Latency samples older than this no longer steer routing
+    # Seconds from sending the request until something is typed, per message kind
+    DEADLINES: Dict[CommunicationType, float] = field(default_factory=lambda: {
+        CommunicationType.DM: 4.0,
+        CommunicationType.SOCIAL: 6.0,
+        CommunicationType.NOTES: 6.0,
+        CommunicationType.EMAIL: 10.0,
+    })
+    PRIMARY_BUDGET_SHARE: float = 0.6  # Part of the deadline the routed model gets before the fallback model
+    HEDGE_ENABLED: bool = True  # Duplicate a request that is slower than usual
+    HEDGE_PERCENTILE: float = 95.0  # Hedge once a request is slower than this percentile
+    HEDGE_MIN_SAMPLES: int = 20  # Latencies needed before the percentile is trusted
+    HEDGE_DEFAULT_DELAY_SECONDS: float = 2.0
+    FALLBACK_MODEL: str = "gpt-4o-mini"  # Faster model tried when the routed model misses its share, empty to skip
+    FALLBACK_TO_TRANSCRIPT: bool = True  # Type the raw transcript when no rewrite arrives in time
+    PROMPTS_FILE: Path = Path.home() / ".echo" / "prompts.json"  # Optional template overrides, hot-reloaded
     
         # System prompts for different tones
     TONE_PROMPTS: Dict[ToneMode, str] = field(default_factory=lambda: {
@@ -121,10 +256,12 @@ class OpenAIConfig:
             logger.error("Falling back to English (US)")
             return ('en', 'US')  # Default fallback
 
-    def get_message_context(self, tone: ToneMode, comm_type: CommunicationType) -> str:
+    def get_message_context(self, tone: ToneMode, comm_type: CommunicationType,
+                            tone_prompts: Dict[ToneMode, str] = None,
+                            comm_formats: Dict[CommunicationType, str] = None) -> str:
         """Generate context combining tone and communication type"""
-        base_prompt = self.TONE_PROMPTS[tone]
-        format_prompt = self.COMM_FORMATS[comm_type]
+        base_prompt = (tone_prompts or self.TONE_PROMPTS)[tone]
+        format_prompt = (comm_formats or self.COMM_FORMATS)[comm_type]
 
         return f"""{base_prompt}
 
@@ -186,5 +323,12 @@ class Config:
     whisper: WhisperConfig = field(default_factory=WhisperConfig)
     openai: OpenAIConfig = field(default_factory=OpenAIConfig)
     log: LogConfig = field(default_factory=LogConfig)
+    trace: TraceConfig = field(default_factory=TraceConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    cleanup: CleanupConfig = field(default_factory=CleanupConfig)
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
+    input: InputConfig = field(default_factory=InputConfig)
+    notifications: NotificationConfig = field(default_factory=NotificationConfig)
+    startup: StartupConfig = field(default_factory=StartupConfig)
 
 config = Config()
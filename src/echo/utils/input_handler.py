@@ -1,20 +1,32 @@
 import os
+import re
 import sys
 import time
 import platform
 import subprocess
 import pyperclip
-from pynput.keyboard import Controller, Key
 from pathlib import Path
-from echo.utils.logger import get_logger
-from echo.utils.notifications import NotificationManager
+from echo.utils.config import config
+from echo.utils.clipboard import ClipboardSnapshot, frontmost_app
+from echo.utils.keystrokes import KeystrokeInjector
+from echo.utils.logger import get_logger, redact
+from echo.utils.notifications import get_notifications
 
 class InputHandler:
-    def __init__(self):
+    # Where streamed text may be cut before typing: any space, or the space after a sentence
+    BOUNDARIES = {
+        'word': re.compile(r'\s'),
+        'sentence': re.compile(r'(?<=[.!?;:])\s|\n'),
+    }
+
+    def __init__(self, keyboard=None):
         self.logger = get_logger(__name__)
-        self.keyboard = Controller()
-        self.typing_delay = 0.01  # Delay between characters
-        self.notifications = NotificationManager()
+        if keyboard is None:
+            from pynput.keyboard import Controller
+            keyboard = Controller()
+        self.keyboard = keyboard
+        self.injector = KeystrokeInjector(keyboard)
+        self.notifications = get_notifications()
 
     def check_accessibility_permissions(self):
         """Check if app has accessibility permissions"""
@@ -55,21 +67,26 @@ class InputHandler:
                 )
                 return False
 
+            self.injector.reset()
+            app = frontmost_app()
+            if self.use_paste(app):
+                print("📋 Pasting text...")
+                self.paste_text(text)
+                self.logger.info("Text pasted successfully")
+                print("✅ Text pasted successfully")
+                return True
+
             # Copy to clipboard as backup
-            pyperclip.copy(text)
-            self.logger.info(f"Text copied to clipboard as backup: {text}")
+            self.copy_to_clipboard(text)
+            self.logger.info("Text copied to clipboard as backup: %s", redact(text))
             print(f"\n📋 Text copied to clipboard as backup")
             
-            # Type each character
             print("⌨️ Typing text...")
-            for char in text:
-                try:
-                    self.keyboard.type(char)
-                    time.sleep(self.typing_delay)  # Small delay between characters
-                except Exception as e:
-                    self.logger.error(f"Error typing character '{char}': {e}")
-                    continue
-            
+            sent = self.type_chars(text, self.target(app))
+            if sent < len(text):
+                print(f"⏹️ Typing cancelled after {sent} of {len(text)} characters")
+                return False
+
             self.logger.info("Text typed successfully")
             print("✅ Text typed successfully")
             print("📋 Text also available in clipboard (Cmd+V/Ctrl+V if needed)")
@@ -78,17 +95,165 @@ class InputHandler:
         except Exception as e:
             self.logger.error(f"Error in type_text: {e}")
             print(f"❌ Error: {e}")
+            self.keep_on_clipboard(text)
+            return False
+
+    def keep_on_clipboard(self, text):
+        """Leave text on the clipboard after a failed injection so it can be pasted by hand"""
+        try:
+            self.copy_to_clipboard(text)
             print("📋 Text copied to clipboard (manual paste required)")
+        except Exception as e:
+            self.logger.error(f"Could not copy text to clipboard: {e}")
+            print("❌ Text could not be copied to the clipboard either")
+
+    @staticmethod
+    def target(app):
+        """Key for per-app typing rates: bundle id, or the name when it is unknown"""
+        name, bundle_id = app
+        return bundle_id or name
+
+    def use_paste(self, app):
+        """Paste unless keystrokes are configured or the focused app is on the deny-list"""
+        if config.input.INJECTION_MODE != "paste":
+            return False
+        name, bundle_id = app
+        denied = {entry.lower() for entry in config.input.PASTE_DENY_LIST}
+        if (name and name.lower() in denied) or (bundle_id and bundle_id.lower() in denied):
+            self.logger.info(f"{name or bundle_id} is on the paste deny-list, typing instead")
             return False
+        return True
+
+    def snapshot_clipboard(self):
+        return ClipboardSnapshot.take()
+
+    def send_paste_shortcut(self):
+        from pynput.keyboard import Key
+        modifier = Key.cmd if platform.system() == 'Darwin' else Key.ctrl
+        with self.keyboard.pressed(modifier):
+            self.keyboard.press('v')
+            self.keyboard.release('v')
+
+    def paste_chunk(self, snapshot, text):
+        """Paste text through the clipboard and wait until the app has read it"""
+        snapshot.put_text(text)
+        self.send_paste_shortcut()
+        time.sleep(config.input.PASTE_SETTLE_SECONDS)
+
+    def paste_text(self, text):
+        """Paste text at the cursor, keeping whatever was on the clipboard before.
+
+        If the paste fails the earlier clipboard is not restored, the caller
+        leaves the text there for a manual paste instead.
+        """
+        snapshot = self.snapshot_clipboard()
+        self.paste_chunk(snapshot, text)
+        snapshot.restore()
+
+    def type_chars(self, text, target=None):
+        """Type text with the adaptive keystroke injector, returns the characters sent"""
+        return self.injector.type(text, target)
+
+    def cancel_typing(self):
+        """Stop an injection in progress, the full text stays on the clipboard"""
+        self.injector.cancel()
+
+    def typing_stats(self):
+        return self.injector.stats()
+
+    @staticmethod
+    def last_boundary(text, pattern):
+        """Index of the last boundary match in text, None if there is none"""
+        cut = None
+        for match in pattern.finditer(text):
+            cut = match.start()
+        return cut
+
+    def type_stream(self, chunks, boundary='word', max_buffer=80):
+        """Type text from an iterator of chunks as it arrives.
+
+        Text is held back until a word or sentence boundary so partial words
+        are never typed; in sentence mode a buffer longer than max_buffer is
+        flushed at the last word instead. Leading and trailing whitespace is
+        dropped like the non-streaming path does. The full text goes on the
+        clipboard once the stream ends. Returns (text, first_char_at, cancelled)
+        where first_char_at is the perf_counter time of the first keystroke,
+        None if nothing was typed.
+
+        In paste mode every flush is pasted and the earlier clipboard is
+        restored at the end instead; flushes happen per sentence so the
+        number of pastes stays small. When pasting fails or is cancelled the
+        full text is left on the clipboard rather than restoring it.
+        """
+        if not self.check_accessibility_permissions():
+            self.notifications.notify(
+                "Accessibility Required",
+                "Please grant accessibility permissions in System Settings → Privacy → Accessibility",
+                "⚠️",
+                sound_type='error'
+            )
+            return None, None, False
+
+        self.injector.reset()
+        app = frontmost_app()
+        snapshot = self.snapshot_clipboard() if self.use_paste(app) else None
+        if snapshot:
+            boundary = 'sentence'
+            emit = lambda piece: self.paste_chunk(snapshot, piece)
+        else:
+            emit = lambda piece: self.type_chars(piece, self.target(app))
+
+        pattern = self.BOUNDARIES[boundary]
+        parts = []
+        pending = ""
+        first_char_at = None
+        completed = False
+        try:
+            print("⌨️ Typing text as it streams in...")
+            for chunk in chunks:
+                parts.append(chunk)
+                if self.injector.cancelled.is_set():
+                    # Keep reading so the clipboard still gets the whole text
+                    continue
+                pending += chunk
+                if first_char_at is None:
+                    pending = pending.lstrip()
+
+                cut = self.last_boundary(pending, pattern)
+                if cut is None and len(pending) > max_buffer:
+                    cut = self.last_boundary(pending, self.BOUNDARIES['word'])
+                if cut:
+                    if first_char_at is None:
+                        first_char_at = time.perf_counter()
+                    emit(pending[:cut])
+                    pending = pending[cut:]
+
+            pending = pending.rstrip()
+            if pending and not self.injector.cancelled.is_set():
+                if first_char_at is None:
+                    first_char_at = time.perf_counter()
+                emit(pending)
+            completed = True
+        finally:
+            text = "".join(parts).strip()
+            if snapshot and completed and not self.injector.cancelled.is_set():
+                snapshot.restore()
+            elif text:
+                self.copy_to_clipboard(text)
+                print("📋 Text also available in clipboard (Cmd+V/Ctrl+V if needed)")
+
+        if self.injector.cancelled.is_set():
+            print("⏹️ Typing cancelled")
+            return text, first_char_at, True
+        self.logger.info("Streamed text typed successfully")
+        return text, first_char_at, False
+
+    def copy_to_clipboard(self, text):
+        """Put text on the system clipboard"""
+        pyperclip.copy(text)
 
     def type_with_special_chars(self, text):
-        """Handle special characters and formatting"""
-        special_chars = {
-            '\n': Key.enter,
-            '\t': Key.tab,
-            ' ': Key.space
-        }
-        
+        """Type text with newlines and tabs pressed as Enter and Tab"""
         try:
             if not self.check_accessibility_permissions():
                 self.notifications.notify(
@@ -99,14 +264,8 @@ class InputHandler:
                 )
                 return False
 
-            for char in text:
-                if char in special_chars:
-                    self.keyboard.press(special_chars[char])
-                    self.keyboard.release(special_chars[char])
-                else:
-                    self.keyboard.type(char)
-                time.sleep(self.typing_delay)
-            return True
+            self.injector.reset()
+            return self.type_chars(text, self.target(frontmost_app())) == len(text)
         except Exception as e:
             self.logger.error(f"Error in type_with_special_chars: {e}")
             return False
\ No newline at end of file
@@ -0,0 +1,155 @@
+import re
+import time
+import threading
+
+from echo.utils.config import config
+from echo.utils.logger import get_logger
+
+# Plain text runs, or a single character that needs its own key
+RUNS = re.compile(r"[^\n\t]+|[\n\t]")
+
+
+class TargetRate:
+    """Typing rate and achieved throughput for one target app"""
+
+    def __init__(self, cps, max_cps):
+        self.cps = cps  # Current pacing in characters per second
+        self.max_cps = max_cps
+        self.floor = None  # Fastest seconds-per-char seen posting a run, the uncongested baseline
+        self.chars = 0
+        self.seconds = 0.0
+        self.backoffs = 0
+
+    def achieved(self):
+        return self.chars / self.seconds if self.seconds else 0.0
+
+
+class KeystrokeInjector:
+    """Types text in paced runs, adapting the rate to what the target app keeps up with.
+
+    Text is split into runs of up to KEYSTROKE_RUN_CHARS characters sent
+    in one keyboard.type() call; newlines and tabs are pressed as Enter and
+    Tab. After each run the rate creeps up towards the target's ceiling.
+    It backs off when posting a run takes much longer than the fastest run
+    seen so far (the event queue is saturated and the app starts dropping
+    keys) or when a keystroke fails. Rates and achieved chars/sec are kept
+    per target so they can be checked and tuned in KEYSTROKE_PROFILES.
+    """
+
+    def __init__(self, keyboard):
+        self.logger = get_logger(__name__)
+        self.keyboard = keyboard
+        self.targets = {}
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    def rate_for(self, target):
+        with self.lock:
+            if target not in self.targets:
+                profile = config.input.KEYSTROKE_PROFILES.get(target, config.input.KEYSTROKE_MAX_CPS)
+                self.targets[target] = TargetRate(min(config.input.KEYSTROKE_START_CPS, profile), profile)
+            return self.targets[target]
+
+    def cancel(self):
+        """Stop typing after the current run"""
+        self.cancelled.set()
+
+    def reset(self):
+        """Clear a cancellation before the next injection"""
+        self.cancelled.clear()
+
+    def _press(self, char):
+        from pynput.keyboard import Key
+        key = Key.enter if char == '\n' else Key.tab
+        self.keyboard.press(key)
+        self.keyboard.release(key)
+
+    @staticmethod
+    def runs(text):
+        for match in RUNS.finditer(text):
+            segment = match.group()
+            for offset in range(0, len(segment), config.input.KEYSTROKE_RUN_CHARS):
+                yield segment[offset:offset + config.input.KEYSTROKE_RUN_CHARS]
+
+    @staticmethod
+    def _failed_index(error):
+        """Index of the character pynput could not type, None if the error doesn't say"""
+        # pynput raises InvalidCharacterException(index, character) from Controller.type()
+        if type(error).__name__ == 'InvalidCharacterException' and error.args and isinstance(error.args[0], int):
+            return error.args[0]
+        return None
+
+    def _send(self, run):
+        """Post one run, returns False if any of it failed.
+
+        Everything before a failing character has already been posted, so
+        typing resumes after it rather than starting the run again.
+        """
+        if run in '\n\t':
+            try:
+                self._press(run)
+                return True
+            except Exception as e:
+                self.logger.error(f"Error pressing {run!r}: {e}")
+                return False
+
+        ok = True
+        pos = 0
+        while pos < len(run):
+            try:
+                self.keyboard.type(run[pos:])
+                return ok
+            except Exception as e:
+                index = self._failed_index(e)
+                if index is None:
+                    # No way to tell what was posted, retyping could duplicate text
+                    self.logger.error(f"Error typing run {run[pos:]!r}, dropping the rest of it: {e}")
+                    return False
+                self.logger.warning(f"Error typing character {run[pos + index]!r}, skipping it: {e}")
+                pos += index + 1
+                ok = False
+        return ok
+
+    def _adapt(self, rate, run_chars, post_seconds, ok):
+        per_char = post_seconds / run_chars
+        # Sub-millisecond jitter in posting is noise, not congestion
+        slow = rate.floor is not None and per_char > max(rate.floor * config.input.KEYSTROKE_SLOW_FACTOR, 0.001)
+        rate.floor = per_char if rate.floor is None else min(rate.floor, per_char)
+        if not ok or slow:
+            rate.cps = max(config.input.KEYSTROKE_MIN_CPS, rate.cps * 0.7)
+            rate.backoffs += 1
+        else:
+            rate.cps = min(rate.max_cps, rate.cps * 1.05)
+
+    def type(self, text, target=None):
+        """Type text into the focused app, returns the number of characters sent"""
+        rate = self.rate_for(target)
+        sent = 0
+        start = time.perf_counter()
+        for run in self.runs(text):
+            if self.cancelled.is_set():
+                self.logger.info(f"Typing cancelled after {sent} of {len(text)} characters")
+                break
+            run_start = time.perf_counter()
+            ok = self._send(run)
+            self._adapt(rate, len(run), time.perf_counter() - run_start, ok)
+            sent += len(run)
+            # Pace the next run to the current rate
+            remaining = run_start + len(run) / rate.cps - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+        with self.lock:
+            rate.chars += sent
+            rate.seconds += time.perf_counter() - start
+        return sent
+
+    def stats(self):
+        """target -> achieved chars/sec, current rate and backoffs"""
+        with self.lock:
+            return {target or "unknown": {
+                'chars_per_second': rate.achieved(),
+                'rate': rate.cps,
+                'chars': rate.chars,
+                'backoffs': rate.backoffs,
+            } for target, rate in self.targets.items()}
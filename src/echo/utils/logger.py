@@ -1,64 +1,185 @@
 import os
+import json
+import queue
+import atexit
 import logging
+import datetime
+import threading
+import multiprocessing
+import contextlib
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Global flag to track if logger is initialized
 _logger_initialized = False
+_listener = None
+_context = threading.local()
+
+
+@contextlib.contextmanager
+def log_context(utterance_id):
+    """Tag every record logged on this thread with the dictation it belongs to"""
+    previous = getattr(_context, 'utterance_id', None)
+    _context.utterance_id = utterance_id
+    try:
+        yield
+    finally:
+        _context.utterance_id = previous
+
+
+def current_utterance():
+    """Utterance id of this thread, to carry it over to worker threads"""
+    return getattr(_context, 'utterance_id', None)
+
+
+def redact(text):
+    """The text itself when LOG_TRANSCRIPTS is on, otherwise only its length"""
+    from echo.utils.config import config  # config logs through this module
+    if text is None or config.log.LOG_TRANSCRIPTS:
+        return text
+    return f"<{len(text)} chars>"
+
+
+class ContextFilter(logging.Filter):
+    """Stamps the utterance id while the record is still on the caller's thread"""
+
+    def filter(self, record):
+        if not hasattr(record, 'utterance_id'):
+            record.utterance_id = current_utterance()
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queues the record untouched, the message is only formatted on the writer thread"""
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra={'fields': {...}} adds structured fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'utterance_id', None):
+            entry['utterance_id'] = record.utterance_id
+        if getattr(record, 'fields', None):
+            entry.update(record.fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def build_handlers(log_dir=None):
+    """JSON lines file handler and human-readable console handler, console only without log_dir"""
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(
+        '%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    if log_dir is None:
+        return [console_handler]
+
+    file_handler = RotatingFileHandler(
+        log_dir / 'echo_assistant.jsonl',
+        maxBytes=1024 * 1024,  # 1MB
+        backupCount=3,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter())
+    return [file_handler, console_handler]
+
+
+def start_queue_logging(logger, handlers):
+    """Route logger through a queue to handlers on a background writer thread"""
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
 
 def setup_logging():
-    """Set up logging configuration"""
-    global _logger_initialized
-    
+    """Set up logging configuration.
+
+    Callers only put records on a queue; formatting and file/console I/O
+    happen on the listener thread, which is flushed at exit. The level
+    comes from ECHO_LOG_LEVEL and is updated from LogConfig.LEVEL. Child
+    processes never open the log file, two processes rotating it would lose
+    records; they log to the console until setup_worker_logging() is called.
+    """
+    global _logger_initialized, _listener
+
     # Only initialize once
     if _logger_initialized:
         return logging.getLogger('echo')
-        
+
     # Create logs directory in user's home
-    log_dir = Path.home() / '.echo_assistant' / 'logs'
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
+    log_dir = None
+    if multiprocessing.parent_process() is None:
+        log_dir = Path.home() / '.echo_assistant' / 'logs'
+        log_dir.mkdir(parents=True, exist_ok=True)
+
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    
+
     # Configure echo logger
     logger = logging.getLogger('echo')
-    logger.setLevel(logging.INFO)
+    logger.setLevel(os.getenv('ECHO_LOG_LEVEL', 'INFO'))
     logger.propagate = False  # Don't propagate to root logger
-    
-    # File handler
-    log_file = log_dir / 'echo_assistant.log'
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=1024 * 1024,  # 1MB
-        backupCount=3
-    )
-    file_handler.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+
+    _listener = start_queue_logging(logger, build_handlers(log_dir))
+    atexit.register(_listener.stop)
+
     # Mark as initialized
     _logger_initialized = True
-    
+
     return logger
 
+
+def setup_worker_logging(log_queue):
+    """Send this worker process's records to the parent over log_queue, see forward_worker_logs()"""
+    global _listener
+
+    logger = setup_logging()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if _listener is not None:
+        atexit.unregister(_listener.stop)
+        _listener.stop()
+        _listener = None
+
+    # QueueHandler formats the message and drops args and exc_info, so records pickle
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+    return logger
+
+
+class WorkerLogHandler(logging.Handler):
+    """Hands a worker process's records to the logger they were logged on in this process"""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+def forward_worker_logs(log_queue):
+    """Write records from worker processes with this process's handlers, returns the listener"""
+    setup_logging()
+    listener = QueueListener(log_queue, WorkerLogHandler())
+    listener.start()
+    return listener
+
 def get_logger(name):
     """Get a logger instance"""
     if not _logger_initialized:
         setup_logging()
-    return logging.getLogger(f'echo.{name}')
\ No newline at end of file
+    return logging.getLogger(f'echo.{name}')
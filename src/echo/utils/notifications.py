@@ -1,10 +1,143 @@
 import os
 import sys
+import time
+import shutil
 import platform
+import threading
 import subprocess
 from pathlib import Path
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from echo.utils.config import config
 from echo.utils.logger import get_logger
 
+
+@dataclass
+class Notification:
+    title: str
+    message: str
+    emoji: str
+    sound_type: str
+    deliver: object  # fn(notification), runs on the dispatcher thread
+    queued_at: float = field(default_factory=time.perf_counter)  # First call of a coalesced burst
+    updated_at: float = field(default_factory=time.perf_counter)  # Latest call of the burst
+
+
+class NotificationDispatcher:
+    """Delivers notifications on one background thread so callers never wait.
+
+    Notifications are keyed by group; a newer one replaces a waiting one of
+    the same group, so a burst of mode changes shows only the last. A group
+    is shown once it has been quiet for COALESCE_SECONDS and no sooner than
+    MIN_INTERVAL_SECONDS after its previous notification. Delivery latency
+    and coalesced, dropped and failed counts are kept for stats().
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.pending = OrderedDict()  # group -> Notification
+        self.last_sent = {}  # group -> perf_counter of the last delivery
+        self.latencies = deque(maxlen=200)
+        self.counts = {'delivered': 0, 'coalesced': 0, 'dropped': 0, 'failed': 0}
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.idle = True
+        self.thread = threading.Thread(target=self._run, name="notifications", daemon=True)
+        self.thread.start()
+
+    def submit(self, group, notification):
+        with self.lock:
+            waiting = self.pending.get(group)
+            if waiting is not None:
+                notification.queued_at = waiting.queued_at
+                self.counts['coalesced'] += 1
+            elif len(self.pending) >= config.notifications.MAX_PENDING:
+                oldest, _ = self.pending.popitem(last=False)
+                self.counts['dropped'] += 1
+                self.logger.warning(f"Notification queue full, dropped {oldest}")
+            self.pending[group] = notification
+            self.changed.notify_all()
+
+    def _ready_at(self, group, notification):
+        return max(notification.updated_at + config.notifications.COALESCE_SECONDS,
+                   self.last_sent.get(group, float('-inf')) + config.notifications.MIN_INTERVAL_SECONDS)
+
+    def _next(self):
+        """Block until some group is due, then take it off the queue"""
+        with self.lock:
+            while True:
+                now = time.perf_counter()
+                due = None
+                for group, notification in self.pending.items():
+                    ready_at = self._ready_at(group, notification)
+                    if ready_at <= now:
+                        del self.pending[group]
+                        self.last_sent[group] = now
+                        self.idle = False
+                        return notification
+                    due = ready_at if due is None else min(due, ready_at)
+                self.idle = True
+                self.changed.notify_all()
+                self.changed.wait(None if due is None else due - now)
+
+    def _run(self):
+        while True:
+            notification = self._next()
+            try:
+                delivered = notification.deliver(notification)
+            except Exception as e:
+                self.logger.error(f"Failed to deliver notification: {e}")
+                delivered = False
+            with self.lock:
+                if delivered:
+                    self.counts['delivered'] += 1
+                    self.latencies.append(time.perf_counter() - notification.queued_at)
+                else:
+                    self.counts['failed'] += 1
+
+    def flush(self, timeout=None):
+        """Wait until everything queued has been shown"""
+        with self.lock:
+            return self.changed.wait_for(lambda: self.idle and not self.pending, timeout)
+
+    def stats(self):
+        with self.lock:
+            latencies = list(self.latencies)
+            stats = dict(self.counts, pending=len(self.pending))
+        stats['p50'] = float(np.percentile(latencies, 50)) if latencies else None
+        stats['p95'] = float(np.percentile(latencies, 95)) if latencies else None
+        return stats
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """The dispatcher shared by every NotificationManager"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+        return _dispatcher
+
+
+_notifications = None
+_notifications_lock = threading.Lock()
+
+
+def get_notifications():
+    """The NotificationManager shared by the assistant, input handler and permission checks"""
+    global _notifications
+    with _notifications_lock:
+        if _notifications is None:
+            _notifications = NotificationManager()
+        return _notifications
+
+
 class NotificationManager:
     def __init__(self):
         self.logger = get_logger(__name__)
@@ -61,14 +194,10 @@ class NotificationManager:
     def find_terminal_notifier(self):
         """Find terminal-notifier in known locations"""
         # First check if it's in PATH
-        try:
-            result = subprocess.run(['which', 'terminal-notifier'], 
-                                capture_output=True, text=True)
-            if result.returncode == 0:
-                self.terminal_notifier = result.stdout.strip()
-                return
-        except Exception:
-            pass
+        found = shutil.which('terminal-notifier')
+        if found:
+            self.terminal_notifier = found
+            return
         
         # Check known locations
         for path in self.terminal_notifier_paths:
@@ -76,17 +205,33 @@ class NotificationManager:
                 self.terminal_notifier = path
                 return
 
-    def notify(self, title, message, emoji="", sound_type='mode'):
-        """Send notification"""
+    def notify(self, title, message, emoji="", sound_type='mode', group=None):
+        """Queue a notification and return right away.
+
+        A waiting notification of the same group (the title by default) is
+        replaced, so only the latest of a burst is shown.
+        """
+        get_dispatcher().submit(group or title, Notification(title, message, emoji, sound_type, self.deliver))
+
+    def stats(self):
+        return get_dispatcher().stats()
+
+    def flush(self, timeout=None):
+        return get_dispatcher().flush(timeout)
+
+    def deliver(self, notification):
+        """Show a notification, runs on the dispatcher thread; False if it only got printed"""
+        title, message, emoji = notification.title, notification.message, notification.emoji
+        sound_type = notification.sound_type
         try:
             if not self.is_mac:
                 print(f"\n{emoji} {title}: {message}")
-                return
+                return True
 
             # If no terminal-notifier found, just print
             if not self.terminal_notifier:
                 print(f"\n{emoji} {title}: {message}")
-                return
+                return True
 
             # Only try once to send notification
             try:
@@ -99,11 +244,14 @@ class NotificationManager:
                     '-appIcon', self.icon_path  # This will set the icon for the sender
                 ]
                 
-                subprocess.run(cmd, capture_output=True, timeout=1)
+                subprocess.run(cmd, capture_output=True, timeout=config.notifications.DELIVERY_TIMEOUT_SECONDS)
+                return True
             except Exception as e:
                 self.logger.error(f"Failed to send notification: {e}")
                 print(f"\n{emoji} {title}: {message}")
-                
+                return False
+
         except Exception as e:
             self.logger.error(f"Notification error: {e}")
-            print(f"\n{emoji} {title}: {message}")
\ No newline at end of file
+            print(f"\n{emoji} {title}: {message}")
+            return False
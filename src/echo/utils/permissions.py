@@ -2,15 +2,42 @@ import os
 import sys
 import time
 import platform
+import threading
 import subprocess
 from pathlib import Path
+from echo.utils.config import config
 from echo.utils.logger import get_logger
-from echo.utils.notifications import NotificationManager
+from echo.utils.notifications import get_notifications
+
+_microphone = None
+_microphone_lock = threading.Lock()
+
+
+def probe_microphone():
+    """(ok, device name or error) for the default input, probed once per run.
+
+    Uses sounddevice like the recorder, so PortAudio is loaded and the
+    device list scanned only once between the startup check and the
+    assistant. A failed probe is retried on the next call.
+    """
+    global _microphone
+    with _microphone_lock:
+        if _microphone is None or not _microphone[0]:
+            try:
+                import sounddevice as sd
+                device = sd.query_devices(kind='input')
+                sd.check_input_settings(channels=config.audio.CHANNELS, samplerate=config.audio.SAMPLE_RATE,
+                                        dtype='float32')
+                _microphone = (True, device['name'])
+            except Exception as e:
+                _microphone = (False, str(e))
+        return _microphone
+
 
 class PermissionsManager:
     def __init__(self):
         self.logger = get_logger(__name__)
-        self.notifications = NotificationManager()
+        self.notifications = get_notifications()
         self.permission_check_attempts = 0
         self.max_attempts = 3
 
@@ -57,24 +84,13 @@ class PermissionsManager:
 
     def check_microphone_permissions(self):
         """Check microphone permissions"""
-        try:
-            import pyaudio
-            p = pyaudio.PyAudio()
-            
-            # Just try to get device info first
-            try:
-                device_info = p.get_default_input_device_info()
-                self.logger.info(f"Found input device: {device_info['name']}")
-                p.terminate()
-                return True
-            except IOError:
-                p.terminate()
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Microphone check error: {e}")
-            return False
-                
+        ok, detail = probe_microphone()
+        if ok:
+            self.logger.info("Found input device: %s", detail)
+        else:
+            self.logger.error("Microphone check error: %s", detail)
+        return ok
+
     def check_accessibility_permissions(self):
         """Check accessibility permissions"""
         try:
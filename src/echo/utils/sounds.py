@@ -1,31 +1,89 @@
+import time
+import wave
+import threading
+from pathlib import Path
+
 import simpleaudio as sa
 import numpy as np
 from echo.utils.logger import get_logger
 
+SAMPLE_RATE = 44100
+SOUNDS_DIR = Path(__file__).parent.parent / "assets" / "sounds"
+
+# Cue name -> (frequency, duration) of the generated beep
+CUES = {
+    'start': (1000, 0.1),  # High pitch beep
+    'stop': (500, 0.1),  # Low pitch beep
+}
+
 def generate_beep(frequency, duration, volume=0.3):
     """Generate a beep sound"""
-    sample_rate = 44100
+    sample_rate = SAMPLE_RATE
     t = np.linspace(0, duration, int(sample_rate * duration), False)
     samples = np.sin(2 * np.pi * frequency * t)
     audio = (volume * samples * 32767).astype(np.int16)
     return audio
 
+
+class SoundBank:
+    """Cue sounds rendered once and played without waiting for them to finish.
+
+    A cue is loaded from assets/sounds/<name>.wav when that file exists,
+    otherwise its beep is generated. play() returns the perf_counter time
+    the cue stops sounding so the recorder can drop audio until then.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.cues = {}  # name -> (WaveObject, duration)
+        start = time.perf_counter()
+        for name, (frequency, duration) in CUES.items():
+            try:
+                self.cues[name] = self.load(SOUNDS_DIR / f"{name}.wav") or \
+                    (sa.WaveObject(generate_beep(frequency, duration).tobytes(), 1, 2, SAMPLE_RATE), duration)
+            except Exception as e:
+                self.logger.error(f"Error preparing {name} sound: {e}")
+        self.logger.info(f"Prepared {len(self.cues)} cue sounds in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def load(self, path):
+        """(WaveObject, duration) from a wav file, None if there is none"""
+        if not path.exists():
+            return None
+        with wave.open(str(path), 'rb') as wav:
+            duration = wav.getnframes() / wav.getframerate()
+        return sa.WaveObject.from_wave_file(str(path)), duration
+
+    def play(self, name):
+        """Start a cue and return right away with the time it ends, None if it could not play"""
+        cue = self.cues.get(name)
+        if cue is None:
+            return None
+        wave_obj, duration = cue
+        try:
+            wave_obj.play()
+            return time.perf_counter() + duration
+        except Exception as e:
+            self.logger.error(f"Error playing {name} sound: {e}")
+            return None
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_sound_bank():
+    """The shared sound bank, rendered on first use"""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = SoundBank()
+        return _bank
+
+
 def play_start_sound():
-    """Play start recording sound"""
-    try:
-        audio = generate_beep(1000, 0.1)  # High pitch beep
-        play_obj = sa.play_buffer(audio, 1, 2, 44100)
-        play_obj.wait_done()
-    except Exception as e:
-        logger = get_logger(__name__)
-        logger.error(f"Error playing start sound: {e}")
+    """Play start recording sound, returns when the cue ends"""
+    return get_sound_bank().play('start')
 
 def play_stop_sound():
-    """Play stop recording sound"""
-    try:
-        audio = generate_beep(500, 0.1)  # Low pitch beep
-        play_obj = sa.play_buffer(audio, 1, 2, 44100)
-        play_obj.wait_done()
-    except Exception as e:
-        logger = get_logger(__name__)
-        logger.error(f"Error playing stop sound: {e}")
\ No newline at end of file
+    """Play stop recording sound, returns when the cue ends"""
+    return get_sound_bank().play('stop')
@@ -0,0 +1,156 @@
+import sys
+import time
+import threading
+import contextlib
+import importlib.abc
+from collections import defaultdict
+
+_started = time.perf_counter()
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader to time exec_module, everything else is delegated"""
+
+    def __init__(self, loader, name, timer):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave(self._name)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Measures the self time of every module imported while installed, on any thread"""
+
+    def __init__(self):
+        self.self_times = {}  # (thread name, module) -> seconds
+        self.lock = threading.Lock()
+        self.local = threading.local()  # Per-thread stack of [start, time spent in nested imports]
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self.local, 'finding', False):
+            return None
+        self.local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, fullname, self)
+                    return spec
+            return None
+        finally:
+            self.local.finding = False
+
+    def _stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def enter(self):
+        self._stack().append([time.perf_counter(), 0.0])
+
+    def leave(self, name):
+        stack = self._stack()
+        if not stack:
+            return
+        start, nested = stack.pop()
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.self_times[(threading.current_thread().name, name)] = elapsed - nested
+        if stack:
+            stack[-1][1] += elapsed
+
+    def by_package(self):
+        """Self time summed per thread and top-level package, slowest first"""
+        totals = defaultdict(float)
+        with self.lock:
+            for (thread, name), seconds in self.self_times.items():
+                totals[(thread, name.split('.')[0])] += seconds
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+class StartupProfiler:
+    """Per-phase and per-import timing of a launch, enabled by --profile-startup.
+
+    Phases and marks are cheap no-ops until enable() is called, so the
+    launch code can stay instrumented. Times are relative to the import of
+    this module, which main imports first. Imports are timed on every thread
+    until the report is printed.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.phases = []  # (name, seconds)
+        self.marks = []  # (name, seconds since start)
+        self.imports = None
+
+    def enable(self):
+        self.enabled = True
+        self.imports = ImportTimer()
+        sys.meta_path.insert(0, self.imports)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - _started))
+
+    def report_when_ready(self, ready, name, target=None, timeout=120.0):
+        """Mark name and report once the ready event is set, so background loading is included"""
+        if not self.enabled:
+            return
+
+        def wait():
+            if ready.wait(timeout):
+                self.mark(name)
+            self.report(target)
+
+        threading.Thread(target=wait, name="startup-report", daemon=True).start()
+
+    def report(self, target=None, top=12):
+        """Print the breakdown, stop timing imports"""
+        if not self.enabled:
+            return
+        if self.imports in sys.meta_path:
+            sys.meta_path.remove(self.imports)
+
+        print("\nStartup profile")
+        print(f"{'phase':<24} {'seconds':>8}")
+        for name, seconds in self.phases:
+            print(f"{name:<24} {seconds:>8.3f}")
+        for name, seconds in self.marks:
+            print(f"{name + ' at':<24} {seconds:>8.3f}")
+
+        icon = dict(self.marks).get("menu bar icon")
+        if target is not None and icon is not None:
+            verdict = "within" if icon <= target else "OVER"
+            print(f"Menu bar icon after {icon:.2f}s, {verdict} the {target:.2f}s target")
+
+        print(f"\n{'imports (self time)':<24} {'seconds':>8}  thread")
+        for (thread, package), seconds in self.imports.by_package()[:top]:
+            print(f"{package:<24} {seconds:>8.3f}  {thread}")
+        self.enabled = False  # Report once
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,148 @@
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from echo.utils.config import config
+
+
+class Trace:
+    """Timed spans for one dictation, written as a single JSON line when finished"""
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.lock = threading.Lock()
+        self.finished = False
+
+    def record(self, name, duration, start=None, **attrs):
+        """Add a span measured elsewhere; start is a perf_counter timestamp"""
+        start = time.perf_counter() - duration if start is None else start
+        span = {
+            'name': name,
+            'offset': round(start - self.origin, 4),
+            'duration': round(duration, 4),
+        }
+        span.update(attrs)
+        with self.lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time the enclosed block; the yielded dict can be filled with attributes"""
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.record(name, time.perf_counter() - start, start, **attrs)
+
+    def finish(self, **attrs):
+        """Write the trace to the trace file, only the first call counts"""
+        with self.lock:
+            if self.finished:
+                return
+            self.finished = True
+            record = {
+                'trace_id': self.trace_id,
+                'started': round(self.started, 3),
+                'total': round(time.perf_counter() - self.origin, 4),
+                'spans': sorted(self.spans, key=lambda s: s['offset']),
+            }
+        record.update(attrs)
+        self.tracer.write(record)
+
+
+class Tracer:
+    """Hands out per-utterance traces and appends them to a rotating JSONL file"""
+
+    def __init__(self, path=None):
+        self.enabled = config.trace.ENABLED
+        self.path = path or config.trace.TRACE_FILE
+        self.logger = None
+
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # A dedicated logger gives us size-based rotation and thread-safe appends
+            self.logger = logging.getLogger(f'echo_traces.{id(self)}')
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+            handler = RotatingFileHandler(self.path, maxBytes=config.trace.MAX_BYTES,
+                                          backupCount=config.trace.BACKUP_COUNT)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+
+    def start_trace(self):
+        return Trace(self)
+
+    def write(self, record):
+        if self.logger:
+            self.logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def load_traces(path=None):
+    """Read traces from the trace file and its rotated backups, oldest first"""
+    path = path or config.trace.TRACE_FILE
+    files = [path.with_name(f"{path.name}.{i}") for i in range(config.trace.BACKUP_COUNT, 0, -1)] + [path]
+    traces = []
+    for file in files:
+        if not file.exists():
+            continue
+        with open(file, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    traces.append(json.loads(line))
+                except ValueError:
+                    continue
+    return traces
+
+
+def span_durations(traces):
+    """Durations per span name, with the whole trace as 'total'"""
+    durations = {}
+    for trace in traces:
+        durations.setdefault('total', []).append(trace['total'])
+        for span in trace.get('spans', []):
+            durations.setdefault(span['name'], []).append(span['duration'])
+            if 'ttfb' in span:
+                durations.setdefault(f"{span['name']}.ttfb", []).append(span['ttfb'])
+    return durations
+
+
+def percentile(values, q):
+    values = sorted(values)
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def histogram(values, buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10), width=40):
+    """Text histogram of durations over fixed latency buckets"""
+    counts = [0] * (len(buckets) + 1)
+    for value in values:
+        counts[next((i for i, b in enumerate(buckets) if value <= b), len(buckets))] += 1
+
+    labels = [f"≤{b}s" for b in buckets] + [f">{buckets[-1]}s"]
+    peak = max(counts) or 1
+    return [f"  {label:>7} {'█' * int(count / peak * width):<{width}} {count}"
+            for label, count in zip(labels, counts)]
+
+
+def print_summary(traces):
+    """Print latency percentiles and histograms per span"""
+    if not traces:
+        print("No traces recorded yet")
+        return
+
+    print(f"\n{len(traces)} traces")
+    durations = span_durations(traces)
+    for name in sorted(durations, key=lambda n: (n == 'total', n)):
+        values = durations[name]
+        print(f"\n{name}: p50 {percentile(values, 50):.3f}s  p95 {percentile(values, 95):.3f}s  "
+              f"p99 {percentile(values, 99):.3f}s  (n={len(values)})")
+        for line in histogram(values):
+            print(line)
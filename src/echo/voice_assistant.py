@@ -1,19 +1,25 @@
 import os
 import sys
 import time
-import rumps
+import functools
 import threading
+import contextlib
 import subprocess
-from pynput import keyboard
 
 from echo.audio.recorder import AudioRecorder
 from echo.services.transcription import Transcriber
+from echo.services.streaming import StreamingTranscriber
+from echo.services.worker import RemoteTranscriber
 from echo.services.openai_service import OpenAIService
-from echo.utils.sounds import play_start_sound, play_stop_sound
-from echo.utils.logger import get_logger
+from echo.services.cleanup import LocalRewriter, RewritePolicy
+from echo.services.pipeline import JobPipeline, Prefetcher
+from echo.utils.sounds import get_sound_bank, play_start_sound, play_stop_sound
+from echo.utils.logger import get_logger, log_context, redact
+from echo.utils.tracing import Tracer
 from echo.utils.input_handler import InputHandler
-from echo.utils.config import ToneMode, CommunicationType
-from echo.utils.notifications import NotificationManager
+from echo.utils.config import config, ToneMode, CommunicationType
+from echo.utils.notifications import get_notifications
+from echo.utils.permissions import probe_microphone
 
 
 
@@ -24,13 +30,14 @@ class VoiceAssistant:
 
         self.gui = gui
         self.recorder = AudioRecorder()
-        self.transcription = Transcriber()
-        self.openai = OpenAIService()
-        self.input_handler = InputHandler()
+        self.transcription = RemoteTranscriber() if config.whisper.OUT_OF_PROCESS else Transcriber()
         self.recording_thread = None
+        self.stream_session = None
         self.is_recording = False
-        self.running = True
-        self.notifications = NotificationManager()
+        self.stopped = threading.Event()  # Set on shutdown, run() sleeps on it
+        self.notifications = get_notifications()
+        self.trace = None  # Trace of the dictation being recorded
+        self.capture_start = None
 
         self.current_tone = ToneMode.FRIENDLY
         self.current_comm_type = CommunicationType.DM
@@ -39,10 +46,58 @@ class VoiceAssistant:
         self.keyboard_listener = None
         self.keyboard_initialized = False
 
+        # capture (recorder) -> transcribe -> rewrite -> inject, so F9 never waits on processing
+        self.pipeline = JobPipeline(
+            [('transcribe', self.transcribe_stage),
+             ('rewrite', self.rewrite_stage),
+             ('inject', self.inject_stage)],
+            on_done=self.finish_job,
+            queue_size=config.pipeline.QUEUE_SIZE,
+            # Log records of a dictation carry its trace id, whichever thread writes them
+            context=lambda job: log_context(job.data['trace'].trace_id)
+        )
+
+        # Load Whisper in the background so startup isn't blocked,
+        # the transcribe stage holds recordings until it is ready
+        self.transcription.load_async()
+
+    # Services below are built on first use so the menu bar icon isn't held up
+    # by them; warm_up() builds them in the background right after launch
+
+    @functools.cached_property
+    def openai(self):
+        return OpenAIService()
+
+    @functools.cached_property
+    def local_rewriter(self):
+        return LocalRewriter()
+
+    @functools.cached_property
+    def input_handler(self):
+        return InputHandler()
+
+    @functools.cached_property
+    def tracer(self):
+        return Tracer()
+
+    @functools.cached_property
+    def sounds(self):
+        return get_sound_bank()
+
+    def warm_up(self):
+        """Build the lazy services now so the first F9 doesn't pay for them"""
+        start = time.perf_counter()
+        try:
+            for name in ('sounds', 'tracer', 'input_handler', 'local_rewriter', 'openai'):
+                getattr(self, name)
+            self.logger.info("Services warmed up in %.2fs", time.perf_counter() - start)
+        except Exception as e:
+            self.logger.error(f"Error warming up services: {e}")
+
     def start_keyboard_listener(self):
         """Start the keyboard listener"""
         if self.keyboard_initialized:
-            return
+            return True
             
         try:
             # Always set up pynput listener
@@ -57,6 +112,7 @@ class VoiceAssistant:
             
             # If we're running as bundled app, also set up rumps callbacks
             if getattr(sys, 'frozen', False) and self.gui:
+                import rumps
                 menu_items = self.gui._menu.values()
                 for item in menu_items:
                     if isinstance(item, rumps.MenuItem):
@@ -115,6 +171,35 @@ class VoiceAssistant:
         mode_emoji = mode_emojis.get(self.current_comm_type, "")
         mode_name = self.current_comm_type.value.replace('_', ' ').title()
         print(f"Mode    : {mode_emoji} {mode_name}")
+        print(f"Model   : {config.whisper.MODEL_SIZE} ({self.transcription.state})")
+        print(f"Queue   : {self.pipeline.pending()} dictation(s) in progress")
+        prompt = self.openai.prompts.get(self.current_tone, self.current_comm_type)
+        print(f"Prompt  : {prompt.tokens} tokens (version {self.openai.prompts.version})")
+
+        # Dropped audio blocks from the last recording
+        audio_stats = self.recorder.stats()
+        print(f"Audio   : {audio_stats['overflows']} overflows, "
+              f"{audio_stats['underflows']} underflows, "
+              f"{audio_stats['dropped_blocks']} dropped blocks")
+
+        for name, route in self.openai.router.summary().items():
+            print(f"Route   : {name} p50 {route['p50']:.2f}s, p95 {route['p95']:.2f}s, "
+                  f"{route['truncation_rate']:.0%} truncated ({route['requests']} requests)")
+
+        for target, typing in self.input_handler.typing_stats().items():
+            print(f"Typing  : {target} {typing['chars_per_second']:.0f} chars/s "
+                  f"(rate {typing['rate']:.0f}, {typing['backoffs']} backoffs)")
+
+        notify_stats = self.notifications.stats()
+        notify_latency = f", p95 {notify_stats['p95']:.2f}s" if notify_stats['p95'] is not None else ""
+        print(f"Notify  : {notify_stats['delivered']} shown{notify_latency}, "
+              f"{notify_stats['coalesced']} coalesced, {notify_stats['dropped']} dropped, "
+              f"{notify_stats['failed']} failed")
+
+        cache_stats = self.openai.cache.stats()
+        print(f"Cache   : {cache_stats['hits']} hits ({cache_stats['memory_hits']} memory, "
+              f"{cache_stats['disk_hits']} disk), {cache_stats['misses']} misses, "
+              f"{cache_stats['hit_rate']:.0%} hit rate")
         print("="*50 + "\n")
         
         # Send notification with current status
@@ -122,17 +207,18 @@ class VoiceAssistant:
         self.notifications.notify(
             "Current Status",
             status_message,
-            "ℹ️"  # Info emoji
+            "ℹ️",  # Info emoji
+            group='settings'
         )
 
     def toggle_tone(self):
         """Toggle between friendly and business tone"""
         if self.current_tone == ToneMode.FRIENDLY:
             self.current_tone = ToneMode.BUSINESS
-            self.notifications.notify("Tone Changed", "Switched to Business tone", "🎯")
+            self.notifications.notify("Tone Changed", "Switched to Business tone", "🎯", group='settings')
         else:
             self.current_tone = ToneMode.FRIENDLY
-            self.notifications.notify("Tone Changed", "Switched to Friendly tone", "😊")
+            self.notifications.notify("Tone Changed", "Switched to Friendly tone", "😊", group='settings')
         self.show_status()
 
     def cycle_comm_type(self):
@@ -152,85 +238,228 @@ class VoiceAssistant:
         self.notifications.notify(
             "Mode Changed", 
             f"Switched to {self.current_comm_type.value.replace('_', ' ').title()} mode",
-            mode_emojis[self.current_comm_type]
+            mode_emojis[self.current_comm_type],
+            group='settings'
         )
         self.show_status()
         
-    def process_audio(self, audio_data):
-        """Process audio data in real-time"""
-        try:
-            print("\nProcessing complete audio...")
-            self.logger.debug("Processing complete audio...")
-            
-            # Process with transcription service
-            print("Calling transcribe_audio...")
-            text = self.transcription.transcribe_audio(audio_data)
-            print(f"Got transcription: {text}")
-            
-            if text and text.strip():
-                print(f"\nTranscribed: {text}")
-                self.logger.info(f"Transcribed: {text}")
-                
-                # Get OpenAI response
-                print("Getting OpenAI response...")
-                self.openai.initialize()
-                response_text, processing_time = self.openai.process_text(
-                    text, 
-                    tone=self.current_tone,
-                    comm_type=self.current_comm_type
-                )
+    def process_audio(self, audio_data, speech_regions=None):
+        """Hand a finished recording to the pipeline, returns right away"""
+        stream_session, self.stream_session = self.stream_session, None
+        trace, self.trace = self.trace or self.tracer.start_trace(), None
+
+        # Capture covers F9 press to the drained recording, VAD ran inside it
+        if self.capture_start is not None:
+            trace.record('capture', time.perf_counter() - self.capture_start, self.capture_start,
+                         audio_seconds=round(len(audio_data) / config.audio.SAMPLE_RATE, 2))
+        audio_stats = self.recorder.stats()
+        if config.audio.VAD_ENABLED:
+            trace.record('vad', audio_stats['vad_seconds'], regions=audio_stats['speech_regions'])
+
+        # The transcribe stage waits for Whisper, let the user know why nothing happens yet
+        if not self.transcription.ready.is_set():
+            self.logger.info("Whisper model still loading, recording queued")
+            self.notifications.notify("Model Loading", "Your recording will be processed when ready", "⏳")
+
+        # Settings are taken now, switching tone mid-processing only affects later dictations
+        self.pipeline.submit(
+            audio=audio_data,
+            speech_regions=speech_regions,
+            stream_session=stream_session,
+            trace=trace,
+            tone=self.current_tone,
+            comm_type=self.current_comm_type,
+            outcome={'tone': self.current_tone.value, 'comm_type': self.current_comm_type.value,
+                     'streaming': stream_session is not None}
+        )
+
+    def transcribe_stage(self, job):
+        """Pipeline stage: recording -> transcript"""
+        data = job.data
+        trace = data['trace']
+        print("\nProcessing complete audio...")
+        self.logger.debug("Processing complete audio...")
+
+        # Segments were decoded while recording, only the tail is left
+        with trace.span('transcribe'):
+            if data['stream_session']:
+                print("Finishing streaming transcription...")
+                transcription = data['stream_session'].finish()
+            else:
+                # Process with transcription service
+                print("Calling transcribe_audio...")
+                transcription = self.transcription.transcribe(data['audio'], data['speech_regions'])
+        data['audio'] = None  # Free the recording early
+        text = transcription.text
+        print(f"Got transcription: {redact(text)}")
+        stats = transcription.stats
+        self.logger.info("Decode: %s", stats.summary())
+        trace.record('preprocess', stats.preprocess_seconds)
+        trace.record('decode', stats.decode_seconds, path=stats.path, segments=stats.segments,
+                     escalated=stats.escalated, audio_seconds=round(stats.audio_seconds, 2))
+        data['outcome']['transcript_chars'] = len(text)
+
+        if not (text and text.strip()):
+            job.done = True
+            return
+
+        print(f"\nTranscribed: {redact(text)}")
+        self.logger.info("Transcribed: %s", redact(text))
+        data['transcription'] = transcription
+
+    def rewrite_stage(self, job):
+        """Pipeline stage: transcript -> response text, or a stream of it"""
+        data = job.data
+        text = data['transcription'].text
+        decision = self.local_rewriter.policy.route(text, data['comm_type'])
+        data['outcome']['route'] = decision.route
+        data['outcome']['complexity'] = decision.complexity
+        data['rewrite_start'] = time.perf_counter()
+
+        if decision.route == RewritePolicy.LOCAL:
+            data['response'] = self.local_rewriter.rewrite(text, data['transcription'].segments, data['trace'])
+            print(f"\n🧹 Cleaned up locally: {redact(data['response'])}")
+        elif config.openai.STREAMING:
+            # The request runs on while earlier responses are still being typed
+            print("Streaming OpenAI response...")
+            data['chunks'] = Prefetcher(self.openai.stream_text(
+                text,
+                tone=data['tone'],
+                comm_type=data['comm_type'],
+                trace=data['trace']
+            ))
+        else:
+            # Get OpenAI response
+            print("Getting OpenAI response...")
+            response_text, processing_time = self.openai.process_text(
+                text,
+                tone=data['tone'],
+                comm_type=data['comm_type'],
+                trace=data['trace']
+            )
+            if not response_text:
+                job.done = True
+                return
+            print(f"\n🤖 Assistant: {redact(response_text)}")
+            print(f"⏱️ Processing time: {processing_time:.2f}s")
+            data['response'] = response_text
+
+    def inject_stage(self, job):
+        """Pipeline stage: type the response into the focused app, in submission order"""
+        data = job.data
+        trace = data['trace']
+        if 'chunks' in data:
+            with trace.span('inject', streamed=True):
+                response_text, first_char_at, cancelled = self.input_handler.type_stream(
+                    data['chunks'], config.openai.STREAM_BOUNDARY)
+            typed = bool(response_text) and not cancelled
+            if response_text:
+                started = data['rewrite_start']
+                print(f"\n🤖 Assistant: {redact(response_text)}")
+                if first_char_at is not None and not cancelled:  # Cancelled runs would skew the percentiles
+                    first_char = first_char_at - started
+                    trace.record('first_char', first_char, started)
+                    print(f"⏱️ First character: {first_char:.2f}s, total: {time.perf_counter() - started:.2f}s")
+            if cancelled:
+                data['outcome']['cancelled'] = True
+        else:
+            cancelled = False
+            response_text = data['response']
+            # Type the processed text
+            print("\nTyping response...")
+            with trace.span('inject') as span:
+                span['typed'] = typed = self.input_handler.type_text(response_text)
+
+        if response_text:
+            data['outcome']['response_chars'] = len(response_text)
+        if cancelled:
+            print("⏹️ Response cancelled, text on clipboard")
+        elif typed:
+            print("✅ Response typed successfully")
+        else:
+            print("❌ Failed to type response")
+
+    def finish_job(self, job):
+        """Write the dictation's trace once it leaves the pipeline"""
+        data = job.data
+        trace = data['trace']
+        for stage, wait in job.waits.items():
+            trace.record(f'{stage}_queue', wait)
+        if job.error is not None:
+            data['outcome']['error'] = type(job.error).__name__
+        # Lengths only, transcripts never go into the trace file
+        trace.finish(**data['outcome'])
 
-                if response_text:
-                    print(f"\n🤖 Assistant: {response_text}")
-                    print(f"⏱️ Processing time: {processing_time:.2f}s")
-                    
-                    # Type the processed text
-                    print("\nTyping response...")
-                    if self.input_handler.type_text(response_text):
-                        print("✅ Response typed successfully")
-                    else:
-                        print("❌ Failed to type response")
-                
-        except Exception as e:
-            self.logger.error(f"Error processing audio: {e}", exc_info=True)
-            print(f"\nError: {e}")
-            
     def start_recording(self):
         """Start recording audio"""
-        self.notifications.notify(
-            "Recording", 
-            "Started recording...", 
-            "🎤"
-        )
+        if not self.is_recording:
+            self.trace = self.tracer.start_trace()
+            self.capture_start = time.perf_counter()
+            # The socket is warm by the time the transcript is ready
+            self.openai.preconnect()
+
+        with self.trace_span('notify', event='recording'):
+            self.notifications.notify(
+                "Recording", 
+                "Started recording...", 
+                "🎤"
+            )
 
         if not self.is_recording:
             self.is_recording = True
-            play_start_sound()
+            # Capture opens while the cue plays, the recorder drops the blocks it is audible in
+            cue_end = play_start_sound()
+            skip_until = cue_end + config.audio.CUE_GUARD_SECONDS if cue_end else None
             self.logger.info("Recording started")
+
+            window_callback = None
+            if config.whisper.STREAMING:
+                self.stream_session = StreamingTranscriber(
+                    self.transcription,
+                    vad_filter=not config.audio.VAD_ENABLED
+                )
+                self.stream_session.start()
+                window_callback = self.stream_session.feed
             
-            # Start recording in a separate thread
-            self.recording_thread = threading.Thread(
-                target=self.recorder.start,
-                args=(self.process_audio,)
-            )
+            # Arm here so a stop that comes before the thread runs isn't lost, record in a separate thread
+            self.recorder.reset(self.process_audio, window_callback, skip_until)
+            self.recording_thread = threading.Thread(target=self.recorder.record)
             self.recording_thread.daemon = True  # Make thread daemon so it stops when main thread stops
             self.recording_thread.start()
 
+    @contextlib.contextmanager
+    def trace_span(self, name, **attrs):
+        """Span on the current recording's trace, if there is one"""
+        trace = self.trace
+        if trace is None:
+            yield attrs
+            return
+        with trace.span(name, **attrs) as span:
+            yield span
+
     def stop_recording(self):
         """Stop recording audio"""
-        self.notifications.notify(
-            "Processing", 
-            "Processing recording...", 
-            "⚙️"
-        )
+        with self.trace_span('notify', event='processing'):
+            self.notifications.notify(
+                "Processing", 
+                "Processing recording...", 
+                "⚙️"
+            )
 
         if self.is_recording:
             self.is_recording = False
-            self.recorder.should_stop = True
+            self.recorder.request_stop()
             
             if self.recording_thread:
                 self.recording_thread.join()
                 self.recording_thread = None  # Clear the thread reference
+
+            # The recorder skips the callback when nothing was captured
+            if self.stream_session:
+                self.stream_session.cancel()
+                self.stream_session = None
+            self.trace = None
+            self.capture_start = None
             
             play_stop_sound()
             self.logger.info("Recording stopped")
@@ -238,19 +467,24 @@ class VoiceAssistant:
     def on_press(self, key):
         """Handle keyboard shortcuts"""
         try:
-            self.logger.debug(f"Key pressed: {key}")
+            from pynput.keyboard import Key  # Loaded by the listener already
+
+            self.logger.debug("Key pressed: %s", key)
+            if key == Key.esc:
+                self.input_handler.cancel_typing()
+                return
             # Only handle our specific shortcuts
-            if key in [keyboard.Key.f6, keyboard.Key.f7, keyboard.Key.f8, keyboard.Key.f9]:
-                if key == keyboard.Key.f9:
+            if key in [Key.f6, Key.f7, Key.f8, Key.f9]:
+                if key == Key.f9:
                     if not self.is_recording:
                         self.start_recording()
                     else:
                         self.stop_recording()
-                elif key == keyboard.Key.f6:
+                elif key == Key.f6:
                     self.toggle_tone()
-                elif key == keyboard.Key.f7:
+                elif key == Key.f7:
                     self.cycle_comm_type()
-                elif key == keyboard.Key.f8:
+                elif key == Key.f8:
                     self.show_status()
                         
         except Exception as e:
@@ -259,62 +493,31 @@ class VoiceAssistant:
     def on_release(self, key):
         """Handle key release events"""
         try:
-            self.logger.debug(f"Key released: {key}")
+            self.logger.debug("Key released: %s", key)
         except Exception as e:
             self.logger.error(f"Error in key release handler: {e}")
 
     def check_microphone_permissions(self):
-        """Check microphone access by attempting to open a test stream"""
-        try:
-            import pyaudio
-            
-            # Try to initialize PyAudio
-            audio = pyaudio.PyAudio()
-            
-            # Try to get default input device info
-            try:
-                device_info = audio.get_default_input_device_info()
-                self.logger.info(f"Found input device: {device_info['name']}")
-            except IOError:
-                self.notifications.notify(
-                    "Microphone Access Required",
-                    "Please enable microphone access in System Settings → Privacy → Microphone",
-                    "⚠️"
-                )
-                return False
-                
-            # Try to open a test stream
-            try:
-                stream = audio.open(
-                    format=pyaudio.paFloat32,
-                    channels=1,
-                    rate=16000,
-                    input=True,
-                    frames_per_buffer=1024,
-                    start=False
-                )
-                stream.close()
-            except Exception as e:
-                self.logger.error(f"Error opening audio stream: {e}")
-                self.notifications.notify(
-                    "Microphone Access Required",
-                    "Please enable microphone access in System Settings → Privacy → Microphone",
-                    "⚠️"
-                )
-                return False
-                
-            finally:
-                audio.terminate()
-                
+        """Check microphone access, reusing the probe made by the startup permission check"""
+        ok, detail = probe_microphone()
+        if ok:
+            self.logger.info("Found input device: %s", detail)
             return True
-            
-        except Exception as e:
-            self.logger.error(f"Error checking microphone: {e}")
-            return False
+
+        self.logger.error("Error opening audio input: %s", detail)
+        self.notifications.notify(
+            "Microphone Access Required",
+            "Please enable microphone access in System Settings → Privacy → Microphone",
+            "⚠️"
+        )
+        return False
 
     def run(self):
         """Run the voice assistant"""
         try:
+            if config.startup.WARM_UP:
+                threading.Thread(target=self.warm_up, daemon=True).start()
+
             # Check microphone permissions first
             if not self.check_microphone_permissions():
                 self.logger.error("Microphone access not available")
@@ -337,8 +540,8 @@ class VoiceAssistant:
             
             print(f"\nVoice Assistant ready! {msg}")
             
-            while self.running:
-                time.sleep(0.1)
+            # Everything is driven by key and audio callbacks, nothing to poll
+            self.stopped.wait()
                     
         except Exception as e:
             self.logger.error(f"Error in voice assistant: {e}")
@@ -347,9 +550,14 @@ class VoiceAssistant:
                                     
     def cleanup(self):
         """Clean up resources"""
-        self.running = False
+        self.stopped.set()
         if self.is_recording:
             self.stop_recording()
         if self.keyboard_listener:
             self.keyboard_listener.stop()
+        # Let dictations already in flight finish typing
+        self.pipeline.shutdown(timeout=5.0)
+        self.notifications.flush(timeout=2.0)
+        if isinstance(self.transcription, RemoteTranscriber):
+            self.transcription.shutdown()
         self.logger.info("Voice Assistant shutting down...")
\ No newline at end of file
@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+
+from echo.audio.buffer import CaptureBuffer
+
+RATE = 1000  # One frame per millisecond keeps the sizes readable
+
+
+def block(start, frames=10):
+    """Frames numbered start, start + 1, ... so any gap or overwrite shows"""
+    return np.arange(start, start + frames, dtype=np.float32).reshape(-1, 1)
+
+
+def fill(buffer, frames, start=0):
+    for offset in range(start, start + frames, 10):
+        buffer.write(block(offset))
+
+
+def test_reserve_grows_ahead_and_the_writer_adopts_it():
+    buffer = CaptureBuffer(RATE, capacity_seconds=0.1)
+    fill(buffer, 90)
+    buffer.reserve(headroom=20)
+    assert buffer.capacity == 100  # Nothing changes until the writer adopts the new array
+
+    fill(buffer, 10, start=90)
+    assert buffer.capacity == int(100 * CaptureBuffer.GROWTH)
+    assert np.array_equal(buffer.view()[:, 0], np.arange(100))
+
+
+def test_reserve_is_a_no_op_with_enough_headroom():
+    buffer = CaptureBuffer(RATE, capacity_seconds=0.1)
+    fill(buffer, 50)
+    buffer.reserve(headroom=50)
+    fill(buffer, 50, start=50)
+    assert buffer.capacity == 100
+
+
+def test_write_grows_inline_when_nobody_reserved():
+    buffer = CaptureBuffer(RATE, capacity_seconds=0.1)
+    fill(buffer, 250)
+    assert buffer.capacity >= 250
+    assert np.array_equal(buffer.view()[:, 0], np.arange(250))
+
+
+def test_views_stay_valid_across_growth():
+    buffer = CaptureBuffer(RATE, capacity_seconds=0.1)
+    fill(buffer, 80)
+    early = buffer.view(20, 60)
+    buffer.reserve(headroom=50)
+    fill(buffer, 300, start=80)
+
+    assert buffer.capacity >= 380
+    assert np.array_equal(early[:, 0], np.arange(20, 60))
+    assert np.array_equal(buffer.view(20, 60), early)
+
+
+def test_reader_sees_every_frame_once_while_the_writer_grows_the_buffer():
+    buffer = CaptureBuffer(RATE, capacity_seconds=0.05)
+    total = 200_000
+    written = threading.Event()
+
+    def writer():
+        fill(buffer, total)
+        written.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+
+    chunks, read_pos = [], 0
+    while read_pos < total:
+        buffer.reserve(headroom=200)
+        end = len(buffer)
+        if end > read_pos:
+            chunks.append(buffer.view(read_pos, end).copy())
+            read_pos = end
+        elif written.is_set() and len(buffer) == read_pos:
+            break
+    thread.join()
+
+    assert np.array_equal(np.concatenate(chunks)[:, 0], np.arange(total, dtype=np.float32))
@@ -0,0 +1,43 @@
+import pytest
+
+from echo.services.cleanup import TextCleaner
+
+
+@pytest.fixture(scope="module")
+def cleaner():
+    return TextCleaner()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I had had enough", "I had had enough."),
+    ("it was a very very good day", "It was a very very good day."),
+    ("bye bye see you", "Bye bye see you."),
+    ("I think that that is fine", "I think that that is fine."),
+    ("what it is is a bug", "What it is is a bug."),
+    ("we were we were going", "We were we were going."),
+    ("Ah well", "Ah well."),
+    ("mm that is good", "Mm that is good."),
+])
+def test_meaningful_repeats_and_interjections_survive(cleaner, text, expected):
+    assert cleaner.clean(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I I think we should go", "I think we should go."),
+    ("the, the plan is fine", "The plan is fine."),
+    ("it it works", "It works."),
+    ("to to be honest", "To be honest."),
+])
+def test_function_word_stutters_collapse(cleaner, text, expected):
+    assert cleaner.clean(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("that is fine, er, ok", "That is fine, ok."),
+    ("um, I think so", "I think so."),
+    ("so, um, what now?", "So, what now?"),
+    ("I think, um. next time", "I think. Next time."),
+    ("the plan is fine uh huh", "The plan is fine."),
+])
+def test_fillers_removed_keeping_surrounding_punctuation(cleaner, text, expected):
+    assert cleaner.clean(text) == expected
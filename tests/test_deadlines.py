@@ -0,0 +1,178 @@
+import time
+import threading
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+from echo.services.deadlines import DeadlineRunner, LatencyTracker
+from echo.services.openai_service import OpenAIService
+from echo.utils.config import config, ToneMode, CommunicationType
+
+TEXT = "hey just wanted to say I'm running about ten minutes late"
+PRIMARY = "gpt-3.5-turbo"
+FALLBACK = "gpt-4o-mini"
+SLACK = 0.3  # Thread scheduling and request overhead on top of a deadline
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(config.openai, "FALLBACK_MODEL", FALLBACK)
+    monkeypatch.setattr(config.openai, "HEDGE_ENABLED", True)
+    monkeypatch.setattr(config.openai, "HEDGE_DEFAULT_DELAY_SECONDS", 0.1)
+    monkeypatch.setattr(config.openai, "PRIMARY_BUDGET_SHARE", 0.6)
+    monkeypatch.setattr(config.openai, "FALLBACK_TO_TRANSCRIPT", True)
+    monkeypatch.setattr(config.cache, "ENABLED", False)
+
+
+@pytest.fixture
+def released():
+    """Set at teardown so requests still sleeping in the executor return"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+class Server:
+    """Answers attempt(model, timeout) after a per-model delay, or raises"""
+
+    def __init__(self, released, delays, errors=()):
+        self.released = released
+        self.delays = delays  # model -> seconds, or a list consumed one call at a time
+        self.errors = set(errors)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, model, timeout):
+        with self.lock:
+            self.calls.append(model)
+            delay = self.delays[model]
+            if isinstance(delay, list):
+                delay = delay.pop(0) if len(delay) > 1 else delay[0]
+        if model in self.errors:
+            raise RuntimeError(f"{model} failed")
+        if self.released.wait(min(delay, timeout)) or delay > timeout:
+            raise TimeoutError(f"{model} timed out")
+        return f"answer from {model}"
+
+
+def test_slow_primary_is_hedged(released):
+    server = Server(released, {PRIMARY: [5.0, 0.05], FALLBACK: 5.0})
+    result = DeadlineRunner(LatencyTracker()).run(server, 2.0, PRIMARY)
+
+    assert result.hedged and not result.fallback
+    assert result.model == PRIMARY
+    assert server.calls == [PRIMARY, PRIMARY]
+
+
+def test_erroring_primary_falls_back_to_the_fast_model(released):
+    server = Server(released, {PRIMARY: 0.01, FALLBACK: 0.05}, errors=[PRIMARY])
+    start = time.perf_counter()
+    result = DeadlineRunner(LatencyTracker()).run(server, 2.0, PRIMARY)
+
+    assert result.fallback
+    assert result.model == FALLBACK
+    assert result.value == f"answer from {FALLBACK}"
+    assert time.perf_counter() - start < 0.5  # Didn't wait for the primary's share to run out
+
+
+def test_outage_gives_up_at_the_deadline(released):
+    server = Server(released, {PRIMARY: 60.0, FALLBACK: 60.0})
+    start = time.perf_counter()
+    result = DeadlineRunner(LatencyTracker()).run(server, 1.0, PRIMARY)
+
+    assert result is None
+    assert 1.0 <= time.perf_counter() - start < 1.0 + SLACK
+
+
+class StubClient:
+    """The slice of openai.OpenAI that process_text uses, answering from a Server"""
+
+    def __init__(self, server):
+        self.server = server
+        self.timeout = None
+        self.chat = self.completions = self.with_streaming_response = self
+
+    def with_options(self, timeout, max_retries):
+        client = StubClient(self.server)
+        client.timeout = timeout
+        return client
+
+    @contextlib.contextmanager
+    def create(self, model, messages, **kwargs):
+        content = self.server(model, self.timeout)
+        message = SimpleNamespace(content=content)
+        response = SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")])
+        yield SimpleNamespace(parse=lambda: response)
+
+
+@pytest.fixture
+def service(monkeypatch, capsys):
+    service = OpenAIService()
+    monkeypatch.setattr(service, "report_error", lambda e: None)
+    return service
+
+
+def use(service, monkeypatch, server):
+    monkeypatch.setattr(service.clients, "get", lambda: StubClient(server))
+
+
+def test_outage_types_the_raw_transcript_within_the_budget(service, monkeypatch, released):
+    monkeypatch.setattr(config.openai, "DEADLINES", {comm_type: 1.0 for comm_type in CommunicationType})
+    use(service, monkeypatch, Server(released, {PRIMARY: 60.0, FALLBACK: 60.0}))
+    start = time.perf_counter()
+    response, _ = service.process_text(f"  {TEXT} ", ToneMode.FRIENDLY, CommunicationType.DM)
+
+    assert response == TEXT
+    assert time.perf_counter() - start < 1.0 + SLACK
+
+
+def test_erroring_primary_is_answered_by_the_fallback_model(service, monkeypatch, released):
+    use(service, monkeypatch, Server(released, {PRIMARY: 0.01, FALLBACK: 0.05}, errors=[PRIMARY]))
+    response, _ = service.process_text(TEXT, ToneMode.FRIENDLY, CommunicationType.DM)
+
+    assert response == f"answer from {FALLBACK}"
+
+
+@pytest.mark.parametrize("comm_type", [CommunicationType.DM, CommunicationType.EMAIL])
+def test_deadline_follows_the_communication_type(service, monkeypatch, released, comm_type):
+    deadlines = {comm_type: 0.5 for comm_type in CommunicationType}
+    deadlines[CommunicationType.EMAIL] = 1.2
+    monkeypatch.setattr(config.openai, "DEADLINES", deadlines)
+    use(service, monkeypatch, Server(released, {PRIMARY: 60.0, FALLBACK: 60.0}))
+    start = time.perf_counter()
+    service.process_text(TEXT, ToneMode.FRIENDLY, comm_type)
+    elapsed = time.perf_counter() - start
+
+    assert deadlines[comm_type] <= elapsed < deadlines[comm_type] + SLACK
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    pytest.importorskip("openai")
+    from fake_openai import FakeOpenAIServer
+
+    server = FakeOpenAIServer(delay=0.05, jitter=0.0, token_delay=0.0).start()
+    monkeypatch.setattr(config.openai, "BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(config.openai, "DEADLINES", {comm_type: 1.5 for comm_type in CommunicationType})
+    yield server
+    server.stop()
+
+
+@pytest.mark.parametrize("settings, answered", [
+    ({"model_delays": {PRIMARY: 60.0}}, "fallback"),
+    ({"error_rate": 1.0}, "transcript"),
+    ({"delay": 60.0}, "transcript"),
+])
+def test_fallback_chain_against_the_fake_server(fake_server, capsys, settings, answered):
+    fake_server.config.update(settings)
+    service = OpenAIService()
+    start = time.perf_counter()
+    response, _ = service.process_text(TEXT, ToneMode.FRIENDLY, CommunicationType.DM)
+
+    assert time.perf_counter() - start < 1.5 + SLACK
+    if answered == "transcript":
+        assert response == TEXT
+    else:
+        assert response and response != TEXT
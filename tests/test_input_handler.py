@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("pyperclip")
+
+from echo.utils.config import config
+from echo.utils.input_handler import InputHandler
+
+
+class RecordingKeyboard:
+    """Stands in for pynput's Controller, collects what was typed"""
+
+    def __init__(self):
+        self.typed = []
+
+    def type(self, text):
+        self.typed.append(text)
+
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    monkeypatch.setattr(config.input, "INJECTION_MODE", "keystrokes")
+    handler = InputHandler(keyboard=RecordingKeyboard())
+    handler.clipboard = []
+    monkeypatch.setattr(handler, "copy_to_clipboard", handler.clipboard.append)
+    return handler
+
+
+def test_cancel_before_the_first_boundary(handler):
+    def chunks():
+        yield "Hello"
+        handler.cancel_typing()  # Esc before any word was complete
+        yield "there, how are you?"
+
+    text, first_char_at, cancelled = handler.type_stream(chunks())
+
+    assert cancelled
+    assert first_char_at is None
+    assert handler.keyboard.typed == []
+    assert handler.clipboard == ["Hellothere, how are you?"]
+
+
+def test_cancel_after_typing_keeps_the_text_on_the_clipboard(handler):
+    def chunks():
+        yield "Hello there, "
+        handler.cancel_typing()
+        yield "how are you?"
+
+    text, first_char_at, cancelled = handler.type_stream(chunks())
+
+    assert cancelled
+    assert first_char_at is not None
+    assert "".join(handler.keyboard.typed) == "Hello there,"
+    assert handler.clipboard == ["Hello there, how are you?"]
+
+
+def test_completed_stream_is_not_cancelled(handler):
+    text, first_char_at, cancelled = handler.type_stream(iter(["Hello ", "there."]))
+
+    assert not cancelled
+    assert text == "Hello there."
+    assert "".join(handler.keyboard.typed) == "Hello there."
@@ -0,0 +1,55 @@
+import pytest
+
+from echo.utils.keystrokes import KeystrokeInjector
+
+
+class InvalidCharacterException(Exception):
+    """Same shape as pynput's: args are (index, character)"""
+
+
+class PickyKeyboard:
+    """Posts characters one by one like pynput, failing on the ones it can't type"""
+
+    def __init__(self, untypable="", error=InvalidCharacterException):
+        self.untypable = untypable
+        self.error = error
+        self.posted = []
+
+    def type(self, text):
+        for i, char in enumerate(text):
+            if char in self.untypable:
+                raise self.error(i, char)
+            self.posted.append(char)
+
+
+@pytest.fixture
+def injector():
+    return KeystrokeInjector(PickyKeyboard())
+
+
+def test_clean_run_is_sent_in_one_call(injector):
+    assert injector._send("hello")
+    assert "".join(injector.keyboard.posted) == "hello"
+
+
+def test_failed_character_is_skipped_without_retyping_the_prefix(injector):
+    injector.keyboard.untypable = "☃"
+    assert not injector._send("snow☃man☃!")
+    assert "".join(injector.keyboard.posted) == "snowman!"
+
+
+def test_unknown_failure_drops_the_run_rather_than_duplicating(injector):
+    injector.keyboard.untypable = "x"
+    injector.keyboard.error = RuntimeError
+    assert not injector._send("abxcd")
+    assert "".join(injector.keyboard.posted) == "ab"
+
+
+def test_failed_run_backs_off(injector):
+    injector.keyboard.untypable = "☃"
+    rate = injector.rate_for(None)
+    start = rate.cps
+    injector.type("a☃b")
+    assert rate.backoffs == 1
+    assert rate.cps < start
+    assert "".join(injector.keyboard.posted) == "ab"
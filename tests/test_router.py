@@ -0,0 +1,43 @@
+from echo.services.router import ModelRouter
+from echo.utils.config import config, CommunicationType
+
+DM = CommunicationType.DM
+TRANSCRIPT = "can you send me the slides from this morning before the call " * 2
+REPLY = "Could you send me this morning's slides before the call?"  # ~14 tokens
+
+
+def dictate(router, seconds, first_token=None):
+    route = router.route(TRANSCRIPT, DM)
+    router.record(route, seconds, REPLY, "stop", first_token)
+    return route
+
+
+def test_ordinary_messages_stay_on_the_routed_model():
+    router = ModelRouter()
+    routes = [dictate(router, 1.2) for _ in range(40)]
+    assert all(route.model == config.openai.ROUTES[DM]["model"] for route in routes)
+    assert set(router.stats) == {"direct_message"}
+
+
+def test_streamed_estimate_uses_generation_time_after_the_first_token():
+    router = ModelRouter()
+    for _ in range(10):
+        dictate(router, 1.5, first_token=0.6)
+    max_tokens = router.route(TRANSCRIPT, DM).max_tokens
+    # The request's own length, not the max_tokens ceiling
+    assert abs(router.expected_seconds("direct_message", max_tokens) - 1.5) < 1e-6
+
+
+def test_slow_routed_model_moves_to_fast_and_is_probed_back():
+    router = ModelRouter()
+    for _ in range(5):
+        dictate(router, 3.0)
+    assert dictate(router, 3.0).name == "direct_message/fast"
+
+    # Every ROUTE_PROBE_EVERY-th request retries the routed model, which has recovered
+    names = []
+    for _ in range(config.openai.ROUTE_PROBE_EVERY * 6):
+        route = router.route(TRANSCRIPT, DM)
+        router.record(route, 1.0 if route.name == "direct_message" else 0.8, REPLY, "stop")
+        names.append(route.name)
+    assert names[-10:] == ["direct_message"] * 10
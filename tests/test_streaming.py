@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from echo.services.streaming import StreamingTranscriber
+from echo.utils.config import config
+
+RATE = config.audio.SAMPLE_RATE
+WINDOW = config.audio.STREAM_WINDOW_SECONDS
+REAL_TIME_FACTOR = 0.15  # Decode seconds per audio second, a small model on a laptop CPU
+
+
+class SentenceTranscriber:
+    """Decodes audio whose samples hold their own timestamp into one segment per sentence.
+
+    A sentence that runs past the end of the audio is returned as an open
+    segment, the way Whisper ends on whatever is still being said.
+    """
+
+    def __init__(self, sentence_seconds):
+        self.sentence_seconds = sentence_seconds
+        self.decoded = []  # Seconds of audio per decode call
+
+    @staticmethod
+    def to_mono(audio):
+        return np.asarray(audio, dtype=np.float32).flatten()
+
+    def prepare_audio(self, audio):
+        return audio
+
+    def decode_segments(self, audio, stats=None, vad_filter=True):
+        seconds = len(audio) / RATE
+        self.decoded.append(seconds)
+        begin = float(audio[0])
+        segments = []
+        k = int(begin // self.sentence_seconds)
+        while k * self.sentence_seconds < begin + seconds - 1e-6:
+            start = max(k * self.sentence_seconds, begin)
+            end = min((k + 1) * self.sentence_seconds, begin + seconds)
+            segments.append(SimpleNamespace(start=start - begin, end=end - begin, text=f" s{k}"))
+            k += 1
+        return segments
+
+
+def stream(transcriber, seconds):
+    """Feed seconds of continuous speech in recorder windows, returns the transcription"""
+    streaming = StreamingTranscriber(transcriber)
+    streaming.start()
+    timeline = (np.arange(int(seconds * RATE)) / RATE).astype(np.float32)
+    step = int(WINDOW * RATE)
+    for offset in range(0, len(timeline), step):
+        streaming.feed(timeline[offset:offset + step].reshape(-1, 1))
+    return streaming.finish()
+
+
+def lag_after_release(decoded):
+    """Seconds from the last window to the end of its decode, when windows arrive in real time"""
+    done = 0.0
+    for i, seconds in enumerate(decoded[:-1]):
+        done = max(done, (i + 1) * WINDOW) + seconds * REAL_TIME_FACTOR
+    return max(done, (len(decoded) - 1) * WINDOW) + decoded[-1] * REAL_TIME_FACTOR - (len(decoded) - 1) * WINDOW
+
+
+@pytest.mark.parametrize("sentence_seconds", [3.0, 7.0, 100.0])
+def test_decoding_keeps_up_with_continuous_speech(sentence_seconds):
+    transcriber = SentenceTranscriber(sentence_seconds)
+    stream(transcriber, 25.0)
+
+    assert max(transcriber.decoded) <= config.whisper.STREAM_MAX_PENDING_SECONDS + WINDOW
+    assert sum(transcriber.decoded) <= 4 * 25.0  # Was ~6x when nothing committed before 25s
+    assert lag_after_release(transcriber.decoded) < WINDOW
+
+
+def test_settled_sentences_are_committed_once_and_in_order():
+    transcription = stream(SentenceTranscriber(3.0), 25.0)
+
+    assert transcription.text.split() == [f"s{k}" for k in range(9)]
@@ -0,0 +1,114 @@
+import io
+import sys
+import time
+import threading
+import contextlib
+
+import numpy as np
+import pytest
+
+from echo.audio.recorder import AudioRecorder
+from echo.utils.config import config
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"),
+                                reason="per-thread wakeups are read from /proc")
+
+
+def wakeups(thread_id):
+    """Voluntary context switches of one thread"""
+    with open(f"/proc/self/task/{thread_id}/status") as status:
+        for line in status:
+            if line.startswith("voluntary_ctxt_switches"):
+                return int(line.split()[1])
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    monkeypatch.setattr(config.audio, "VAD_ENABLED", False)
+    recorder = AudioRecorder()
+    recorder.reset(lambda audio, regions: None)
+    yield recorder
+    recorder.request_stop()
+
+
+def capture_rate(recorder, seconds=1.0, blocks_per_second=0):
+    """Wakeups/sec of a thread running recorder.capture, fed blocks in real time"""
+    ids = {}
+    started = threading.Event()
+    stopped = threading.Event()
+
+    def run():
+        ids['thread'] = threading.get_native_id()
+        started.set()
+        with contextlib.redirect_stdout(io.StringIO()):  # Level bars
+            recorder.capture()
+
+    def feed():
+        block = np.full((recorder.block_frames, 1), 0.01, dtype=np.float32)
+        next_at = time.perf_counter()
+        while not stopped.is_set():
+            recorder.audio_callback(block, len(block), None, None, None)
+            next_at += 1 / blocks_per_second
+            stopped.wait(max(0.0, next_at - time.perf_counter()))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+    feeder = threading.Thread(target=feed, daemon=True) if blocks_per_second else None
+    if feeder:
+        feeder.start()
+    time.sleep(0.2)  # Let it settle into its loop
+
+    before = wakeups(ids['thread'])
+    time.sleep(seconds)
+    rate = (wakeups(ids['thread']) - before) / seconds
+
+    stopped.set()
+    if feeder:
+        feeder.join()
+    recorder.request_stop()
+    thread.join(2.0)
+    assert not thread.is_alive()
+    return rate
+
+
+def test_armed_recorder_without_blocks_sleeps(recorder):
+    # Only the stall watchdog may wake it
+    assert capture_rate(recorder, seconds=1.5) <= 1 / config.audio.STALL_SECONDS + 1
+
+
+def test_recorder_wakes_about_once_per_block(recorder):
+    blocks_per_second = 1 / config.audio.BLOCK_SIZE_SECONDS
+    rate = capture_rate(recorder, blocks_per_second=blocks_per_second)
+    assert 0.5 * blocks_per_second <= rate <= 1.5 * blocks_per_second
+    assert recorder.state == AudioRecorder.DRAINING  # Moved to recording on the first block, then stopped
+
+
+def test_meter_is_throttled_apart_from_capture(monkeypatch):
+    monkeypatch.setattr(config.audio, "VAD_ENABLED", False)
+    monkeypatch.setattr(config.audio, "METER_REFRESH_HZ", 4.0)
+    recorder = AudioRecorder()
+    assert recorder.block_frames == int(recorder.sample_rate * config.audio.BLOCK_SIZE_SECONDS)
+    levels = []
+    recorder.on_level = levels.append
+    recorder.reset(lambda audio, regions: None)
+
+    blocks_per_second = 1 / config.audio.BLOCK_SIZE_SECONDS
+    rate = capture_rate(recorder, seconds=1.5, blocks_per_second=blocks_per_second)
+    assert 0.5 * blocks_per_second <= rate <= 1.5 * blocks_per_second
+    assert len(levels) <= 4.0 * 1.7 + 1  # Settling, measuring and stopping take about 1.7s
+
+
+def test_stop_before_the_recorder_thread_runs_is_kept(recorder):
+    recorder.request_stop()
+    thread = threading.Thread(target=recorder.record, daemon=True)
+    thread.start()
+    thread.join(2.0)
+    assert not thread.is_alive()
+    assert recorder.state == AudioRecorder.IDLE
+
+
+def test_stop_from_idle_is_a_no_op():
+    recorder = AudioRecorder()
+    recorder.request_stop()
+    assert recorder.state == AudioRecorder.IDLE
@@ -0,0 +1,24 @@
+import multiprocessing
+
+from echo.utils.logger import get_logger, setup_worker_logging
+
+
+def log_from_worker(log_queue):
+    get_logger("worker")  # Modules call this at import time, before the worker sets up forwarding
+    setup_worker_logging(log_queue)
+    get_logger("worker").warning("decoded %d segments", 3)
+
+
+def test_worker_forwards_records_without_opening_the_log_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    context = multiprocessing.get_context("spawn")
+    log_queue = context.Queue()
+    process = context.Process(target=log_from_worker, args=(log_queue,))
+    process.start()
+    record = log_queue.get(timeout=30)
+    process.join(30)
+
+    assert process.exitcode == 0
+    assert record.name == "echo.worker"
+    assert record.getMessage() == "decoded 3 segments"
+    assert not (tmp_path / ".echo_assistant" / "logs" / "echo_assistant.jsonl").exists()